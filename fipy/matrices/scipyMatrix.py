@@ -7,6 +7,84 @@ from fipy.tools import numerix
 
 from fipy.matrices.sparseMatrix import _SparseMatrix
 
+class _ScipySparsityPattern(object):
+    """Symbolic part of the assembly of a `_ScipyMatrix`.
+
+    Records the COO row and column indices that were last assembled,
+    together with the CSR structure (`indptr` and `indices`) they
+    produce and the slot in the CSR `data` array that each COO entry is
+    summed into. As long as a subsequent assembly supplies the same
+    COO indices, the CSR matrix is obtained by scattering the new values
+    into `data`, without sorting or merging indices again.
+
+        >>> pattern = _ScipySparsityPattern()
+        >>> rows = numerix.array((0, 2, 0, 1, 0))
+        >>> cols = numerix.array((1, 0, 1, 1, 2))
+        >>> print pattern.matches(rows, cols, (3, 3))
+        False
+        >>> m = pattern.assemble((1., 2., 3., 4., 5.), rows, cols, (3, 3))
+        >>> print m.toarray()
+        [[ 0.  4.  5.]
+         [ 0.  4.  0.]
+         [ 2.  0.  0.]]
+        >>> print pattern.matches(rows, cols, (3, 3))
+        True
+        >>> m = pattern.assemble((1., 1., 1., 1., 1.), rows, cols, (3, 3))
+        >>> print m.toarray()
+        [[ 0.  2.  1.]
+         [ 0.  1.  0.]
+         [ 1.  0.  0.]]
+        >>> print pattern.matches(rows[::-1], cols[::-1], (3, 3))
+        False
+    """
+
+    def __init__(self):
+        self.shape = None
+        self.rows = None
+        self.cols = None
+
+    def matches(self, rows, cols, shape):
+        return (self.shape == shape
+                and self.rows is not None
+                and len(self.rows) == len(rows)
+                and numerix.array_equal(self.rows, rows)
+                and numerix.array_equal(self.cols, cols))
+
+    def _analyze(self, rows, cols, shape):
+        order = numerix.lexsort((cols, rows))
+        sortedRows = rows[order]
+        sortedCols = cols[order]
+
+        new = numerix.ones(len(order), dtype=bool)
+        new[1:] = ((sortedRows[1:] != sortedRows[:-1])
+                   | (sortedCols[1:] != sortedCols[:-1]))
+
+        self.scatter = numerix.empty(len(order), dtype=numerix.INT_DTYPE)
+        self.scatter[order] = numerix.cumsum(new) - 1
+        self.indices = sortedCols[new]
+        self.indptr = numerix.zeros(shape[0] + 1, dtype=numerix.INT_DTYPE)
+        self.indptr[1:] = numerix.cumsum(numerix.bincount(sortedRows[new],
+                                                          minlength=shape[0]))
+        self.nnz = len(self.indices)
+
+        self.shape = shape
+        self.rows = rows
+        self.cols = cols
+
+    def assemble(self, values, rows, cols, shape, dtype=float):
+        """Return a `csr_matrix` of `shape` and `dtype` holding the sums
+        of `values` at (`rows`, `cols`)
+        """
+        if not self.matches(rows, cols, shape):
+            self._analyze(rows, cols, shape)
+
+        data = numerix.bincount(self.scatter,
+                                weights=numerix.asarray(values, dtype=float),
+                                minlength=self.nnz)
+
+        return sp.csr_matrix((numerix.asarray(data, dtype=dtype),
+                              self.indices.copy(), self.indptr.copy()), shape=shape)
+
 class _ScipyMatrix(_SparseMatrix):
 
     """class wrapper for a scipy sparse matrix.
@@ -14,6 +92,13 @@ class _ScipyMatrix(_SparseMatrix):
     `_ScipyMatrix` is always NxN.
     Allows basic python operations __add__, __sub__ etc.
     Facilitate matrix populating in an easy way.
+
+    Values added with `addAt` are held as COO triplets and only summed
+    into the wrapped `spmatrix` when `matrix` is next accessed, so the
+    contributions of all the terms of an equation are assembled in one
+    pass. If a `_ScipySparsityPattern` has been shared with the matrix
+    (see `_shareSparsityPattern`), the CSR structure is reused from the
+    previous assembly whenever the COO indices are unchanged.
     """
 
     def __init__(self, matrix):
@@ -23,6 +108,46 @@ class _ScipyMatrix(_SparseMatrix):
           - `matrix`: The starting `spmatrix`
         """
         self.matrix = matrix
+        self._sparsityPattern = None
+
+    def _getMatrix(self):
+        if self._pending:
+            self._assemble()
+        return self._matrix
+
+    def _setMatrix(self, matrix):
+        self._matrix = matrix
+        self._pending = []
+
+    def _delMatrix(self):
+        del self._matrix
+        self._pending = []
+
+    matrix = property(_getMatrix, _setMatrix, _delMatrix)
+
+    def _shareSparsityPattern(self, pattern):
+        if pattern is None:
+            pattern = _ScipySparsityPattern()
+        self._sparsityPattern = pattern
+        return pattern
+
+    def _assemble(self):
+        rows = numerix.concatenate([id1 for vector, id1, id2 in self._pending])
+        cols = numerix.concatenate([id2 for vector, id1, id2 in self._pending])
+        values = numerix.concatenate([vector for vector, id1, id2 in self._pending])
+        self._pending = []
+
+        shape = self._matrix.shape
+        dtype = self._matrix.dtype
+        if self._sparsityPattern is not None:
+            temp = self._sparsityPattern.assemble(values, rows, cols, shape, dtype=dtype)
+        else:
+            temp = sp.csr_matrix((values, (rows, cols)), shape, dtype=dtype)
+
+        if self._matrix.nnz > 0:
+            self._matrix = self._matrix + temp
+        else:
+            self._matrix = temp
 
     def getCoupledClass(self):
         return _CoupledScipyMeshMatrix
@@ -41,7 +166,15 @@ class _ScipyMatrix(_SparseMatrix):
         return self._iadd(other)
 
     def _iadd(self, other, sign=1):
-        if hasattr(other, "matrix"):
+        if isinstance(other, _ScipyMatrix):
+            # defer the sum of `other`'s unassembled contributions
+            if sign == 1:
+                self._pending += other._pending
+            else:
+                self._pending += [(sign * vector, id1, id2) for vector, id1, id2 in other._pending]
+            if other._matrix.nnz > 0:
+                self._matrix = self._matrix + (sign * other._matrix)
+        elif hasattr(other, "matrix"):
             self.matrix = self.matrix + (sign * other.matrix)
         elif type(other) in [float, int]:
             fillVec = numerix.repeat(other, self.matrix.nnz)
@@ -217,9 +350,9 @@ class _ScipyMatrix(_SparseMatrix):
         """
         assert(len(id1) == len(id2) == len(vector))
 
-        temp = sp.csr_matrix((vector, (id1, id2)), self.matrix.shape)
-
-        self.matrix = self.matrix + temp
+        self._pending.append((numerix.array(vector, dtype=float).ravel(),
+                              numerix.asarray(id1, dtype=numerix.INT_DTYPE).ravel(),
+                              numerix.asarray(id2, dtype=numerix.INT_DTYPE).ravel()))
 
     def addAtDiagonal(self, vector):
         if type(vector) in [type(1), type(1.)]:
@@ -253,7 +386,7 @@ class _ScipyMatrixFromShape(_ScipyMatrix):
 
         """
         if matrix is None:
-            matrix = sp.csr_matrix((size, size))
+            matrix = sp.csr_matrix((size, size), dtype=numerix.FLOAT_DTYPE)
 
         _ScipyMatrix.__init__(self, matrix=matrix)
 
@@ -346,6 +479,38 @@ class _ScipyMeshMatrix(_ScipyMatrixFromShape):
         >>> print numerix.allequal(numerix.array(m.matrix[nonZeroIdx]), numerix.array([1.0, 2.0]))
         True
 
+        The sparsity pattern of an equation is analyzed on the first
+        assembly and reused afterwards
+
+        >>> from fipy import Grid1D, CellVariable, TransientTerm, DiffusionTerm
+        >>> mesh = Grid1D(nx=3)
+        >>> var = CellVariable(mesh=mesh, value=(1., 2., 3.))
+        >>> eq = TransientTerm() == DiffusionTerm()
+        >>> eq.cacheMatrix()
+        >>> eq.solve(var, dt=1.)
+        >>> pattern = eq._sparsityPattern
+        >>> rows = pattern.rows
+        >>> print pattern.nnz
+        7
+        >>> eq.solve(var, dt=1.)
+        >>> print eq._sparsityPattern is pattern and pattern.rows is rows
+        True
+        >>> print numerix.allclose(eq.matrix.numpyArray, [[ 2, -1,  0],
+        ...                                               [-1,  3, -1],
+        ...                                               [ 0, -1,  2]])
+        True
+
+        In single precision, contributions are summed in double
+        precision and stored as `float32`
+
+        >>> numerix.FLOAT_DTYPE, FLOAT_DTYPE = numerix.float32, numerix.FLOAT_DTYPE
+        >>> m = _ScipyMatrixFromShape(size=3)
+        >>> m.addAt((1., 2., 3.), (0, 1, 2), (0, 1, 2))
+        >>> m.addAt((1., 2., 3.), (0, 1, 2), (0, 1, 2))
+        >>> print m.matrix.dtype, m.takeDiagonal()
+        float32 [ 2.  4.  6.]
+        >>> numerix.FLOAT_DTYPE = FLOAT_DTYPE
+
         """
         pass
 
@@ -117,6 +117,15 @@ class _SparseMatrix(object):
     def exportMmf(self, filename):
         pass
 
+    def _shareSparsityPattern(self, pattern):
+        """Offer the sparsity `pattern` recorded by an earlier assembly.
+
+        Matrix classes that can reuse the structure of a previous
+        assembly return the pattern they will record into; others
+        return `pattern` untouched.
+        """
+        return pattern
+
 ##     def __array__(self):
 ##      shape = self._shape
 ##      indices = numerix.indices(shape)
@@ -62,6 +62,7 @@ class AbstractMesh(object):
 
     def _setCellFaceIDsInternal(self, newVal):
         self._cellFaceIDs = newVal
+        self._connectivityCache = None
 
     """This is to enable `_connectFaces` to work properly."""
     cellFaceIDs = property(_getCellFaceIDsInternal, _setCellFaceIDsInternal)
@@ -491,6 +492,184 @@ class AbstractMesh(object):
                                                      self.interiorFaceIDs, axis=1)
         return self._interiorFaceCellIDs
 
+    def _cachedConnectivity(self, name, calc):
+        """Return the connectivity `name`, calculated by `calc` the first
+        time it is needed and kept until the topology of the mesh changes.
+        """
+        if getattr(self, '_connectivityCache', None) is None:
+            self._connectivityCache = {}
+        if name not in self._connectivityCache:
+            self._connectivityCache[name] = calc()
+        return self._connectivityCache[name]
+
+    @property
+    def _cellFaceConnectivity(self):
+        """`cellFaceIDs` as a `_Connectivity`, free of masked arrays
+
+        >>> from fipy import Grid2D
+        >>> m = Grid2D(nx=2, ny=1)
+        >>> print m._cellFaceConnectivity.ids
+        [[0 1]
+         [5 6]
+         [2 3]
+         [4 5]]
+        >>> m._cellFaceConnectivity is m._cellFaceConnectivity
+        True
+        """
+        from fipy.meshes.topologies.connectivity import _Connectivity
+        return self._cachedConnectivity('cellFace',
+                                        lambda: _Connectivity(self.cellFaceIDs))
+
+    @property
+    def _cellToCellConnectivity(self):
+        """`_cellToCellIDs` as a `_Connectivity`, free of masked arrays
+
+        >>> from fipy import Grid2D
+        >>> m = Grid2D(nx=2, ny=1)
+        >>> print m._cellToCellConnectivity.counts
+        [1 1]
+        """
+        from fipy.meshes.topologies.connectivity import _Connectivity
+        return self._cachedConnectivity('cellToCell',
+                                        lambda: _Connectivity(self._cellToCellIDs))
+
+    @property
+    def _cellToFaceOrientationsFilled(self):
+        """`_cellToFaceOrientations` as a plain array, with 0 for the
+        padding of `cellFaceIDs`
+        """
+        def calc():
+            orientations = numerix.array(MA.filled(self._cellToFaceOrientations, 0))
+            return numerix.where(self._cellFaceConnectivity.valid, orientations, 0)
+
+        return self._cachedConnectivity('cellToFaceOrientations', calc)
+
+    @property
+    def _leastSquaresGradCoefficients(self):
+        r"""The `(D, M, N)` weights :math:`w_{AP}` of the least-squares
+        gradient, :math:`\nabla \phi_P = \sum_A w_{AP} (\phi_A - \phi_P)`,
+        of the neighbors :math:`A` of each cell :math:`P`. They depend only
+        on the geometry, so are calculated once, by inverting the normal
+        matrix of every cell together.
+
+        >>> from fipy import Grid2D
+        >>> m = Grid2D(nx=2, ny=2, dx=0.1, dy=2.0)
+        >>> print m._leastSquaresGradCoefficients[..., 0]
+        [[ 0.   8.   0.   0. ]
+         [ 0.   0.   0.4  0. ]]
+        """
+        if getattr(self, '_leastSquaresGradCoefficientsCache', None) is None:
+            cellDistanceNormals = MA.filled(self._cellToCellDistances * self._cellNormals, 0.)
+            mat = numerix.einsum('imn,jmn->nij', cellDistanceNormals, cellDistanceNormals)
+            try:
+                inverse = numerix.linalg.inv(mat)
+            except numerix.linalg.LinAlgError:
+                inverse = numerix.linalg.pinv(mat)
+            coefficients = numerix.einsum('nij,jmn->imn', inverse, cellDistanceNormals)
+            # faces without a neighbor contribute to the normal matrix, but not to the gradient
+            coefficients[:, ~self._cellToCellConnectivity.valid] = 0.
+            self._leastSquaresGradCoefficientsCache = coefficients
+        return self._leastSquaresGradCoefficientsCache
+
+    def _incidenceOperator(self, name, calc):
+        """Return the `scipy.sparse` operator `name`, built by `calc`
+        the first time it is needed and kept until the geometry of the
+        mesh changes, or `None` if `scipy` is not available.
+        """
+        if getattr(self, '_incidenceOperatorsCache', None) is None:
+            self._incidenceOperatorsCache = {}
+        if name not in self._incidenceOperatorsCache:
+            try:
+                from scipy import sparse
+            except ImportError:
+                operator = None
+            else:
+                operator = calc(sparse)
+            self._incidenceOperatorsCache[name] = operator
+        return self._incidenceOperatorsCache[name]
+
+    def _applyIncidenceOperator(self, operator, value):
+        """Apply a sparse `operator` to the last axis of `value`,
+        treating any leading element axes as a batch of vectors.
+        """
+        value = numerix.asarray(value)
+        columns = value.reshape((int(numerix.prod(value.shape[:-1])), value.shape[-1])).swapaxes(0, 1)
+        result = numerix.asarray(operator.dot(columns))
+        return result.swapaxes(0, 1).reshape(value.shape[:-1] + result.shape[:1])
+
+    @property
+    def _cellToFaceInterpolation(self):
+        r"""Sparse `(F, N)` operator for the arithmetic interpolation of
+        cell values to the faces,
+        :math:`\phi_f = (1 - \alpha_f) \phi_1 + \alpha_f \phi_2`.
+
+        >>> from fipy import Grid1D, numerix
+        >>> m = Grid1D(dx=(1., 3.))
+        >>> op = m._cellToFaceInterpolation
+        >>> print numerix.allclose(m._applyIncidenceOperator(op, (1., 5.)),
+        ...                        (1., 2., 5.)) # doctest: +SCIPY
+        True
+        """
+        def calc(sparse):
+            alpha = numerix.array(self._faceToCellDistanceRatio, 'd')
+            id1, id2 = self._adjacentCellIDs
+            faces = numerix.arange(self.numberOfFaces)
+            # boundary faces have id1 == id2, so their weights add to one
+            return sparse.csr_matrix((numerix.concatenate((1. - alpha, alpha)),
+                                      (numerix.concatenate((faces, faces)),
+                                       numerix.concatenate((id1, id2)))),
+                                     shape=(self.numberOfFaces, self.numberOfCells))
+
+        return self._incidenceOperator('cellToFaceInterpolation', calc)
+
+    @property
+    def _faceToCellSum(self):
+        r"""Sparse `(N, F)` operator that sums face values over the faces
+        of each cell, signed by the orientation of the face with respect
+        to the cell, :math:`\sum_f \pm \phi_f`.
+
+        >>> from fipy import Grid2D, numerix
+        >>> m = Grid2D(nx=2, ny=1)
+        >>> print m._applyIncidenceOperator(m._faceToCellSum,
+        ...                                 numerix.arange(m.numberOfFaces)) # doctest: +SCIPY
+        [ 11.   5.]
+        """
+        def calc(sparse):
+            connectivity = self._cellFaceConnectivity
+            valid = connectivity.valid
+            orientations = numerix.array(self._cellToFaceOrientationsFilled, 'd')
+            cells = numerix.resize(numerix.arange(self.numberOfCells), valid.shape)
+            return sparse.csr_matrix((orientations[valid],
+                                      (cells[valid], connectivity.ids[valid])),
+                                     shape=(self.numberOfCells, self.numberOfFaces))
+
+        return self._incidenceOperator('faceToCellSum', calc)
+
+    @property
+    def _cellGaussGradOperator(self):
+        r"""Sparse `(D * N, N)` operator for the Gauss gradient of the
+        arithmetic face values of a cell variable,
+        :math:`\nabla \phi_P = \sum_f \pm \vec{A}_f \phi_f / V_P`, stacked
+        by direction. `None` if the mesh is scaled by a dimensional length.
+
+        >>> from fipy import Grid2D, numerix
+        >>> m = Grid2D(nx=3, ny=1)
+        >>> x = m.cellCenters[0].value
+        >>> print m._applyIncidenceOperator(m._cellGaussGradOperator, x) # doctest: +SCIPY
+        [ 0.5  1.   0.5  0.   0.   0. ]
+        """
+        if isinstance(self.scale['length'], PhysicalField):
+            return None
+
+        def calc(sparse):
+            faceSum = self._faceToCellSum
+            volumes = sparse.diags(1. / numerix.array(self.cellVolumes, 'd'), 0)
+            interpolation = self._cellToFaceInterpolation
+            return sparse.vstack([volumes * faceSum * sparse.diags(projection, 0) * interpolation
+                                  for projection in numerix.array(self._areaProjections, 'd')]).tocsr()
+
+        return self._incidenceOperator('cellGaussGradOperator', calc)
+
     @property
     def _numberOfFacesPerCell(self):
         cellFaceIDs = self.cellFaceIDs
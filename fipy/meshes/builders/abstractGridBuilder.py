@@ -12,7 +12,7 @@ class _AbstractGridBuilder(object):
     NumPtsCalcClass = None
 
     def buildGridData(self, ds, ns, overlap, communicator,
-                            cacheOccupiedNodes=False):
+                            cacheOccupiedNodes=False, partition=None):
         """
         Build and save any information relevant to the construction of a grid.
         Generalized to handle any dimension. Has side-effects.
@@ -34,6 +34,44 @@ class _AbstractGridBuilder(object):
             - `ds` - A list containing grid spacing information, e.g. [dx, dy]
             - `ns` - A list containing number of grid points, e.g. [nx, ny, nz]
             - `overlap`
+            - `partition` - The number of processes along each axis, or
+              `None` to choose them with `_calcPartition`
+
+        In parallel, the grid is divided into a block for each process.
+        A grid of 8 x 6 cells on 4 processes is divided into 2 x 2 blocks,
+        each extended by `overlap` cells towards its neighbors
+
+        >>> from fipy.meshes.builders import _NonuniformGrid2DBuilder
+        >>> class _Communicator(object):
+        ...     Nproc = 4
+        >>> comm = _Communicator()
+        >>> for comm.procID in range(4):
+        ...     builder = _NonuniformGrid2DBuilder()
+        ...     builder.buildGridData([1., 1.], [8, 6], 1, comm)
+        ...     print builder.ns, builder.offset, sorted(builder.overlap.items())
+        (5, 4) (0, 0) [('bottom', 0), ('left', 0), ('right', 1), ('top', 1)]
+        (5, 4) (3, 0) [('bottom', 0), ('left', 1), ('right', 0), ('top', 1)]
+        (5, 4) (0, 2) [('bottom', 1), ('left', 0), ('right', 1), ('top', 0)]
+        (5, 4) (3, 2) [('bottom', 1), ('left', 1), ('right', 0), ('top', 0)]
+
+        The blocks can also be given explicitly, e.g., as slabs along `y`
+
+        >>> for comm.procID in range(4):
+        ...     builder = _NonuniformGrid2DBuilder()
+        ...     builder.buildGridData([1., 1.], [8, 6], 1, comm, partition=(1, 4))
+        ...     print builder.ns, builder.offset
+        (8, 2) (0, 0)
+        (8, 3) (0, 0)
+        (8, 3) (0, 1)
+        (8, 4) (0, 2)
+
+        Processes beyond those of the partition are left empty
+
+        >>> comm.procID = 3
+        >>> builder = _NonuniformGrid2DBuilder()
+        >>> builder.buildGridData([1., 1.], [8, 6], 1, comm, partition=(3, 1))
+        >>> print builder.ns, builder.numberOfCells
+        [0, 0] 0
         """
 
         dim = len(ns)
@@ -74,28 +112,53 @@ class _AbstractGridBuilder(object):
         procID = communicator.procID
         Nproc = communicator.Nproc
 
-        overlap = min(overlap, newNs[-1])
-        cellsPerNode = max(newNs[-1] // Nproc, overlap)
-        occupiedNodes = min(newNs[-1] // (cellsPerNode or 1), Nproc)
+        overlaps = [min(overlap, n) for n in newNs]
+        partition = self._calcPartition(newNs, overlaps, Nproc, partition)
 
-        (firstOverlap,
-         secOverlap,
-         overlap) = self._buildOverlap(overlap, procID, occupiedNodes)
+        # the position of this process in the grid of processes, along x
+        # first, or past its end if the process is left empty
+        if procID < reduce(self._mult, partition):
+            coordinates = [int(c) for c in numerix.unravel_index(procID, partition,
+                                                                 order='F')]
+        else:
+            coordinates = partition
 
-        offsetArg = min(procID, occupiedNodes-1) * cellsPerNode - firstOverlap
-        offset = self._packOffset(offsetArg)
+        firstOverlaps = []
+        secOverlaps = []
+        offsets = []
+        local_ns = []
+        occupiedNodes = 1
+        for n, overlap, procs, coordinate in zip(newNs, overlaps,
+                                                 partition, coordinates):
+            cellsPerNode = max(n // procs, overlap)
+            occupied = min(n // (cellsPerNode or 1), procs)
+            occupiedNodes *= occupied
 
-        """
-        local nx, [ny, [nz]] calculation
-        """
-        local_n = cellsPerNode * (procID < occupiedNodes)
+            (firstOverlap,
+             secOverlap) = self._buildOverlap(overlap, coordinate, occupied)
+
+            offsets.append(int(min(coordinate, occupied - 1) * cellsPerNode
+                               - firstOverlap))
 
-        if procID == occupiedNodes - 1:
-            local_n += (newNs[-1] - cellsPerNode * occupiedNodes)
+            """
+            local nx, [ny, [nz]] calculation
+            """
+            local_n = cellsPerNode * (coordinate < occupied)
 
-        local_n += firstOverlap + secOverlap
+            if coordinate == occupied - 1:
+                local_n += (n - cellsPerNode * occupied)
 
-        newNs = tuple(newNs[:-1] + [local_n])
+            local_n += firstOverlap + secOverlap
+
+            firstOverlaps.append(firstOverlap)
+            secOverlaps.append(secOverlap)
+            local_ns.append(int(local_n))
+
+        overlap = self._packOverlap(firstOverlaps, secOverlaps)
+        offset = self._packOffset(offsets)
+        globalNs = tuple(newNs)
+
+        newNs = tuple(local_ns)
 
         """
         post-parallel
@@ -129,6 +192,7 @@ class _AbstractGridBuilder(object):
 
         self.offset = offset
         self.overlap = overlap
+        self.globalNs = globalNs
 
         self.spatialDict = spatialDict
         self.numberOfVertices = numVertices
@@ -154,6 +218,7 @@ class _AbstractGridBuilder(object):
                 self.globalNumberOfFaces,
                 self.overlap,
                 self.offset,
+                self.globalNs,
                 self.numberOfVertices,
                 self.numberOfFaces,
                 self.numberOfCells,
@@ -191,7 +256,8 @@ class _AbstractGridBuilder(object):
         """
         Dimensionally independent face-number calculation.
 
-        >>> from fipy.meshes.builders import *
+        >>> from fipy.meshes.builders import (_Grid1DBuilder, _Grid2DBuilder,
+        ...                                   _Grid3DBuilder)
 
         >>> gb = _Grid1DBuilder()
         >>> gb._calcGlobalNumFaces([1])
@@ -235,21 +301,97 @@ class _AbstractGridBuilder(object):
     def _calcNs(self, ns, ds):
         return self.NumPtsCalcClass.calcNs(ns, ds)
 
-    def _buildOverlap(self, overlap, procID, occupiedNodes):
-        (first, sec) = (overlap * (procID > 0) * (procID < occupiedNodes),
-                        overlap * (procID < occupiedNodes - 1))
+    @staticmethod
+    def _calcPartition(ns, overlaps, Nproc, partition=None):
+        """
+        The number of processes along each axis of a grid of `ns` cells.
+
+        Unless a `partition` is given, the grid is divided among as many
+        of the `Nproc` processes as possible, each with at least as many
+        cells along an axis as its overlap, into the blocks with the
+        fewest faces between them. Of equally good partitions, the one
+        along the last axes is chosen, so a grid is divided into slabs
+        along its last axis unless compact blocks are better.
+
+        >>> print _AbstractGridBuilder._calcPartition([100, 100], [2, 2], 4)
+        (2, 2)
+        >>> print _AbstractGridBuilder._calcPartition([1000, 10], [2, 2], 4)
+        (4, 1)
+        >>> print _AbstractGridBuilder._calcPartition([100, 100], [2, 2], 7)
+        (1, 7)
+        >>> print _AbstractGridBuilder._calcPartition([20, 20, 20], [2, 2, 2], 8)
+        (2, 2, 2)
+        >>> print _AbstractGridBuilder._calcPartition([40, 40, 10], [2, 2, 2], 16)
+        (4, 4, 1)
+        >>> print _AbstractGridBuilder._calcPartition([100], [2], 4)
+        (4,)
+        >>> print _AbstractGridBuilder._calcPartition([100, 100], [2, 2], 6, partition=(3, 2))
+        (3, 2)
+        >>> print _AbstractGridBuilder._calcPartition([100, 100], [2, 2], 4, partition=(3, 2))
+        Traceback (most recent call last):
+            ...
+        ValueError: partition (3, 2) needs more than 4 processes
+        """
+        if partition is not None:
+            partition = tuple(int(p) for p in partition)
+            if len(partition) != len(ns) or min(partition) < 1:
+                raise ValueError("partition %s does not divide a %dD grid"
+                                 % (partition, len(ns)))
+            if reduce(lambda x, y: x * y, partition) > Nproc:
+                raise ValueError("partition %s needs more than %d processes"
+                                 % (partition, Nproc))
+            return partition
+
+        def occupied(n, overlap, procs):
+            cellsPerNode = max(n // procs, overlap)
+            return min(n // (cellsPerNode or 1), procs)
+
+        most = [occupied(n, overlap, Nproc) for n, overlap in zip(ns, overlaps)]
+        numCells = reduce(lambda x, y: x * y, ns)
+
+        def candidates(axis, procs):
+            # the last axis takes all of the remaining processes, as
+            # fewer could not occupy more of them
+            if axis == len(ns) - 1:
+                yield (procs,)
+            else:
+                for p in range(1, max(min(most[axis], procs), 1) + 1):
+                    for rest in candidates(axis + 1, procs // p):
+                        yield (p,) + rest
+
+        best = None
+        for candidate in candidates(0, Nproc):
+            occupiedProcs = [occupied(n, overlap, p)
+                             for n, overlap, p in zip(ns, overlaps, candidate)]
+            numProcs = reduce(lambda x, y: x * y, occupiedProcs)
+            interfaces = sum((p - 1) * (numCells // n)
+                             for n, p in zip(ns, occupiedProcs) if n > 0)
+            key = (-numProcs, interfaces, candidate)
+            if best is None or key < best:
+                best = key
+
+        return best[-1]
 
-        return first, sec, self._packOverlap(first, sec)
+    def _buildOverlap(self, overlap, procID, occupiedNodes):
+        """
+        The overlaps below and above the block of cells at position
+        `procID`, out of the `occupiedNodes` along an axis.
+        """
+        return (overlap * (procID > 0) * (procID < occupiedNodes),
+                overlap * (procID < occupiedNodes - 1))
 
-    def _packOverlap(self, first, sec):
+    def _packOverlap(self, firsts, secs):
         raise NotImplementedError
 
-    def _packOffset(self, arg):
+    def _packOffset(self, args):
         raise NotImplementedError
 
     def _mult(self, x, y):
         return x*y
 
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
 if __name__ == '__main__':
-    import doctest
-    doctest.testmod()
+    _test()
@@ -14,11 +14,11 @@ class _Grid1DBuilder(_AbstractGridBuilder):
         kwargs["cacheOccupiedNodes"] = True
         super(_Grid1DBuilder, self).buildGridData(*args, **kwargs)
 
-    def _packOverlap(self, first, second):
-        return {'left': first, 'right': second}
+    def _packOverlap(self, firsts, seconds):
+        return {'left': firsts[0], 'right': seconds[0]}
 
-    def _packOffset(self, arg):
-        return arg
+    def _packOffset(self, args):
+        return args[0]
 
     @property
     def _specificGridData(self):
@@ -91,9 +91,11 @@ class _UniformGrid1DBuilder(_Grid1DBuilder):
 
         super(_UniformGrid1DBuilder, self).__init__()
 
-    def buildGridData(self, ns, ds, overlap, communicator, origin):
+    def buildGridData(self, ns, ds, overlap, communicator, origin,
+                      partition=None):
         super(_UniformGrid1DBuilder, self).buildGridData(ns, ds, overlap,
-                                                        communicator)
+                                                        communicator,
+                                                        partition=partition)
 
         self.origin = _UniformOrigin.calcOrigin(origin,
                                                 self.offset, self.ds, self.scale)
@@ -158,11 +158,12 @@ class _Grid2DBuilder(_AbstractGridBuilder):
                 cellFaceIDs[3,:] = cellFaceIDs[1,:] - 1
             return cellFaceIDs
 
-    def _packOverlap(self, first, second):
-        return {'left': 0, 'right': 0, 'bottom': first, 'top': second}
+    def _packOverlap(self, firsts, seconds):
+        return {'left': firsts[0], 'right': seconds[0],
+                'bottom': firsts[1], 'top': seconds[1]}
 
-    def _packOffset(self, arg):
-        return (0, arg)
+    def _packOffset(self, args):
+        return tuple(args)
 
 class _NonuniformGrid2DBuilder(_Grid2DBuilder):
 
@@ -209,10 +210,12 @@ class _UniformGrid2DBuilder(_Grid2DBuilder):
 
         super(_UniformGrid2DBuilder, self).__init__()
 
-    def buildGridData(self, ds, ns, overlap, communicator, origin):
+    def buildGridData(self, ds, ns, overlap, communicator, origin,
+                      partition=None):
         # call super for side-effects
         super(_UniformGrid2DBuilder, self).buildGridData(ds, ns, overlap,
-                                                        communicator)
+                                                        communicator,
+                                                        partition=partition)
 
         self.origin = _UniformOrigin.calcOrigin(origin,
                                                 self.offset, self.ds, self.scale)
@@ -16,4 +16,4 @@ class _PeriodicGrid1DBuilder(_NonuniformGrid1DBuilder):
             return super(_PeriodicGrid1DBuilder, self)._buildOverlap(overlap,
                      procID, occupiedNodes)
         else:
-            return (overlap, overlap, {'left': overlap, 'right': overlap})
+            return (overlap, overlap)
@@ -42,7 +42,7 @@ def _dnl(dx, nx, Lx):
 def Grid3D(dx=1., dy=1., dz=1.,
            nx=None, ny=None, nz=None,
            Lx=None, Ly=None, Lz=None,
-           overlap=2, communicator=parallelComm):
+           overlap=2, communicator=parallelComm, partition=None):
 
     r""" Factory function to select between UniformGrid3D and
     NonUniformGrid3D.  If `Lx` is specified the length of the domain
@@ -66,6 +66,10 @@ def Grid3D(dx=1., dy=1., dz=1.,
         `fipy.tools.serialComm`. Select `fipy.tools.serialComm` to create a
         serial mesh when running in parallel. Mostly used for test
         purposes.
+      - `partition`: the number of processes along each axis, e.g.,
+        `(2, 2, 4)`, among which the grid is divided in parallel.  By
+        default, the grid is divided into the blocks with the fewest
+        faces between them.
 
     """
 
@@ -79,13 +83,16 @@ def Grid3D(dx=1., dy=1., dz=1.,
         from fipy.meshes.uniformGrid3D import UniformGrid3D
         return UniformGrid3D(dx = dx, dy = dy, dz = dz,
                              nx = nx or 1, ny = ny or 1, nz = nz or 1,
-                             overlap=overlap, communicator=communicator)
+                             overlap=overlap, communicator=communicator,
+                             partition=partition)
     else:
         from fipy.meshes.nonUniformGrid3D import NonUniformGrid3D
         return NonUniformGrid3D(dx = dx, dy = dy, dz = dz, nx = nx, ny = ny, nz = nz,
-                                overlap=overlap, communicator=communicator)
+                                overlap=overlap, communicator=communicator,
+                                partition=partition)
 
-def Grid2D(dx=1., dy=1., nx=None, ny=None, Lx=None, Ly=None, overlap=2, communicator=parallelComm):
+def Grid2D(dx=1., dy=1., nx=None, ny=None, Lx=None, Ly=None, overlap=2, communicator=parallelComm,
+           partition=None):
     r""" Factory function to select between UniformGrid2D and
     NonUniformGrid2D.  If `Lx` is specified the length of the domain
     is always `Lx` regardless of `dx`.
@@ -105,6 +112,11 @@ def Grid2D(dx=1., dy=1., nx=None, ny=None, Lx=None, Ly=None, overlap=2, communic
           `fipy.tools.serialComm`. Select `fipy.tools.serialComm` to create a
           serial mesh when running in parallel. Mostly used for test
           purposes.
+        - `partition`: the number of processes along each axis, e.g.,
+          `(2, 4)`, among which the grid is divided in parallel.  By
+          default, the grid is divided into the blocks with the fewest
+          faces between them; `(1, Nproc)` divides it into horizontal
+          strips.
 
     >>> print Grid2D(Lx=3., nx=2).dx
     1.5
@@ -120,10 +132,12 @@ def Grid2D(dx=1., dy=1., nx=None, ny=None, Lx=None, Ly=None, overlap=2, communic
         return UniformGrid2D(dx=dx, dy=dy,
                              nx=nx, ny=ny,
                              overlap=overlap,
-                             communicator=communicator)
+                             communicator=communicator,
+                             partition=partition)
     else:
         from fipy.meshes.nonUniformGrid2D import NonUniformGrid2D
-        return NonUniformGrid2D(dx=dx, dy=dy, nx=nx, ny=ny, overlap=overlap, communicator=communicator)
+        return NonUniformGrid2D(dx=dx, dy=dy, nx=nx, ny=ny, overlap=overlap, communicator=communicator,
+                                partition=partition)
 
 def Grid1D(dx=1., nx=None, Lx=None, overlap=2, communicator=parallelComm):
     r""" Factory function to select between UniformGrid1D and
@@ -161,7 +175,8 @@ def CylindricalGrid2D(dr=None, dz=None,
                       Lx=None, Ly=None,
                       origin=((0,),(0,)),
                       overlap=2,
-                      communicator=parallelComm):
+                      communicator=parallelComm,
+                      partition=None):
 
     r""" Factory function to select between CylindricalUniformGrid2D and
     CylindricalNonUniformGrid2D. If `Lx` is specified the length of
@@ -183,6 +198,8 @@ def CylindricalGrid2D(dr=None, dz=None,
         `fipy.tools.serialComm`. Select `fipy.tools.serialComm` to create a
         serial mesh when running in parallel. Mostly used for test
         purposes.
+      - `partition`: the number of processes along each axis, e.g.,
+        `(2, 4)`, among which the grid is divided in parallel.
 
     """
 
@@ -207,10 +224,12 @@ def CylindricalGrid2D(dr=None, dz=None,
         dx, nx = _dnl(dx, nx, Lx)
         dy, ny = _dnl(dy, ny, Ly)
         from fipy.meshes.cylindricalUniformGrid2D import CylindricalUniformGrid2D
-        return CylindricalUniformGrid2D(dx=dx, dy=dy, nx=nx or 1, ny=ny or 1, origin=origin, overlap=overlap, communicator=communicator)
+        return CylindricalUniformGrid2D(dx=dx, dy=dy, nx=nx or 1, ny=ny or 1, origin=origin, overlap=overlap, communicator=communicator,
+                                        partition=partition)
     else:
         from fipy.meshes.cylindricalNonUniformGrid2D import CylindricalNonUniformGrid2D
-        return CylindricalNonUniformGrid2D(dx=dx, dy=dy, nx=nx, ny=ny, origin=origin, overlap=overlap, communicator=communicator)
+        return CylindricalNonUniformGrid2D(dx=dx, dy=dy, nx=nx, ny=ny, origin=origin, overlap=overlap, communicator=communicator,
+                                           partition=partition)
 
 def CylindricalGrid1D(dr=None, nr=None, Lr=None,
                       dx=1., nx=None, Lx=None,
@@ -1,6 +1,8 @@
 __docformat__ = 'restructuredtext'
 
 import os
+import hashlib
+import itertools
 from subprocess import Popen, PIPE
 import sys
 import tempfile
@@ -49,6 +51,14 @@ class GmshException(Exception):
 class MeshExportError(GmshException):
     pass
 
+# number of nodes of each type of Gmsh element
+_nodesPerElementType = {
+     1: 2,  2: 3,  3: 4,  4: 4,  5: 8,  6: 6,  7: 5,  8: 3,  9: 6, 10: 9,
+    11: 10, 12: 27, 13: 18, 14: 14, 15: 1, 16: 8, 17: 20, 18: 15, 19: 13,
+    20: 9, 21: 10, 22: 12, 23: 15, 24: 15, 25: 21, 26: 4, 27: 5, 28: 6,
+    29: 20, 30: 35, 31: 56, 92: 64, 93: 125
+}
+
 def gmshVersion(communicator=parallelComm):
     """Determine the version of Gmsh.
 
@@ -456,8 +466,13 @@ class MSHFile(GmshFile):
     Does not support gmsh versions < 2. If partitioning, gmsh
     version must be >= 2.5.
 
-    TODO: Refactor face extraction functions.
+    Reads both ASCII and binary files. The nodes and elements are read
+    `_chunkSize` at a time and each chunk is parsed with array operations,
+    so that memory use is bounded and no Python loop runs per element.
     """
+
+    _chunkSize = 100000
+
     def __init__(self, filename,
                        dimensions,
                        coordDimensions=None,
@@ -497,30 +512,153 @@ class MSHFile(GmshFile):
         self.fileobj.seek(0)
         return [float(x) for x in metaData]
 
-    def _isolateData(self, title):
+    def _getEndianness(self):
         """
-        Gets all data between $[title] and $End[title], writes
-        it out to its own file.
+        Binary files record the integer 1 right after the format line,
+        from which the byte order of the file is deduced.
         """
-        newF, newPath = tempfile.mkstemp(title, text=True)
-        newF = os.fdopen(newF, 'w')
-        try:
-            self._seekForHeader(title)
-        except Exception, e:
-            newF.close()
-            os.unlink(newPath)
-            raise
+        self.fileobj.seek(0)
+        self._seekForHeader("MeshFormat")
+        self.fileobj.readline()
+        one = self._readBytes(4)
+        self.fileobj.seek(0)
+        if nx.frombuffer(one, dtype='<i4')[0] == 1:
+            return '<'
+        elif nx.frombuffer(one, dtype='>i4')[0] == 1:
+            return '>'
+        else:
+            raise GmshException("Cannot determine the byte order of %s" % self.filename)
 
-        # extract the actual data within section
-        while True:
-            line = self.fileobj.readline()
-            if ("$End%s" % title) not in line:
-                newF.write(line)
-            else: break
+    def _chunks(self, count):
+        """
+        Generate the start and length of successive chunks of at most
+        `_chunkSize` out of `count` records.
+        """
+        for start in range(0, count, self._chunkSize):
+            yield start, min(self._chunkSize, count - start)
+
+    def _readLines(self, count):
+        """
+        Read the next `count` lines, joined into a single string.
+        """
+        lines = list(itertools.islice(iter(self.fileobj.readline, ''), count))
+        if len(lines) < count:
+            raise EOFError("Unexpected end of %s" % self.filename)
+        return "".join(lines)
+
+    def _readBytes(self, count):
+        """
+        Read the next `count` bytes.
+        """
+        data = self.fileobj.read(count)
+        if len(data) < count:
+            raise EOFError("Unexpected end of %s" % self.filename)
+        return data
+
+    @staticmethod
+    def _tokensPerLine(text, numLines):
+        """
+        Count the whitespace-separated tokens on each of the `numLines`
+        lines of `text`.
+
+            >>> print MSHFile._tokensPerLine("1 2  3\\n 4 5\\n6\\n", 3)
+            [3 2 1]
+        """
+        chars = nx.frombuffer(text, dtype=nx.uint8)
+        newlines = (chars == ord("\n"))
+        blank = newlines | (chars == ord(" ")) | (chars == ord("\t")) | (chars == ord("\r"))
+        # a token starts with any non-blank character that follows a blank one
+        starts = ~blank
+        starts[1:] &= blank[:-1]
+        lines = nx.cumsum(newlines) - newlines
+        return nx.bincount(lines[starts], minlength=numLines)[:numLines]
+
+    def _readNodes(self):
+        """
+        Read the $Nodes section, `_chunkSize` nodes at a time.
+
+        Returns the Gmsh IDs of the nodes and their (x, y, z) coordinates.
+        """
+        self.fileobj.seek(0)
+        self._seekForHeader("Nodes")
+        numNodes = int(self.fileobj.readline())
+
+        nodeIDs = nx.empty((numNodes,), dtype=nx.INT_DTYPE)
+        nodeCoords = nx.empty((numNodes, 3), dtype=float)
+
+        if self.binary:
+            dtype = nx.dtype([('id', self.endianness + 'i4'),
+                              ('coords', self.endianness + 'f8', (3,))])
+            for start, count in self._chunks(numNodes):
+                nodes = nx.frombuffer(self._readBytes(count * dtype.itemsize), dtype=dtype)
+                nodeIDs[start:start + count] = nodes['id']
+                nodeCoords[start:start + count] = nodes['coords']
+        else:
+            for start, count in self._chunks(numNodes):
+                nodes = nx.fromstring(self._readLines(count), sep=" ")
+                if nodes.shape != (4 * count,):
+                    raise GmshException("Malformed $Nodes section in %s" % self.filename)
+                nodes = nodes.reshape((count, 4))
+                nodeIDs[start:start + count] = nodes[:, 0]
+                nodeCoords[start:start + count] = nodes[:, 1:]
+
+        self.fileobj.seek(0)
+        return nodeIDs, nodeCoords
+
+    def _readElements(self):
+        """
+        Read the $Elements section, `_chunkSize` elements at a time.
+
+        Generates, for each run of elements of the same type and number of
+        tags, a tuple of their positions in the file, their type, their
+        Gmsh IDs, their tags, and their nodes.
+        """
+        self.fileobj.seek(0)
+        self._seekForHeader("Elements")
+        numElements = int(self.fileobj.readline())
+
+        position = 0
+        if self.binary:
+            while position < numElements:
+                header = nx.frombuffer(self._readBytes(12), dtype=self.endianness + 'i4')
+                elType, numFollow, numTags = [int(x) for x in header]
+                if elType not in _nodesPerElementType:
+                    raise GmshException("Unknown element type %d in %s" % (elType, self.filename))
+                width = 1 + numTags + _nodesPerElementType[elType]
+                for start, count in self._chunks(numFollow):
+                    elements = nx.frombuffer(self._readBytes(4 * width * count),
+                                             dtype=self.endianness + 'i4')
+                    elements = elements.reshape((count, width)).astype(nx.INT_DTYPE)
+                    yield (nx.arange(position, position + count), elType,
+                           elements[:, 0], elements[:, 1:1 + numTags], elements[:, 1 + numTags:])
+                    position += count
+        else:
+            for start, count in self._chunks(numElements):
+                text = self._readLines(count)
+                tokens = nx.fromstring(text, dtype=nx.INT_DTYPE, sep=" ")
+                tokensPerLine = self._tokensPerLine(text, count)
+                if len(tokens) != tokensPerLine.sum() or (tokensPerLine < 3).any():
+                    raise GmshException("Malformed $Elements section in %s" % self.filename)
+                lineStarts = nx.cumsum(tokensPerLine) - tokensPerLine
+                elTypes = tokens[lineStarts + 1]
+                numTags = tokens[lineStarts + 2]
+
+                # elements of the same type and number of tags occupy
+                # the same number of tokens, so they can be gathered together
+                runs = elTypes * (numTags.max() + 1) + numTags
+                for run in nx.unique(runs):
+                    lines = nx.nonzero(runs == run)[0]
+                    width = tokensPerLine[lines[0]]
+                    if (tokensPerLine[lines] != width).any():
+                        raise GmshException("Elements of type %d have different numbers of nodes in %s"
+                                            % (elTypes[lines[0]], self.filename))
+                    elements = tokens[lineStarts[lines][..., nx.newaxis] + nx.arange(width)]
+                    tags = numTags[lines[0]]
+                    yield (position + lines, int(elTypes[lines[0]]),
+                           elements[:, 0], elements[:, 3:3 + tags], elements[:, 3 + tags:])
+                position += count
 
         self.fileobj.seek(0)
-        newF.close()
-        return newPath
 
     def _seekForHeader(self, title):
         """
@@ -537,121 +675,137 @@ class MSHFile(GmshFile):
             else:
                 break # found header
 
-    def _deriveCellsAndFaces(self, cellsToVertIDs, shapeTypes, numCells):
+    def _faceOrderings(self, shapeType):
+        """
+        Return the positions, among the nodes of a cell of type
+        `shapeType`, of the vertices of each of its faces.
         """
-        Uses element information obtained from `_parseElementFile` to deliver
-        `facesToVertices` and `cellsToFaces`.
+        if shapeType in [5, 12, 17]: # hexahedron
+            return [[0, 1, 2, 3], # ordering of vertices gleaned from
+                    [4, 5, 6, 7], # a one-cube Grid3D example
+                    [0, 1, 5, 4],
+                    [3, 2, 6, 7],
+                    [0, 3, 7, 4],
+                    [1, 2, 6, 5]]
+        elif shapeType in [6, 13, 18]: # prism
+            return [[0, 1, 2],
+                    [5, 4, 3],
+                    [3, 4, 1, 0],
+                    [4, 5, 2, 1],
+                    [5, 3, 0, 2]]
+        elif shapeType in [7, 14, 19]: # pyramid
+            return [[0, 1, 2, 3],
+                    [0, 1, 4],
+                    [1, 2, 4],
+                    [2, 3, 4],
+                    [3, 0, 4]]
+        else:
+            if shapeType in [2, 9, 20, 21, 22, 23, 24, 25]:
+                faceLength = 2 # triangle
+            elif shapeType in [3, 10, 16]:
+                faceLength = 2 # quadrangle
+            elif shapeType in [4, 11, 29, 30, 31]:
+                faceLength = 3 # tetrahedron
+
+            # successive vertices of a regular poly(gon|hedron); we may wrap
+            numNodes = _nodesPerElementType[shapeType]
+            return [[(i + j) % numNodes for j in range(faceLength)]
+                    for i in range(self.numFacesPerCell[shapeType])]
+
+    @staticmethod
+    def _uniqueRows(rows):
         """
+        Number the distinct rows of `rows` in order of their first
+        appearance.
+
+        Returns the number of each row and the index of the first
+        appearance of each distinct row.
 
-        allShapes  = nx.unique(shapeTypes).tolist()
-        maxFaces   = max([self.numFacesPerCell[x] for x in allShapes])
+            >>> print MSHFile._uniqueRows(nx.array([[3, 4], [1, 2], [3, 4], [0, 1], [1, 2]]))
+            (array([0, 1, 0, 2, 1]), array([0, 1, 3]))
+        """
+        order = nx.lexsort(rows.swapaxes(0, 1)[::-1])
+        sortedRows = rows[order]
+        isFirst = nx.ones((len(order),), dtype=bool)
+        isFirst[1:] = (sortedRows[1:] != sortedRows[:-1]).any(axis=1)
+        # lexsort is stable, so the first of each run of equal rows
+        # is the first appearance of that row
+        firsts = order[isFirst]
+        numbering = nx.empty((len(firsts),), dtype=int)
+        numbering[nx.argsort(firsts)] = nx.arange(len(firsts))
+        rowNumbers = nx.empty((len(order),), dtype=int)
+        rowNumbers[order] = numbering[nx.cumsum(isFirst) - 1]
+        return rowNumbers, nx.sort(firsts)
+
+    def _deriveCellsAndFaces(self, cellsToVertIDs, shapeTypes, numCells):
+        """
+        Uses element information obtained from `_parseElements` to deliver
+        `facesToVertices` and `cellsToFaces`, as well as the sorted
+        vertices of each face, which identify it.
+
+        Faces are numbered in the order they are first encountered
+        in the cells.
+        """
+        orderings = dict([(shapeType, self._faceOrderings(shapeType))
+                          for shapeType in nx.unique(shapeTypes).tolist()])
+        maxFaces = max([len(ordering) for ordering in orderings.values()])
+        maxFaceLen = max([len(face) for ordering in orderings.values() for face in ordering])
+
+        # the vertices of each face of each cell, padded at the front with -1
+        cellsFaces = -nx.ones((numCells, maxFaces, maxFaceLen), 'l')
+        hasFace = nx.zeros((numCells, maxFaces), dtype=bool)
+        for shapeType, ordering in orderings.items():
+            cells = nx.nonzero(shapeTypes == shapeType)[0]
+            for faceIdx, face in enumerate(ordering):
+                cellsFaces[cells, faceIdx, maxFaceLen - len(face):] = cellsToVertIDs[cells[..., nx.newaxis], face]
+                hasFace[cells, faceIdx] = True
+
+        faces = cellsFaces[hasFace]
+        faceKeys = nx.sort(faces, axis=1)
+        faceIDs, firsts = self._uniqueRows(faceKeys)
 
         # `cellsToFaces` must be padded with -1; see mesh.py
-        currNumFaces = 0
-        cellsToFaces = nx.ones((numCells, maxFaces), 'l') * -1
-        facesDict    = {}
-        uniqueFaces  = []
-
-        # we now build `cellsToFaces` and `uniqueFaces`,
-        # the latter will result in `facesToVertices`.
-        for cellIdx in range(numCells):
-            shapeType = shapeTypes[cellIdx]
-            cell = cellsToVertIDs[cellIdx]
-
-            if shapeType in [5, 12, 17]: # hexahedron
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2, 3], # ordering of vertices gleaned from
-                                                                 [4, 5, 6, 7], # a one-cube Grid3D example
-                                                                 [0, 1, 5, 4],
-                                                                 [3, 2, 6, 7],
-                                                                 [0, 3, 7, 4],
-                                                                 [1, 2, 6, 5]])
-            elif shapeType in [6, 13, 18]: # prism
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2],
-                                                                 [5, 4, 3],
-                                                                 [3, 4, 1, 0],
-                                                                 [4, 5, 2, 1],
-                                                                 [5, 3, 0, 2]])
-            elif shapeType in [7, 14, 19]: # pyramid
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2, 3],
-                                                                 [0, 1, 4],
-                                                                 [1, 2, 4],
-                                                                 [2, 3, 4],
-                                                                 [3, 0, 4]])
-            else:
-                if shapeType in [2, 9, 20, 21, 22, 23, 24, 25]:
-                    faceLength = 2 # triangle
-                elif shapeType in [3, 10, 16]:
-                    faceLength = 2 # quadrangle
-                elif shapeType in [4, 11, 29, 30, 31]:
-                    faceLength = 3 # tetrahedron
-
-                faces = self._extractRegularFaces(cell=cell,
-                                                  faceLength=faceLength,
-                                                  facesPerCell=self.numFacesPerCell[shapeType])
-
-            for faceIdx in range(len(faces)):
-                # NB: currFace is sorted for the key to spot duplicates
-                currFace = faces[faceIdx]
-                keyStr   = ' '.join([str(x) for x in sorted(currFace)])
-
-                if keyStr in facesDict:
-                    cellsToFaces[cellIdx][faceIdx] = facesDict[keyStr]
-                else: # new face
-                    facesDict[keyStr] = currNumFaces
-                    cellsToFaces[cellIdx][faceIdx] = currNumFaces
-                    uniqueFaces.append(currFace)
-                    currNumFaces += 1
-
-        # pad short faces with -1
-        maxFaceLen = max([len(f) for f in uniqueFaces])
-        uniqueFaces = [[-1] * (maxFaceLen - len(f)) + f for f in uniqueFaces]
-
-        facesToVertices = nx.array(uniqueFaces, dtype=nx.INT_DTYPE)
-
-        return facesToVertices.swapaxes(0,1)[::-1], cellsToFaces.swapaxes(0,1).copy('C'), facesDict
+        cellsToFaces = -nx.ones((numCells, maxFaces), 'l')
+        cellsToFaces[hasFace] = faceIDs
+
+        facesToVertices = faces[firsts].astype(nx.INT_DTYPE)
+
+        return facesToVertices.swapaxes(0,1)[::-1], cellsToFaces.swapaxes(0,1).copy('C'), faceKeys[firsts]
 
     def _translateNodesToVertices(self, entitiesNodes, vertexMap):
         """Translates entitiesNodes from Gmsh node IDs to `vertexCoords` indices.
-        """
-        entitiesVertices = []
 
-        for entity in entitiesNodes:
-            try:
-                vertIndices = vertexMap[nx.array(entity)]
-            except IndexError:
-                vertIndices = nx.ones((len(entity),), 'l') * -1
-            entitiesVertices.append(vertIndices)
+        `entitiesNodes` is padded with -1, which is preserved. Entities
+        with nodes beyond `vertexMap` are translated entirely to -1.
+        """
+        entitiesVertices = -nx.ones(entitiesNodes.shape, 'l')
+        isNode = (entitiesNodes >= 0)
+        isNode &= ~(entitiesNodes >= len(vertexMap)).any(axis=1)[..., nx.newaxis]
+        entitiesVertices[isNode] = vertexMap[entitiesNodes[isNode]]
 
         return entitiesVertices
 
-    def _extractRegularFaces(self, cell, faceLength, facesPerCell):
-        """Return faces for a regular poly(gon|hedron)
-
-        Given `cell`, defined by node IDs, returns an array of
-        `facesPerCell` faces of length `faceLength` in terms of nodes.
+    @staticmethod
+    def _matchFaces(faceKeys, keys):
         """
-        faces = []
-        for i in range(facesPerCell):
-            aFace = []
-            for j in range(faceLength):
-                aVertex = (i + j) % len(cell) # we may wrap
-                aFace.append(int(cell[aVertex]))
-            faces.append(aFace)
-        return faces
-
-    def _extractOrderedFaces(self, cell, faceOrderings):
-        """Return faces for a 8-node hexahedron cell.
+        Return the index of the row of `faceKeys` that is equal to each
+        row of `keys`, or -1 if there is none.
+
+            >>> print MSHFile._matchFaces(nx.array([[0, 1], [1, 2], [2, 3]]),
+            ...                           nx.array([[2, 3], [4, 5], [0, 1]]))
+            [ 2 -1  0]
         """
-        def orderingToFace(vertList):
-            aFace = []
-            for i in vertList:
-                aFace.append(int(cell[i]))
-            return aFace
+        if len(keys) == 0:
+            return nx.zeros((0,), 'l')
+
+        numFaces = len(faceKeys)
+        rowNumbers, firsts = MSHFile._uniqueRows(nx.concatenate((faceKeys, keys)))
+        # the faces are distinct and come first, so each is the
+        # first appearance of its row
+        faceOfRow = -nx.ones((len(firsts),), 'l')
+        faceOfRow[rowNumbers[:numFaces]] = nx.arange(numFaces)
 
-        return [orderingToFace(o) for o in faceOrderings]
+        return faceOfRow[rowNumbers[numFaces:]]
 
     def read(self):
         """
@@ -662,162 +816,149 @@ class MSHFile(GmshFile):
         3. Build faces
         4. Build cellsToFaces
 
-        Isolate relevant data into three files, store in
-        `self.nodesPath` for $Nodes,
-        `self.elemsPath` for $Elements.
-        `self.namesFile` for $PhysicalNames.
+        Both ASCII and binary files are read. The $Nodes and $Elements
+        sections are read in chunks of `_chunkSize` records, each of which
+        is parsed in bulk.
 
         Returns vertexCoords, facesToVertexID, cellsToFaceID,
                 cellGlobalIDMap, ghostCellGlobalIDMap.
         """
         self.version, self.fileType, self.dataSize = self._getMetaData()
-        self.nodesPath = self._isolateData("Nodes")
-        self.elemsPath = self._isolateData("Elements")
-        try:
-            self.namesPath = self._isolateData("PhysicalNames")
-        except EOFError, e:
-            self.namesPath = None
-
-        try:
-            if self.dimensions is None:
-                nodesFile = open(self.nodesPath, 'r')
-                nodesFile.readline() # skip number of nodes
-
-                # We assume we have a 2D file unless we find a node
-                # with a non-zero Z coordinate
+        self.binary = (self.fileType == 1)
+        if self.binary:
+            if 'b' not in self.mode:
+                self.fileobj.close()
+                self.mode += 'b'
+                self.fileobj = open(self.filename, self.mode)
+            self.endianness = self._getEndianness()
+
+        nodeIDs, nodeCoords = self._readNodes()
+
+        if self.dimensions is None:
+            # We assume we have a 2D file unless we find a node
+            # with a non-zero Z coordinate
+            if (nodeCoords[:, 2] != 0.0).any():
+                self.dimensions = 3
+            else:
                 self.dimensions = 2
-                for node in nodesFile:
-                    line   = node.split()
-
-                    newVert = [float(x) for x in line]
-
-                    if newVert[2] != 0.0:
-                        self.dimensions = 3
-                        break
 
-                nodesFile.close()
-
-            self.coordDimensions = self.coordDimensions or self.dimensions
-
-            # we need a conditional here so we don't pick up 2D shapes in 3D
-            if self.dimensions == 2:
-                self.numVertsPerFace = {1: 2, # 2-node line
-                                        8: 2} # 3-node line
-                self.numFacesPerCell = { 2: 3, # 3-node triangle (3 faces)
-                                         9: 3, # 6-node triangle (we only read 1st 3)
-                                        20: 3, # 9-node triangle (we only read 1st 3)
-                                        21: 3, # 10-node triangle (we only read 1st 3)
-                                        22: 3, # 12-node triangle (we only read 1st 3)
-                                        23: 3, # 15-node triangle (we only read 1st 3)
-                                        24: 3, # 15-node triangle (we only read 1st 3)
-                                        25: 3, # 21-node triangle (we only read 1st 3)
-                                         3: 4, # 4-node quadrangle (4 faces)
-                                        10: 4, # 9-node quadrangle (we only read 1st 4)
-                                        16: 4} # 8-node quadrangle (we only read 1st 4)
-            elif self.dimensions == 3:
-                self.numVertsPerFace = { 2: 3, # 3-node triangle (3 vertices)
-                                         9: 3, # 6-node triangle (we only read 1st 3)
-                                        20: 3, # 9-node triangle (we only read 1st 3)
-                                        21: 3, # 10-node triangle (we only read 1st 3)
-                                        22: 3, # 12-node triangle (we only read 1st 3)
-                                        23: 3, # 15-node triangle (we only read 1st 3)
-                                        24: 3, # 15-node triangle (we only read 1st 3)
-                                        25: 3, # 21-node triangle (we only read 1st 3)
-                                         3: 4, # 4-node quadrangle (4 vertices)
-                                        10: 4, # 9-node quadrangle (we only read 1st 4)
-                                        16: 4} # 8-node quadrangle (we only read 1st 4)
-                self.numFacesPerCell = { 4: 4, # 4-node tetrahedron (4 faces)
-                                        11: 4, # 10-node tetrahedron (we only read 1st 4)
-                                        29: 4, # 20-node tetrahedron (we only read 1st 4)
-                                        30: 4, # 35-node tetrahedron (we only read 1st 4)
-                                        31: 4, # 56-node tetrahedron (we only read 1st 4)
-                                         5: 6, # 8-node hexahedron (6 faces)
-                                        12: 6, # 27-node tetrahedron (we only read 1st 6)
-                                        17: 6, # 20-node tetrahedron (we only read 1st 6)
-                                         6: 5, # 6-node prism (5 faces)
-                                        13: 5, # 18-node prism (we only read 1st 6)
-                                        18: 5, # 15-node prism (we only read 1st 6)
-                                         7: 5, # 5-node pyramid (5 faces)
-                                        14: 5, # 14-node pyramid (we only read 1st 5)
-                                        19: 5} # 13-node pyramid (we only read 1st 5)
-            else:
-                raise GmshException("Mesh has fewer than 2 or more than 3 dimensions")
-
-            parprint("Parsing elements.")
-            (cellsData,
-             ghostsData,
-             facesData) = self._parseElementFile()
-
-            cellsToGmshVerts = cellsData.nodes + ghostsData.nodes
-            numCellsTotal    = len(cellsData.nodes) + len(ghostsData.nodes)
-            allShapeTypes    = cellsData.shapes + ghostsData.shapes
-            allShapeTypes    = nx.array(allShapeTypes)
-            allShapeTypes    = nx.delete(allShapeTypes, nx.s_[numCellsTotal:])
-            self.physicalCellMap = nx.array(cellsData.physicalEntities
-                                            + ghostsData.physicalEntities)
-            self.geometricalCellMap = nx.array(cellsData.geometricalEntities
-                                               + ghostsData.geometricalEntities)
-
-            if numCellsTotal < 1:
-                errStr = "Gmsh hasn't produced any cells! Check your Gmsh code."
-                errStr += "\n\nGmsh output:\n%s" % "".join(self.gmshOutput).rstrip()
-                raise GmshException(errStr)
-
-            parprint("Recovering coords.")
-            parprint("numcells %d" % numCellsTotal)
-            vertexCoords, vertIDtoIdx = self._vertexCoordsAndMap(cellsToGmshVerts)
-
-            # translate Gmsh IDs to `vertexCoord` indices
-            cellsToVertIDs = self._translateNodesToVertices(cellsToGmshVerts,
-                                                            vertIDtoIdx)
-
-            parprint("Building cells and faces.")
-            (facesToV,
-             cellsToF,
-             facesDict) = self._deriveCellsAndFaces(cellsToVertIDs,
-                                                    allShapeTypes,
-                                                    numCellsTotal)
-
-            # cell entities were easy to record on parsing
-            # but we don't use Gmsh faces, so we need to correlate the nodes
-            # that make up the Gmsh faces with the vertex IDs of the FiPy faces
-            # so that we can check if any are named
-            faceEntitiesDict = dict()
-
-            # translate Gmsh IDs to `vertexCoord` indices
-            facesToVertIDs = self._translateNodesToVertices(facesData.nodes,
-                                                            vertIDtoIdx)
-
-            for face, physicalEntity, geometricalEntity in zip(facesToVertIDs,
-                                                               facesData.physicalEntities,
-                                                               facesData.geometricalEntities):
-                faceEntitiesDict[' '.join([str(x) for x in sorted(face)])] = (physicalEntity, geometricalEntity)
-
-            self.physicalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
-            self.geometricalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
-            for face in facesDict.keys():
-                # not all faces are necessarily tagged
-                if face in faceEntitiesDict:
-                    self.physicalFaceMap[facesDict[face]] = faceEntitiesDict[face][0]
-                    self.geometricalFaceMap[facesDict[face]] = faceEntitiesDict[face][1]
-
-            self.physicalNames = self._parseNamesFile()
-
-        finally:
-            os.unlink(self.nodesPath)
-            os.unlink(self.elemsPath)
-            if self.namesPath is not None:
-                os.unlink(self.namesPath)
-
-        # convert lists of cell vertices to a properly oriented masked array
-        maxVerts = max([len(v) for v in cellsToVertIDs])
-        # ticket:539 - NumPy 1.7 casts to array before concatenation and empty array defaults to float
-        cellsToVertIDs = [nx.concatenate((v, nx.array([-1] * (maxVerts-len(v)), dtype=nx.INT_DTYPE))) for v in cellsToVertIDs]
-        cellsToVertIDs = nx.MA.masked_equal(cellsToVertIDs, value=-1).swapaxes(0,1)
+        self.coordDimensions = self.coordDimensions or self.dimensions
+        # we need a conditional here so we don't pick up 2D shapes in 3D
+        if self.dimensions == 2:
+            self.numVertsPerFace = {1: 2, # 2-node line
+                                    8: 2} # 3-node line
+            self.numFacesPerCell = { 2: 3, # 3-node triangle (3 faces)
+                                     9: 3, # 6-node triangle (we only read 1st 3)
+                                    20: 3, # 9-node triangle (we only read 1st 3)
+                                    21: 3, # 10-node triangle (we only read 1st 3)
+                                    22: 3, # 12-node triangle (we only read 1st 3)
+                                    23: 3, # 15-node triangle (we only read 1st 3)
+                                    24: 3, # 15-node triangle (we only read 1st 3)
+                                    25: 3, # 21-node triangle (we only read 1st 3)
+                                     3: 4, # 4-node quadrangle (4 faces)
+                                    10: 4, # 9-node quadrangle (we only read 1st 4)
+                                    16: 4} # 8-node quadrangle (we only read 1st 4)
+        elif self.dimensions == 3:
+            self.numVertsPerFace = { 2: 3, # 3-node triangle (3 vertices)
+                                     9: 3, # 6-node triangle (we only read 1st 3)
+                                    20: 3, # 9-node triangle (we only read 1st 3)
+                                    21: 3, # 10-node triangle (we only read 1st 3)
+                                    22: 3, # 12-node triangle (we only read 1st 3)
+                                    23: 3, # 15-node triangle (we only read 1st 3)
+                                    24: 3, # 15-node triangle (we only read 1st 3)
+                                    25: 3, # 21-node triangle (we only read 1st 3)
+                                     3: 4, # 4-node quadrangle (4 vertices)
+                                    10: 4, # 9-node quadrangle (we only read 1st 4)
+                                    16: 4} # 8-node quadrangle (we only read 1st 4)
+            self.numFacesPerCell = { 4: 4, # 4-node tetrahedron (4 faces)
+                                    11: 4, # 10-node tetrahedron (we only read 1st 4)
+                                    29: 4, # 20-node tetrahedron (we only read 1st 4)
+                                    30: 4, # 35-node tetrahedron (we only read 1st 4)
+                                    31: 4, # 56-node tetrahedron (we only read 1st 4)
+                                     5: 6, # 8-node hexahedron (6 faces)
+                                    12: 6, # 27-node tetrahedron (we only read 1st 6)
+                                    17: 6, # 20-node tetrahedron (we only read 1st 6)
+                                     6: 5, # 6-node prism (5 faces)
+                                    13: 5, # 18-node prism (we only read 1st 6)
+                                    18: 5, # 15-node prism (we only read 1st 6)
+                                     7: 5, # 5-node pyramid (5 faces)
+                                    14: 5, # 14-node pyramid (we only read 1st 5)
+                                    19: 5} # 13-node pyramid (we only read 1st 5)
+        else:
+            raise GmshException("Mesh has fewer than 2 or more than 3 dimensions")
+        parprint("Parsing elements.")
+        (cellsData,
+         ghostsData,
+         facesData) = self._parseElements()
+
+        cellsToGmshVerts = _concatenatePadded((cellsData.nodes, ghostsData.nodes))
+        numCellsTotal    = len(cellsToGmshVerts)
+        allShapeTypes    = nx.concatenate((cellsData.shapes, ghostsData.shapes))
+        self.physicalCellMap = nx.concatenate((cellsData.physicalEntities,
+                                               ghostsData.physicalEntities))
+        self.geometricalCellMap = nx.concatenate((cellsData.geometricalEntities,
+                                                  ghostsData.geometricalEntities))
+
+        if numCellsTotal < 1:
+            errStr = "Gmsh hasn't produced any cells! Check your Gmsh code."
+            errStr += "\n\nGmsh output:\n%s" % "".join(self.gmshOutput).rstrip()
+            raise GmshException(errStr)
+
+        parprint("Recovering coords.")
+        parprint("numcells %d" % numCellsTotal)
+        vertexCoords, vertIDtoIdx = self._vertexCoordsAndMap(cellsToGmshVerts, nodeIDs, nodeCoords)
+        del nodeIDs, nodeCoords
+
+        # translate Gmsh IDs to `vertexCoord` indices
+        cellsToVertIDs = self._translateNodesToVertices(cellsToGmshVerts,
+                                                        vertIDtoIdx)
+
+        parprint("Building cells and faces.")
+        (facesToV,
+         cellsToF,
+         faceKeys) = self._deriveCellsAndFaces(cellsToVertIDs,
+                                               allShapeTypes,
+                                               numCellsTotal)
+
+        # cell entities were easy to record on parsing
+        # but we don't use Gmsh faces, so we need to correlate the nodes
+        # that make up the Gmsh faces with the vertex IDs of the FiPy faces
+        # so that we can check if any are named
+
+        # translate Gmsh IDs to `vertexCoord` indices
+        facesToVertIDs = self._translateNodesToVertices(facesData.nodes,
+                                                        vertIDtoIdx)
+
+        # sorting moves the padding to the front, as in `faceKeys`, but
+        # a Gmsh face with a node that is not a vertex of any cell matches
+        # no FiPy face
+        isTagged = ((facesToVertIDs >= 0) == (facesData.nodes >= 0)).all(axis=1)
+        facesToVertIDs = nx.sort(facesToVertIDs, axis=1)
+        maxFaceLen = faceKeys.shape[1]
+        if facesToVertIDs.shape[1] > maxFaceLen:
+            excess = facesToVertIDs.shape[1] - maxFaceLen
+            isTagged &= (facesToVertIDs[:, :excess] == -1).all(axis=1)
+            facesToVertIDs = facesToVertIDs[:, excess:]
+        elif facesToVertIDs.shape[1] < maxFaceLen:
+            facesToVertIDs = _concatenatePadded((facesToVertIDs,), width=maxFaceLen, front=True)
+
+        faceIDs = self._matchFaces(faceKeys, facesToVertIDs)
+        # not all faces are necessarily tagged
+        isTagged &= (faceIDs >= 0)
+
+        self.physicalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
+        self.geometricalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
+        self.physicalFaceMap[faceIDs[isTagged]] = facesData.physicalEntities[isTagged]
+        self.geometricalFaceMap[faceIDs[isTagged]] = facesData.geometricalEntities[isTagged]
+
+        self.physicalNames = self._parseNames()
+
+        # orient the padded cell vertices as a masked array
+        cellsToVertIDs = nx.MA.masked_equal(cellsToVertIDs.astype(nx.INT_DTYPE), value=-1).swapaxes(0,1)
 
         parprint("Done with cells and faces.")
         return (vertexCoords, facesToV, cellsToF,
-                cellsData.idmap, ghostsData.idmap,
+                cellsData.idmap.tolist(), ghostsData.idmap.tolist(),
                 cellsToVertIDs)
 
     def write(self, obj, time=0.0, timeindex=0):
@@ -947,160 +1088,128 @@ class MSHFile(GmshFile):
 
         self.fileobj.write("$EndElementData\n")
 
-    def _vertexCoordsAndMap(self, cellsToGmshVerts):
+    def _vertexCoordsAndMap(self, cellsToGmshVerts, nodeIDs, nodeCoords):
         """
         Returns `vertexCoords` and mapping from Gmsh ID to `vertexCoords`
         indices (same as in MSHFile).
 
-        Unlike parent, doesn't use genfromtxt
-        because we want to avoid loading the entire msh file into memory.
+        Only the nodes that are vertices of `cellsToGmshVerts` are kept.
         """
-        allVerts     = [v for c in cellsToGmshVerts for v in c] # flatten
-        allVerts     = nx.unique(nx.array(allVerts, dtype=nx.INT_DTYPE)) # remove dups
-        allVerts     = nx.sort(allVerts)
+        allVerts     = nx.unique(cellsToGmshVerts[cellsToGmshVerts >= 0]) # sorted, without dups
         maxVertIdx   = allVerts[-1] + 1 # add one to offset zero
-        vertGIDtoIdx = nx.ones(maxVertIdx, 'l') * -1 # gmsh ID -> vertexCoords idx
-        vertexCoords = nx.empty((len(allVerts), self.coordDimensions))
-        nodeCount    = 0
+        vertGIDtoIdx = -nx.ones(maxVertIdx, 'l') # gmsh ID -> vertexCoords idx
 
         # establish map. This works because allVerts is a sorted set.
         vertGIDtoIdx[allVerts] = nx.arange(len(allVerts))
 
-        nodesFile = open(self.nodesPath, 'r')
-        nodesFile.readline() # skip number of nodes
-
-        # now we walk through node file with a sorted unique list of vertices
-        # in hand. When we encounter 0th element in `allVerts`, save it
-        # to `vertexCoords` then pop its ID off `allVerts`.
-        for node in nodesFile:
-            line   = node.split()
-            nodeID = int(line[0])
-
-            if nodeID == allVerts[nodeCount]:
-                newVert = [float(x) for x in line[1:self.coordDimensions+1]]
-                vertexCoords[nodeCount,:] = nx.array(newVert)
-                nodeCount += 1
-
-            if len(allVerts) == nodeCount:
-                break
+        # find the nodes of `allVerts` among all the nodes in the file
+        order = nx.argsort(nodeIDs, kind='mergesort')
+        found = order[nx.searchsorted(nodeIDs[order], allVerts).clip(0, len(order) - 1)]
+        if not (nodeIDs[found] == allVerts).all():
+            raise GmshException("Elements refer to nodes missing from %s" % self.filename)
 
-        nodesFile.close()
+        vertexCoords = nodeCoords[found, :self.coordDimensions]
 
         # transpose for FiPy
         transCoords = vertexCoords.swapaxes(0,1)
         return transCoords, vertGIDtoIdx
 
-    def _parseElementFile(self):
+    def _parseElements(self):
         """
-        Return three objects, the first for non-ghost cells, the second for
-        ghost cells, and the third for faces.
+        Return three `_ElementData`, the first for non-ghost cells, the
+        second for ghost cells, and the third for faces.
 
         All nastiness concerning ghost cell
         calculation is consolidated here: if we were ever to need to CALCULATE
         GHOST CELLS OURSELVES, the only code we'd have to change is in here.
         """
-
-        def _parseTags(offset, currLineInts):
-            if offset == -1:
-                # if first valid shape
-                offset = currLineInts[0]
-
-            numTags = currLineInts[2]
-            tags    = currLineInts[3:(3+numTags)]
+        cellsBlocks = []
+        ghostsBlocks = []
+        facesBlocks = []
+
+        # the Gmsh IDs of the first cell and first face in the file will be
+        # subtracted from gmsh IDs to obtain global IDs
+        cellOffset = None
+        faceOffset = None
+        pid = self.communicator.procID + 1
+        mismatch = None
+
+        for positions, elemType, gmshIDs, tags, nodes in self._readElements():
+            if elemType in self.numFacesPerCell:
+                blocks = cellsBlocks
+                if cellOffset is None or positions[0] < cellOffset[0]:
+                    cellOffset = (positions[0], gmshIDs[0])
+            elif elemType in self.numVertsPerFace:
+                blocks = facesBlocks
+                if faceOffset is None or positions[0] < faceOffset[0]:
+                    faceOffset = (positions[0], gmshIDs[0])
+            else:
+                continue
 
             # the partition tags for don't seem to always be present
             # and don't always make much sense when they are
 
-            if len(tags) >= 2:
-                physicalEntity = tags.pop(0)
-                geometricalEntity = tags.pop(0)
+            if tags.shape[1] >= 2:
+                physicalEntities = tags[:, 0]
+                geometricalEntities = tags[:, 1]
+                tags = tags[:, 2:]
             else:
-                physicalEntity = geometricalEntity = -1
-
-            return offset, tags, physicalEntity, geometricalEntity
-
-
-        cellsData = _ElementData()
-        ghostsData = _ElementData()
-        facesData = _ElementData()
-
-        cellOffset = -1 # this will be subtracted from gmsh ID to obtain global ID
-        faceOffset = -1 # this will be subtracted from gmsh ID to obtain global ID
-        pid = self.communicator.procID + 1
+                physicalEntities = -nx.ones((len(gmshIDs),), dtype=nx.INT_DTYPE)
+                geometricalEntities = -nx.ones((len(gmshIDs),), dtype=nx.INT_DTYPE)
+                tags = tags[:, :0]
 
-        elemsFile = open(self.elemsPath, 'r')
-
-        elemsFile.readline() # skip number of elements
-        for el in elemsFile:
-            currLineInts = [int(x) for x in el.split()]
-            elemType     = currLineInts[1]
-
-            if elemType in self.numFacesPerCell.keys():
-                # element is a cell
-
-                (cellOffset,
-                 tags,
-                 physicalEntity,
-                 geometricalEntity) = _parseTags(offset=cellOffset,
-                                                 currLineInts=currLineInts)
-                currLineInts[0] -= cellOffset
-
-                if len(tags) > 0:
-                    # next item is a count
-                    if tags[0] != len(tags) - 1:
-                        warnings.warn("Partition count %d does not agree with number of remaining tags %d." % (tags[0], len(tags) - 1),
-                                      SyntaxWarning, stacklevel=2)
-                    tags = tags[1:]
-
-                if self.communicator.Nproc > 1:
-                    for tag in tags:
-                        if -tag == pid:
-                            # if we're collecting ghost cells and this is our ghost cell
-                            ghostsData.add(currLine=currLineInts, elType=elemType,
-                                           physicalEntity=physicalEntity,
-                                           geometricalEntity=geometricalEntity)
-                        elif tag == pid:
-                            # el is in this processor's partition or we collect all cells
-                            cellsData.add(currLine=currLineInts, elType=elemType,
-                                          physicalEntity=physicalEntity,
-                                          geometricalEntity=geometricalEntity)
-                else:
-                    # we collect all cells
-                    cellsData.add(currLine=currLineInts, elType=elemType,
-                                  physicalEntity=physicalEntity,
-                                  geometricalEntity=geometricalEntity)
-            elif elemType in self.numVertsPerFace.keys():
-                # element is a face
+            block = (positions, elemType, gmshIDs, physicalEntities, geometricalEntities, nodes)
 
-                (faceOffset,
-                 tags,
-                 physicalEntity,
-                 geometricalEntity) = _parseTags(offset=faceOffset,
-                                                 currLineInts=currLineInts)
-                currLineInts[0] -= faceOffset
+            if blocks is facesBlocks:
+                facesBlocks.append(block)
+                continue
 
-                facesData.add(currLine=currLineInts, elType=elemType,
-                              physicalEntity=physicalEntity,
-                              geometricalEntity=geometricalEntity)
+            if tags.shape[1] > 0:
+                # next item is a count
+                wrongCount = (tags[:, 0] != tags.shape[1] - 1)
+                if mismatch is None and wrongCount.any():
+                    mismatch = (tags[wrongCount][0, 0], tags.shape[1] - 1)
+                tags = tags[:, 1:]
+
+            if self.communicator.Nproc > 1:
+                # if we're collecting ghost cells and this is our ghost cell
+                ghosts = (tags == -pid).any(axis=1)
+                ghostsBlocks.append(_selectElements(block, ghosts))
+                # el is in this processor's partition or we collect all cells
+                cells = (tags == pid).any(axis=1)
+                cellsBlocks.append(_selectElements(block, cells))
+            else:
+                # we collect all cells
+                cellsBlocks.append(block)
 
-        elemsFile.close()
+        if mismatch is not None:
+            warnings.warn("Partition count %d does not agree with number of remaining tags %d." % mismatch,
+                          SyntaxWarning, stacklevel=2)
 
-        return cellsData, ghostsData, facesData
+        cellOffset = (cellOffset or (0, 0))[1]
+        faceOffset = (faceOffset or (0, 0))[1]
 
+        return (_ElementData(cellsBlocks, offset=cellOffset),
+                _ElementData(ghostsBlocks, offset=cellOffset),
+                _ElementData(facesBlocks, offset=faceOffset))
 
-    def _parseNamesFile(self):
+    def _parseNames(self):
         physicalNames = {
             0: dict(),
             1: dict(),
             2: dict(),
             3: dict()
         }
-        if self.namesPath is not None:
-            namesFile = open(self.namesPath, 'r')
 
-            namesFile.readline() # skip number of elements
-            for nm in namesFile:
-                nm = nm.split()
+        self.fileobj.seek(0)
+        try:
+            self._seekForHeader("PhysicalNames")
+        except EOFError:
+            pass
+        else:
+            numNames = int(self.fileobj.readline())
+            for i in range(numNames):
+                nm = self.fileobj.readline().split()
                 if self.version > 2.0:
                     dim = [int(nm.pop(0))]
                 else:
@@ -1112,29 +1221,25 @@ class MSHFile(GmshFile):
                 name = " ".join(nm)[1:-1]
                 for d in dim:
                     physicalNames[d][name] = int(num)
-
-            namesFile.close()
+        self.fileobj.seek(0)
 
         return physicalNames
 
     def makeMapVariables(self, mesh):
         """Utility function to make MeshVariables that define different domains in the mesh
         """
-        from fipy.variables.cellVariable import CellVariable
-        from fipy.variables.faceVariable import FaceVariable
-
-        self.physicalCellMap = CellVariable(mesh=mesh, value=self.physicalCellMap)
-        self.geometricalCellMap = CellVariable(mesh=mesh, value=self.geometricalCellMap)
-        self.physicalFaceMap = FaceVariable(mesh=mesh, value=self.physicalFaceMap)
-        self.geometricalFaceMap = FaceVariable(mesh=mesh, value=self.geometricalFaceMap)
-
-        physicalCells = dict()
-        for name in self.physicalNames[self.dimensions].keys():
-            physicalCells[name] = (self.physicalCellMap == self.physicalNames[self.dimensions][name])
-
-        physicalFaces = dict()
-        for name in self.physicalNames[self.dimensions-1].keys():
-            physicalFaces[name] = (self.physicalFaceMap == self.physicalNames[self.dimensions-1][name])
+        (self.physicalCellMap,
+         self.geometricalCellMap,
+         physicalCells,
+         self.physicalFaceMap,
+         self.geometricalFaceMap,
+         physicalFaces) = _makeMapVariables(mesh=mesh,
+                                            dimensions=self.dimensions,
+                                            physicalCellMap=self.physicalCellMap,
+                                            geometricalCellMap=self.geometricalCellMap,
+                                            physicalFaceMap=self.physicalFaceMap,
+                                            geometricalFaceMap=self.geometricalFaceMap,
+                                            physicalNames=self.physicalNames)
 
         return (self.physicalCellMap,
                 self.geometricalCellMap,
@@ -1144,7 +1249,7 @@ class MSHFile(GmshFile):
                 physicalFaces)
 
     def _test(self):
-        """
+        r"""
         Test exporting
 
         >>> import os
@@ -1214,35 +1319,350 @@ class MSHFile(GmshFile):
         ...     p = Popen(["gmsh", os.path.join(dir, "cyl.msh")]) # doctest: +GMSH
         ...     doctest_raw_input("CylindricalGrid2D... Press enter.")
 
+        Test reading, which does not require Gmsh, of an ASCII file
+
+        >>> ascii = os.path.join(dir, "ascii.msh")
+        >>> f = open(ascii, 'w')
+        >>> f.write(dedent('''\
+        ...     $MeshFormat
+        ...     2.2 0 8
+        ...     $EndMeshFormat
+        ...     $PhysicalNames
+        ...     1
+        ...     1 1 "bottom"
+        ...     $EndPhysicalNames
+        ...     $Nodes
+        ...     5
+        ...     1 0 0 0
+        ...     2 1 0 0
+        ...     3 1 1 0
+        ...     4 0 1 0
+        ...     5 2 0 0
+        ...     $EndNodes
+        ...     $Elements
+        ...     4
+        ...     1 1 2 1 7 1 2
+        ...     2 2 2 2 3 1 2 3
+        ...     3 2 2 2 3 1 3 4
+        ...     4 2 2 2 4 2 5 3
+        ...     $EndElements
+        ...     '''))
+        >>> f.close()
+
+        >>> f = MSHFile(ascii, dimensions=2, communicator=serialComm)
+        >>> (vertexCoords, facesToV, cellsToF,
+        ...  cellIDs, ghostCellIDs, cellsToVertIDs) = f.read()
+        >>> f.close()
+        >>> print vertexCoords
+        [[ 0.  1.  1.  0.  2.]
+         [ 0.  0.  1.  1.  0.]]
+        >>> print facesToV
+        [[1 2 0 3 0 4 2]
+         [0 1 2 2 3 1 4]]
+        >>> print cellsToF
+        [[0 2 5]
+         [1 3 6]
+         [2 4 1]]
+        >>> print cellIDs, ghostCellIDs
+        [0, 1, 2] []
+        >>> print f.physicalCellMap, f.geometricalCellMap
+        [2 2 2] [3 3 4]
+        >>> print f.physicalFaceMap, f.geometricalFaceMap
+        [1 0 0 0 0 0 0] [7 0 0 0 0 0 0]
+        >>> print f.physicalNames[1]
+        {'bottom': 1}
+
+        and of the same mesh in a binary file
+
+        >>> import struct
+        >>> binary = os.path.join(dir, "binary.msh")
+        >>> f = open(binary, 'wb')
+        >>> f.write("$MeshFormat\n2.2 1 8\n" + struct.pack("<i", 1) + "\n$EndMeshFormat\n")
+        >>> f.write('$PhysicalNames\n1\n1 1 "bottom"\n$EndPhysicalNames\n')
+        >>> f.write("$Nodes\n5\n")
+        >>> for node in range(5):
+        ...     f.write(struct.pack("<iddd", node + 1,
+        ...                         vertexCoords[0, node], vertexCoords[1, node], 0.))
+        >>> f.write("\n$EndNodes\n$Elements\n4\n")
+        >>> f.write(struct.pack("<3i5i", 1, 1, 2, 1, 1, 7, 1, 2))
+        >>> f.write(struct.pack("<3i", 2, 3, 2))
+        >>> f.write(struct.pack("<6i6i6i", 2, 2, 3, 1, 2, 3,
+        ...                                3, 2, 3, 1, 3, 4,
+        ...                                4, 2, 4, 2, 5, 3))
+        >>> f.write("\n$EndElements\n")
+        >>> f.close()
+
+        >>> f = MSHFile(binary, dimensions=2, communicator=serialComm)
+        >>> binaryData = f.read()
+        >>> f.close()
+        >>> print [nx.allequal(a, b) for a, b in zip(binaryData,
+        ...                                               (vertexCoords, facesToV, cellsToF,
+        ...                                                cellIDs, ghostCellIDs, cellsToVertIDs))]
+        [True, True, True, True, True, True]
+        >>> print f.physicalCellMap, f.geometricalCellMap
+        [2 2 2] [3 3 4]
+        >>> print f.physicalFaceMap, f.geometricalFaceMap
+        [1 0 0 0 0 0 0] [7 0 0 0 0 0 0]
+
         >>> import shutil
         >>> shutil.rmtree(dir)
         """
         pass
 
+def _makeMapVariables(mesh, dimensions, physicalCellMap, geometricalCellMap,
+                      physicalFaceMap, geometricalFaceMap, physicalNames):
+    from fipy.variables.cellVariable import CellVariable
+    from fipy.variables.faceVariable import FaceVariable
+
+    physicalCellMap = CellVariable(mesh=mesh, value=physicalCellMap)
+    geometricalCellMap = CellVariable(mesh=mesh, value=geometricalCellMap)
+    physicalFaceMap = FaceVariable(mesh=mesh, value=physicalFaceMap)
+    geometricalFaceMap = FaceVariable(mesh=mesh, value=geometricalFaceMap)
+
+    physicalCells = dict()
+    for name in physicalNames[dimensions].keys():
+        physicalCells[name] = (physicalCellMap == physicalNames[dimensions][name])
+
+    physicalFaces = dict()
+    for name in physicalNames[dimensions-1].keys():
+        physicalFaces[name] = (physicalFaceMap == physicalNames[dimensions-1][name])
+
+    return (physicalCellMap,
+            geometricalCellMap,
+            physicalCells,
+            physicalFaceMap,
+            geometricalFaceMap,
+            physicalFaces)
+
+class _GmshMeshCache(object):
+    """On-disk cache of the arrays derived from a Gmsh mesh.
+
+    If the :envvar:`FIPY_GMSH_CACHE` environment variable names a
+    directory, `Gmsh2D` and `Gmsh3D` store the topology and geometry they
+    derive from the output of Gmsh in a NumPy ".npz" file in that
+    directory. The file is named for a hash of the geometry script (or
+    of the contents of the ".geo" or ".msh" file), of the arguments that
+    affect the mesh and of the version of Gmsh. Constructing the same
+    mesh again loads these arrays and neither runs Gmsh nor parses and
+    derives the faces and geometry anew.
+
+    Meshes with a `background` and partitioned meshes are not cached.
+    Files that are included by a ".geo" file are not part of the hash.
+
+    Physical names are stored as lines of text
+
+        >>> names = {0: {}, 1: {"top": 2, "left side": 3}, 2: {"cells": 1}, 3: {}}
+        >>> lines = _GmshMeshCache._formatPhysicalNames(names)
+        >>> _GmshMeshCache._parsePhysicalNames(lines) == names
+        True
+    """
+
+    _format = 1
+
+    _meshArrays = ("vertexCoords", "faceVertexIDs", "cellFaceIDs",
+                   "cellGlobalIDs", "gCellGlobalIDs",
+                   "_orderedCellVertexIDs_data",
+                   "physicalCellMap", "geometricalCellMap",
+                   "physicalFaceMap", "geometricalFaceMap")
+
+    _geometryArrays = ("faceCellIDs",
+                       "_faceCenters", "_faceAreas", "_cellCenters",
+                       "_internalFaceToCellDistances",
+                       "_cellToFaceDistanceVectors",
+                       "_internalCellDistances", "_cellDistanceVectors",
+                       "faceNormals", "_orientedFaceNormals",
+                       "_cellVolumes", "_faceCellToCellNormals",
+                       "_faceTangents1", "_faceTangents2",
+                       "_cellToCellDistances", "_cellAreas", "_cellNormals")
+
+    def __init__(self, arg, dimensions, coordDimensions=None, communicator=parallelComm, order=1, background=None):
+        self.path = None
+
+        directory = os.environ.get("FIPY_GMSH_CACHE")
+        if (directory is None
+            or background is not None
+            or communicator.Nproc > 1):
+            return
+
+        h = hashlib.sha1()
+        h.update(repr((self._format, dimensions, coordDimensions, order,
+                       gmshVersion(communicator=communicator))))
+        if os.path.exists(arg):
+            f = open(arg, 'rb')
+            h.update(f.read())
+            f.close()
+        else:
+            h.update(arg.encode('utf-8'))
+
+        self.path = os.path.join(directory, "%s.npz" % h.hexdigest())
+
+    def load(self):
+        """Return a dictionary of the cached arrays or `None`
+        """
+        if self.path is None or not os.path.exists(self.path):
+            return None
+
+        try:
+            npz = nx.load(self.path)
+            try:
+                arrays = dict([(name, npz[name]) for name in npz.files])
+            finally:
+                npz.close()
+        except Exception:
+            # a damaged or incompatible cache file is as good as none
+            return None
+
+        for name in arrays.keys():
+            if name.endswith("__mask"):
+                data = name[:-len("__mask")]
+                arrays[data] = nx.MA.array(arrays[data], mask=arrays.pop(name))
+
+        arrays["cellGlobalIDs"] = list(arrays["cellGlobalIDs"])
+        arrays["gCellGlobalIDs"] = list(arrays["gCellGlobalIDs"])
+        arrays["physicalNames"] = self._parsePhysicalNames(arrays["physicalNames"])
+
+        return arrays
+
+    def save(self, mesh, verts, faces, cells, physicalNames,
+             physicalCellMap, geometricalCellMap, physicalFaceMap, geometricalFaceMap):
+        """Store the arrays of a freshly constructed `mesh`
+        """
+        if self.path is None:
+            return
+
+        arrays = dict(vertexCoords=verts,
+                      faceVertexIDs=faces,
+                      cellFaceIDs=cells,
+                      cellGlobalIDs=nx.array(mesh.cellGlobalIDs, dtype=nx.INT_DTYPE),
+                      gCellGlobalIDs=nx.array(mesh.gCellGlobalIDs, dtype=nx.INT_DTYPE),
+                      _orderedCellVertexIDs_data=mesh._orderedCellVertexIDs_data,
+                      physicalCellMap=physicalCellMap,
+                      geometricalCellMap=geometricalCellMap,
+                      physicalFaceMap=physicalFaceMap,
+                      geometricalFaceMap=geometricalFaceMap,
+                      physicalNames=self._formatPhysicalNames(physicalNames))
+
+        for name in self._geometryArrays:
+            arrays[name] = getattr(mesh, name)
+
+        for name in arrays.keys():
+            if isinstance(arrays[name], nx.MA.MaskedArray):
+                arrays[name + "__mask"] = nx.MA.getmaskarray(arrays[name])
+                arrays[name] = nx.MA.getdata(arrays[name])
+
+        # write under a temporary name and rename, so that concurrent
+        # jobs never see a partial file
+        directory = os.path.dirname(self.path)
+        try:
+            (f, tmpPath) = tempfile.mkstemp(suffix=".npz", dir=directory)
+            f = os.fdopen(f, 'wb')
+            try:
+                nx.savez(f, **arrays)
+            finally:
+                f.close()
+            os.rename(tmpPath, self.path)
+        except (IOError, OSError), e:
+            warnings.warn("Could not cache Gmsh mesh in %s: %s" % (directory, e),
+                          RuntimeWarning, stacklevel=3)
+
+    @staticmethod
+    def restoreGeometry(mesh, arrays):
+        """Set the geometry of `mesh` from the cached `arrays`
+        """
+        for name in _GmshMeshCache._geometryArrays[1:]:
+            setattr(mesh, name, arrays[name])
+        mesh._setScaledGeometry(mesh.scale['length'])
+
+    @staticmethod
+    def _formatPhysicalNames(physicalNames):
+        lines = ["%d %d %s" % (dim, num, name)
+                 for dim, names in physicalNames.items()
+                 for name, num in names.items()]
+        return nx.array(lines + [""])
+
+    @staticmethod
+    def _parsePhysicalNames(lines):
+        physicalNames = {
+            0: dict(),
+            1: dict(),
+            2: dict(),
+            3: dict()
+        }
+        for line in lines:
+            if line:
+                dim, num, name = str(line).split(" ", 2)
+                physicalNames[int(dim)][name] = int(num)
+
+        return physicalNames
+
 class _ElementData(object):
     """
     Bookkeeping for cells. Declared as own class for generality.
 
-    "nodes": A Python list of the vertices that make up this element
-    "shapes": A shapeTypes Python list
-    "idmap": A Python list which maps vertexCoords idx -> global ID
-    "physicalEntities": A Python list of the Gmsh physical entities each element is in
-    "geometricalEntities": A Python list of the Gmsh geometrical entities each element is in
+    "nodes": An array of the vertices that make up each element, padded with -1
+    "shapes": An array of the shapeTypes of the elements
+    "idmap": An array which maps vertexCoords idx -> global ID
+    "physicalEntities": An array of the Gmsh physical entities each element is in
+    "geometricalEntities": An array of the Gmsh geometrical entities each element is in
+
+    The elements are gathered from `blocks` of `(positions, elType,
+    gmshIDs, physicalEntities, geometricalEntities, nodes)` and put in
+    the order of their positions in the file.
     """
-    def __init__(self):
-        self.nodes = []
-        self.shapes = []
-        self.idmap = [] # vertexCoords idx -> gmsh ID (global ID)
-        self.physicalEntities = []
-        self.geometricalEntities = []
-
-    def add(self, currLine, elType, physicalEntity, geometricalEntity):
-        numTags = currLine[2]
-        self.nodes.append(currLine[(numTags+3):])
-        self.shapes.append(elType)
-        self.idmap.append(currLine[0])
-        self.physicalEntities.append(physicalEntity)
-        self.geometricalEntities.append(geometricalEntity)
+    def __init__(self, blocks=(), offset=0):
+        blocks = list(blocks)
+
+        if len(blocks) > 0:
+            order = nx.argsort(nx.concatenate([block[0] for block in blocks]), kind='mergesort')
+        else:
+            order = nx.zeros((0,), dtype=nx.INT_DTYPE)
+
+        def gather(arrays):
+            if len(arrays) > 0:
+                return nx.concatenate(arrays).astype(nx.INT_DTYPE)[order]
+            else:
+                return nx.zeros((0,), dtype=nx.INT_DTYPE)
+
+        self.nodes = _concatenatePadded([block[5] for block in blocks])[order]
+        self.shapes = gather([nx.zeros((len(block[0]),), dtype=nx.INT_DTYPE) + block[1] for block in blocks])
+        self.idmap = gather([block[2] for block in blocks]) - offset # vertexCoords idx -> gmsh ID (global ID)
+        self.physicalEntities = gather([block[3] for block in blocks])
+        self.geometricalEntities = gather([block[4] for block in blocks])
+
+def _selectElements(block, mask):
+    """
+    Select the elements of `block` where `mask` is `True`.
+    """
+    (positions, elemType, gmshIDs,
+     physicalEntities, geometricalEntities, nodes) = block
+    return (positions[mask], elemType, gmshIDs[mask],
+            physicalEntities[mask], geometricalEntities[mask], nodes[mask])
+
+def _concatenatePadded(arrays, width=0, front=False):
+    """
+    Concatenate the rows of 2D integer `arrays` of different widths,
+    padding them with -1 at the back, or at the `front`, to the widest
+    of them, or to `width`.
+
+        >>> print _concatenatePadded((nx.array([[1, 2]]), nx.array([[3], [4]])))
+        [[ 1  2]
+         [ 3 -1]
+         [ 4 -1]]
+        >>> print _concatenatePadded((nx.array([[3], [4]]),), width=2, front=True)
+        [[-1  3]
+         [-1  4]]
+    """
+    width = max([width] + [array.shape[1] for array in arrays])
+    padded = -nx.ones((sum([len(array) for array in arrays]), width), dtype=nx.INT_DTYPE)
+    start = 0
+    for array in arrays:
+        if front:
+            padded[start:start + len(array), width - array.shape[1]:] = array
+        else:
+            padded[start:start + len(array), :array.shape[1]] = array
+        start += len(array)
+
+    return padded
 
 class _GmshTopology(_MeshTopology):
 
@@ -1524,6 +1944,18 @@ class Gmsh2D(Mesh2D):
                  order=1,
                  background=None):
 
+        cache = _GmshMeshCache(arg,
+                               dimensions=2,
+                               coordDimensions=coordDimensions,
+                               communicator=communicator,
+                               order=order,
+                               background=background)
+        self._cachedArrays = cache.load()
+
+        if self._cachedArrays is not None:
+            self._initFromCache(coordDimensions=coordDimensions, communicator=communicator)
+            return
+
         self.mshFile = openMSHFile(arg,
                                    dimensions=2,
                                    coordDimensions=coordDimensions,
@@ -1559,10 +1991,56 @@ class Gmsh2D(Mesh2D):
          self.geometricalFaceMap,
          self.physicalFaces) = self.mshFile.makeMapVariables(mesh=self)
 
+        cache.save(self, verts=verts, faces=faces, cells=cells,
+                   physicalNames=self.mshFile.physicalNames,
+                   physicalCellMap=self.physicalCellMap.value,
+                   geometricalCellMap=self.geometricalCellMap.value,
+                   physicalFaceMap=self.physicalFaceMap.value,
+                   geometricalFaceMap=self.geometricalFaceMap.value)
+
         del self.mshFile
 
         parprint("Exiting Gmsh2D")
 
+    def _initFromCache(self, coordDimensions, communicator):
+        arrays = self._cachedArrays
+
+        self.cellGlobalIDs = arrays["cellGlobalIDs"]
+        self.gCellGlobalIDs = arrays["gCellGlobalIDs"]
+        self._orderedCellVertexIDs_data = arrays["_orderedCellVertexIDs_data"]
+
+        Mesh2D.__init__(self, vertexCoords=arrays["vertexCoords"],
+                              faceVertexIDs=arrays["faceVertexIDs"],
+                              cellFaceIDs=arrays["cellFaceIDs"],
+                              communicator=communicator,
+                              _TopologyClass=_GmshTopology)
+
+        (self.physicalCellMap,
+         self.geometricalCellMap,
+         self.physicalCells,
+         self.physicalFaceMap,
+         self.geometricalFaceMap,
+         self.physicalFaces) = _makeMapVariables(mesh=self,
+                                                 dimensions=2,
+                                                 physicalCellMap=arrays["physicalCellMap"],
+                                                 geometricalCellMap=arrays["geometricalCellMap"],
+                                                 physicalFaceMap=arrays["physicalFaceMap"],
+                                                 geometricalFaceMap=arrays["geometricalFaceMap"],
+                                                 physicalNames=arrays["physicalNames"])
+
+        self._cachedArrays = None
+
+    def _calcFaceCellIDs(self):
+        if getattr(self, "_cachedArrays", None) is not None:
+            return self._cachedArrays["faceCellIDs"]
+        return super(Gmsh2D, self)._calcFaceCellIDs()
+
+    def _setGeometry(self, scaleLength = 1.):
+        if getattr(self, "_cachedArrays", None) is not None:
+            _GmshMeshCache.restoreGeometry(self, self._cachedArrays)
+        else:
+            super(Gmsh2D, self)._setGeometry(scaleLength=scaleLength)
+
     def __setstate__(self, state):
         super(Gmsh2D, self).__setstate__(state)
         self.cellGlobalIDs = list(nx.arange(self.cellFaceIDs.shape[-1]))
@@ -1659,6 +2137,25 @@ class Gmsh2D(Mesh2D):
         ...     p = Popen(["gmsh", mshFile]) # doctest: +GMSH
         ...     doctest_raw_input("Circle... Press enter.")
 
+        Meshes can be cached on disk, so that constructing them again
+        neither runs Gmsh nor derives their faces and geometry
+
+        >>> cacheDir = tempfile.mkdtemp()
+        >>> os.environ["FIPY_GMSH_CACHE"] = cacheDir
+        >>> cached = Gmsh2D(mshFile) # doctest: +GMSH, +SERIAL
+        >>> print os.listdir(cacheDir)[0].endswith(".npz") # doctest: +GMSH, +SERIAL
+        True
+        >>> fromCache = Gmsh2D(mshFile) # doctest: +GMSH, +SERIAL
+        >>> print nx.allclose(fromCache.cellCenters, cached.cellCenters) # doctest: +GMSH, +SERIAL
+        True
+        >>> print nx.allclose(fromCache._cellDistances, cached._cellDistances) # doctest: +GMSH, +SERIAL
+        True
+        >>> print (fromCache.exteriorFaces == cached.exteriorFaces).all() # doctest: +GMSH, +SERIAL
+        True
+        >>> del os.environ["FIPY_GMSH_CACHE"]
+        >>> import shutil
+        >>> shutil.rmtree(cacheDir)
+
         >>> os.remove(mshFile)
 
         >>> cmd = "Point(1) = {0, 0, 0, 0.05};"
@@ -1885,6 +2382,17 @@ class Gmsh3D(Mesh):
         lengths of the mesh cells
     """
     def __init__(self, arg, communicator=parallelComm, order=1, background=None):
+        cache = _GmshMeshCache(arg,
+                               dimensions=3,
+                               communicator=communicator,
+                               order=order,
+                               background=background)
+        self._cachedArrays = cache.load()
+
+        if self._cachedArrays is not None:
+            self._initFromCache(communicator=communicator)
+            return
+
         self.mshFile  = openMSHFile(arg,
                                     dimensions=3,
                                     communicator=communicator,
@@ -1917,8 +2425,54 @@ class Gmsh3D(Mesh):
          self.geometricalFaceMap,
          self.physicalFaces) = self.mshFile.makeMapVariables(mesh=self)
 
+        cache.save(self, verts=verts, faces=faces, cells=cells,
+                   physicalNames=self.mshFile.physicalNames,
+                   physicalCellMap=self.physicalCellMap.value,
+                   geometricalCellMap=self.geometricalCellMap.value,
+                   physicalFaceMap=self.physicalFaceMap.value,
+                   geometricalFaceMap=self.geometricalFaceMap.value)
+
         del self.mshFile
 
+    def _initFromCache(self, communicator):
+        arrays = self._cachedArrays
+
+        self.cellGlobalIDs = arrays["cellGlobalIDs"]
+        self.gCellGlobalIDs = arrays["gCellGlobalIDs"]
+        self._orderedCellVertexIDs_data = arrays["_orderedCellVertexIDs_data"]
+
+        Mesh.__init__(self, vertexCoords=arrays["vertexCoords"],
+                            faceVertexIDs=arrays["faceVertexIDs"],
+                            cellFaceIDs=arrays["cellFaceIDs"],
+                            communicator=communicator,
+                            _TopologyClass=_GmshTopology)
+
+        (self.physicalCellMap,
+         self.geometricalCellMap,
+         self.physicalCells,
+         self.physicalFaceMap,
+         self.geometricalFaceMap,
+         self.physicalFaces) = _makeMapVariables(mesh=self,
+                                                 dimensions=3,
+                                                 physicalCellMap=arrays["physicalCellMap"],
+                                                 geometricalCellMap=arrays["geometricalCellMap"],
+                                                 physicalFaceMap=arrays["physicalFaceMap"],
+                                                 geometricalFaceMap=arrays["geometricalFaceMap"],
+                                                 physicalNames=arrays["physicalNames"])
+
+        self._cachedArrays = None
+
+    def _calcFaceCellIDs(self):
+        if getattr(self, "_cachedArrays", None) is not None:
+            return self._cachedArrays["faceCellIDs"]
+        return super(Gmsh3D, self)._calcFaceCellIDs()
+
+    def _setGeometry(self, scaleLength = 1.):
+        if getattr(self, "_cachedArrays", None) is not None:
+            _GmshMeshCache.restoreGeometry(self, self._cachedArrays)
+        else:
+            super(Gmsh3D, self)._setGeometry(scaleLength=scaleLength)
+
     def __setstate__(self, state):
         super(Gmsh3D, self).__setstate__(state)
         self.cellGlobalIDs = list(nx.arange(self.cellFaceIDs.shape[-1]))
@@ -54,6 +54,7 @@ class Mesh(AbstractMesh):
     """
 
     def _setTopology(self):
+        self._connectivityCache = None
         (self._interiorFaces,
          self._exteriorFaces) = self._calcInteriorAndExteriorFaceIDs()
         (self._interiorCellIDs,
@@ -136,6 +137,30 @@ class Mesh(AbstractMesh):
         self._cellAreas = self._calcCellAreas()
         self._cellNormals = self._calcCellNormals()
 
+        self._castGeometry()
+
+    def _castGeometry(self):
+        """Store the floating point geometry as `numerix.FLOAT_DTYPE`
+
+        In single precision, the geometry, the variables defined on the
+        mesh and the results of operations between them are all `float32`
+
+            >>> from fipy import Grid2D, CellVariable
+            >>> numerix.FLOAT_DTYPE, FLOAT_DTYPE = numerix.float32, numerix.FLOAT_DTYPE
+            >>> mesh = Grid2D(dx=(1., 2.), dy=(1., 2.))
+            >>> print mesh._cellVolumes.dtype, mesh.faceNormals.dtype
+            float32 float32
+            >>> var = CellVariable(mesh=mesh, value=1.)
+            >>> print var.value.dtype, (var * mesh.cellVolumes).value.dtype
+            float32 float32
+            >>> numerix.FLOAT_DTYPE = FLOAT_DTYPE
+        """
+        for name, value in self.__dict__.items():
+            if (isinstance(value, numerix.ndarray)
+                and value.dtype.kind == 'f'
+                and value.dtype != numerix.FLOAT_DTYPE):
+                setattr(self, name, value.astype(numerix.FLOAT_DTYPE))
+
     def _calcFaceAreas(self):
         faceVertexIDs = MA.filled(self.faceVertexIDs, -1)
         substitute = numerix.repeat(faceVertexIDs[numerix.newaxis, 0],
@@ -329,6 +354,8 @@ class Mesh(AbstractMesh):
 
     def _setFaceDependentScaledValues(self):
         self._scaledCellToCellDistances = self._scale['length'] * self._cellToCellDistances
+        self._leastSquaresGradCoefficientsCache = None
+        self._incidenceOperatorsCache = None
         self._areaProjections = self._calcAreaProjections()
         self._orientedAreaProjections = self._calcOrientedAreaProjections()
         self._faceToCellDistanceRatio = self._calcFaceToCellDistanceRatio()
@@ -529,6 +556,25 @@ class Mesh(AbstractMesh):
 
     """scaling"""
 
+    def _getCellCenterIndex(self, local=False):
+        """Spatial index of the cell centers, built the first time it is
+        needed and kept until the geometry of the mesh changes.
+
+        :Parameters:
+          - `local`: whether to index the local cells, instead of all the
+            cells of a mesh that is partitioned across processors.
+        """
+        key = (local, id(self._scaledCellCenters))
+        if getattr(self, "_cellCenterIndex", (None, None))[0] != key:
+            from fipy.tools.spatialIndex import _spatialIndex
+            if local:
+                centers = self._scaledCellCenters
+            else:
+                centers = self.cellCenters.globalValue
+            self._cellCenterIndex = (key, _spatialIndex(centers))
+
+        return self._cellCenterIndex[1]
+
     def _getNearestCellID(self, points):
         """
         Test cases
@@ -539,8 +585,111 @@ class Mesh(AbstractMesh):
            >>> print m0._getNearestCellID(m1.cellCenters.globalValue)
            [4 5 7 8]
 
+        The spatial index is reused
+
+           >>> index = m0._getCellCenterIndex()
+           >>> print m0._getNearestCellID(((0.,), (11.,)))
+           [6]
+           >>> index is m0._getCellCenterIndex()
+           True
+
+        """
+        return self._getCellCenterIndex().nearest(points)
+
+    def _getContainingCellID(self, points):
+        """Return the ID of the local cell that contains each of the
+        `points`, or -1 for points outside of the mesh.
+
+        Starting from the cell with the nearest center, each point walks
+        across the face it is furthest outside of, until it is inside.
+        Cells must be convex.
+
+           >>> from fipy import *
+           >>> m = Tri2D(nx=2, ny=1)
+           >>> points = ((0.5, 0.5, 1.9, 2.5, 1.), (0.1, 0.9, 0.5, 0.5, 1.))
+           >>> ids = m._getContainingCellID(points)
+           >>> print ids
+           [ 6  2  1 -1  0]
+
+        Compare with brute force
+
+           >>> points = numerix.array(points)
+           >>> for point, cellID in zip(points.swapaxes(0, 1), ids):
+           ...     inside = [numerix.allclose(m._getPointToFaceDistances(point, [c]).clip(min=0), 0.)
+           ...               for c in range(m.numberOfCells)]
+           ...     print cellID == (numerix.nonzero(inside)[0].tolist() + [-1])[0]
+           True
+           True
+           True
+           True
+           True
+
+           >>> from fipy.meshes.nonUniformGrid3D import NonUniformGrid3D
+           >>> m = NonUniformGrid3D(nx=3, ny=4, nz=5, dx=.1, dy=.2, dz=.3)
+           >>> ids = m._getContainingCellID(m.cellCenters.value + ((0.06,), (0.,), (0.,)))
+           >>> i = numerix.arange(m.numberOfCells)
+           >>> print numerix.allequal(ids, numerix.where(i % 3 < 2, i + 1, -1))
+           True
+
+        """
+        points = numerix.asarray(points, dtype=float)
+        if points.ndim == 1:
+            return self._getContainingCellID(points[..., numerix.newaxis])[0]
+
+        scale = self.scale['length']
+        if scale != 1:
+            points = points / float(scale)
+
+        M = points.shape[-1]
+        containing = -numerix.ones((M,), dtype=numerix.INT_DTYPE)
+        if self.numberOfCells == 0:
+            return containing
+
+        neighbors = MA.filled(self._cellToCellIDs, -1)
+        tolerance = 1e-10 * max(1., abs(self._faceCenters).max())
+
+        cellIDs = self._getCellCenterIndex(local=True).nearest(points * float(scale))
+        active = numerix.arange(M)
+
+        # a walk that has not arrived after visiting many cells is unlikely
+        # to; the remaining points are checked against every cell
+        for step in range(10 + 4 * self.dim * int(self.numberOfCells**(1. / self.dim))):
+            if len(active) == 0:
+                break
+
+            distances = self._getPointToFaceDistances(points[..., active], cellIDs)
+            furthest = distances.argmax(axis=0)
+            inside = distances[furthest, numerix.arange(len(active))] <= tolerance
+            containing[active[inside]] = cellIDs[inside]
+
+            cellIDs = neighbors[furthest, cellIDs]
+            walking = ~inside & (cellIDs >= 0)
+            active = active[walking]
+            cellIDs = cellIDs[walking]
+        else:
+            allCells = numerix.arange(self.numberOfCells)
+            for point in active:
+                distances = self._getPointToFaceDistances(points[..., [point] * self.numberOfCells], allCells)
+                inside = numerix.nonzero(distances.max(axis=0) <= tolerance)[0]
+                if len(inside) > 0:
+                    containing[point] = inside[0]
+
+        return containing
+
+    def _getPointToFaceDistances(self, points, cellIDs):
+        """Signed distances of `points` outside of each face of the
+        corresponding `cellIDs`, or `-inf` for missing faces.
         """
-        return numerix.nearest(data=self.cellCenters.globalValue, points=points)
+        points = numerix.asarray(points)
+        if points.ndim == 1:
+            points = numerix.repeat(points[..., numerix.newaxis], len(cellIDs), axis=-1)
+        faceIDs = numerix.take(MA.filled(self.cellFaceIDs, 0), cellIDs, axis=-1)
+        orientations = numerix.take(MA.filled(self._cellToFaceOrientations, 0), cellIDs, axis=-1)
+        outward = numerix.take(self.faceNormals, faceIDs, axis=-1) * orientations
+        offsets = points[:, numerix.newaxis, :] - numerix.take(self._faceCenters, faceIDs, axis=-1)
+        distances = (outward * offsets).sum(axis=0)
+
+        return numerix.where(orientations == 0, -numerix.inf, distances)
 
     def _test(self):
         """
@@ -54,6 +54,7 @@ class NonUniformGrid1D(Mesh1D):
          self.globalNumberOfFaces,
          self.overlap,
          self.offset,
+         self._globalShape,
          self.numberOfVertices,
          self.numberOfFaces,
          self.numberOfCells,
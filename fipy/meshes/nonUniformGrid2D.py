@@ -18,6 +18,7 @@ class NonUniformGrid2D(Mesh2D):
     first and then vertical faces.
     """
     def __init__(self, dx=1., dy=1., nx=None, ny=None, overlap=2, communicator=parallelComm,
+                 partition=None,
                  _RepresentationClass=_Grid2DRepresentation, _TopologyClass=_Grid2DTopology):
 
         builder = _NonuniformGrid2DBuilder()
@@ -27,10 +28,12 @@ class NonUniformGrid2D(Mesh2D):
             'dy': dy, 
             'nx': nx, 
             'ny': ny, 
-            'overlap': overlap
+            'overlap': overlap,
+            'partition': partition
         }
 
-        builder.buildGridData([dx, dy], [nx, ny], overlap, communicator)
+        builder.buildGridData([dx, dy], [nx, ny], overlap, communicator,
+                              partition=partition)
 
         ([self.dx, self.dy],
          [self.nx, self.ny],
@@ -40,6 +43,7 @@ class NonUniformGrid2D(Mesh2D):
          self.globalNumberOfFaces,
          self.overlap,
          self.offset,
+         self._globalShape,
          self.numberOfVertices,
          self.numberOfFaces,
          self.numberOfCells,
@@ -27,6 +27,7 @@ class NonUniformGrid3D(Mesh):
     Faces: XY faces numbered first, then XZ faces, then YZ faces. Within each subcategory, it is numbered in the usual way.
     """
     def __init__(self, dx = 1., dy = 1., dz = 1., nx = None, ny = None, nz = None, overlap=2, communicator=parallelComm,
+                 partition=None,
                  _RepresentationClass=_Grid3DRepresentation, _TopologyClass=_Grid3DTopology):
 
         builder = _NonuniformGrid3DBuilder()
@@ -39,10 +40,11 @@ class NonUniformGrid3D(Mesh):
             'ny': ny,
             'nz': nz,
             'overlap': overlap,
+            'partition': partition,
         }
 
         builder.buildGridData([dx, dy, dz], [nx, ny, nz], overlap,
-                              communicator)
+                              communicator, partition=partition)
 
         ([self.dx, self.dy, self.dz],
          [self.nx, self.ny, self.nz],
@@ -52,6 +54,7 @@ class NonUniformGrid3D(Mesh):
          self.globalNumberOfFaces,
          self.overlap,
          self.offset,
+         self._globalShape,
          self.numberOfVertices,
          self.numberOfFaces,
          self.numberOfCells,
@@ -18,6 +18,7 @@ def _suite():
         'fipy.meshes.periodicGrid1D',
         'fipy.meshes.periodicGrid2D',
         'fipy.meshes.periodicGrid3D',
+        'fipy.meshes.uniformGrid',
         'fipy.meshes.uniformGrid1D',
         'fipy.meshes.uniformGrid2D',
         'fipy.meshes.uniformGrid3D',
@@ -27,7 +28,10 @@ def _suite():
         'fipy.meshes.cylindricalNonUniformGrid2D',
         'fipy.meshes.factoryMeshes',
         'fipy.meshes.abstractMesh',
-        'fipy.meshes.representations.gridRepresentation'))
+        'fipy.meshes.builders.abstractGridBuilder',
+        'fipy.meshes.representations.gridRepresentation',
+        'fipy.meshes.topologies.connectivity',
+        'fipy.meshes.topologies.gridTopology'))
 
 if __name__ == '__main__':
     fipy.tests.testProgram.main(defaultTest='_suite')
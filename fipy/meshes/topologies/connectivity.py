@@ -0,0 +1,105 @@
+__docformat__ = 'restructuredtext'
+
+__all__ = []
+
+from fipy.tools import numerix
+from fipy.tools.numerix import MA
+
+class _Connectivity(object):
+    """Compact form of a padded `(M, N)` connectivity array, such as
+    `cellFaceIDs`, whose unused entries are masked.
+
+    The indices are stored as a plain `int32` array, with the padding
+    replaced by 0, together with a boolean array of the valid entries
+    and the number of valid entries of each column. Gathers through it
+    never touch a masked array.
+
+    >>> ids = MA.masked_values(((0, 1, 2),
+    ...                         (3, 4, -1),
+    ...                         (5, -1, -1)), -1)
+    >>> c = _Connectivity(ids)
+    >>> print c.ids
+    [[0 1 2]
+     [3 4 0]
+     [5 0 0]]
+    >>> print c.counts
+    [3 2 1]
+    >>> print c.isFull
+    False
+
+    The valid entries in compressed sparse column order
+
+    >>> print c.offsets
+    [0 3 5 6]
+    >>> print c.indices
+    [0 3 5 1 4 2]
+
+    Gather values, with padding filled
+
+    >>> values = numerix.arange(6) * 10.
+    >>> print c.take(values, fill=-1.)
+    [[  0.  10.  20.]
+     [ 30.  40.  -1.]
+     [ 50.  -1.  -1.]]
+
+    Sum over the valid entries of each column, optionally weighted
+
+    >>> print c.sum(values)
+    [ 80.  50.  20.]
+    >>> print c.sum(values, weights=((1, 1, 1), (-1, -1, 0), (1, 0, 0)))
+    [ 20. -30.  20.]
+
+    Leading element axes are preserved
+
+    >>> print c.sum(numerix.array((values, -values)))
+    [[ 80.  50.  20.]
+     [-80. -50. -20.]]
+
+    An unmasked array is full
+
+    >>> print _Connectivity(numerix.array(((0, 1), (1, 2)))).isFull
+    True
+    """
+
+    def __init__(self, ids):
+        self.valid = numerix.logical_not(MA.getmaskarray(ids))
+        self.ids = numerix.array(MA.filled(ids, 0), dtype=numerix.int32)
+        self.counts = numerix.array(self.valid.sum(axis=0), dtype=numerix.int32)
+        self.isFull = bool(self.valid.all())
+
+    @property
+    def offsets(self):
+        """Offsets of each column into `indices`."""
+        return numerix.concatenate(([0], numerix.cumsum(self.counts))).astype(numerix.int32)
+
+    @property
+    def indices(self):
+        """The valid entries, column after column."""
+        return self.ids.swapaxes(0, 1)[self.valid.swapaxes(0, 1)]
+
+    def take(self, values, fill=0):
+        """Gather the last axis of `values` at each entry, with `fill` for
+        the padding.
+        """
+        taken = numerix.take(values, self.ids, axis=-1)
+        if not self.isFull:
+            taken = numerix.where(self.valid, taken, fill)
+        return taken
+
+    def sum(self, values, weights=None):
+        """Sum the last axis of `values` over the valid entries of each
+        column, each multiplied by `weights` if given.
+        """
+        taken = numerix.take(values, self.ids, axis=-1)
+        if weights is not None:
+            taken = taken * numerix.where(self.valid, weights, 0)
+        elif not self.isFull:
+            taken = taken * self.valid
+        return numerix.sum(taken, axis=-2)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
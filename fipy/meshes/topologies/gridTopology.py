@@ -16,6 +16,25 @@ class _GridTopology(_AbstractTopology):
     def _isOrthogonal(self):
         return True
 
+    @staticmethod
+    def _blockCellIDs(lower, upper, offset, shape):
+        """Return the IDs of the cells from `lower` up to, but not
+        including, `upper` along each axis of a block of a grid, counted
+        from `offset` in a grid of `shape` and numbered along `x` first.
+
+        E.g., the 2 x 2 block of a 4 x 4 grid, offset by one cell along
+        `x` and two along `y`
+
+        >>> print _GridTopology._blockCellIDs((0, 0), (2, 2), (1, 2), (4, 4))
+        [ 9 10 13 14]
+        """
+        ranges = [numerix.arange(l, u) + o for l, u, o in zip(lower, upper, offset)]
+        strides = numerix.cumprod([1] + list(shape[:-1]))
+        IDs = 0
+        for index, stride in zip(numerix.ix_(*ranges[::-1]), strides[::-1]):
+            IDs = IDs + index * stride
+        return numerix.ravel(IDs)
+
 class _Grid1DTopology(_GridTopology):
 
     _concatenatedClass = Mesh1D
@@ -191,8 +210,8 @@ class _Grid2DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange((self.mesh.offset[1] + self.mesh.overlap['bottom']) * self.mesh.nx,
-                              (self.mesh.offset[1] + self.mesh.ny - self.mesh.overlap['top']) * self.mesh.nx)
+        return self._blockCellIDs(self._blockLower, self._blockUpper,
+                                  self.mesh.offset, self.mesh._globalShape)
 
     @property
     def _globalOverlappingCellIDs(self):
@@ -212,7 +231,8 @@ class _Grid2DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange(self.mesh.offset[1] * self.mesh.nx, (self.mesh.offset[1] + self.mesh.ny) * self.mesh.nx)
+        return self._blockCellIDs((0, 0), (self.mesh.nx, self.mesh.ny),
+                                  self.mesh.offset, self.mesh._globalShape)
 
     @property
     def _localNonOverlappingCellIDs(self):
@@ -232,8 +252,8 @@ class _Grid2DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange(self.mesh.overlap['bottom'] * self.mesh.nx,
-                              (self.mesh.ny - self.mesh.overlap['top']) * self.mesh.nx)
+        return self._blockCellIDs(self._blockLower, self._blockUpper,
+                                  (0, 0), (self.mesh.nx, self.mesh.ny))
 
     @property
     def _localOverlappingCellIDs(self):
@@ -255,6 +275,15 @@ class _Grid2DTopology(_GridTopology):
         """
         return numerix.arange(0, self.mesh.ny * self.mesh.nx)
 
+    @property
+    def _blockLower(self):
+        return (self.mesh.overlap['left'], self.mesh.overlap['bottom'])
+
+    @property
+    def _blockUpper(self):
+        return (self.mesh.nx - self.mesh.overlap['right'],
+                self.mesh.ny - self.mesh.overlap['top'])
+
     @property
     def _cellTopology(self):
         """return a map of the topology of each cell of grid"""
@@ -276,8 +305,8 @@ class _Grid3DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange((self.mesh.offset[2] + self.mesh.overlap['front']) * self.mesh.nx * self.mesh.ny,
-                              (self.mesh.offset[2] + self.mesh.nz - self.mesh.overlap['back']) * self.mesh.nx * self.mesh.ny)
+        return self._blockCellIDs(self._blockLower, self._blockUpper,
+                                  self.mesh.offset, self.mesh._globalShape)
 
     @property
     def _globalOverlappingCellIDs(self):
@@ -288,8 +317,8 @@ class _Grid3DTopology(_GridTopology):
         .. note:: Trivial except for parallel meshes
         """
 
-        return numerix.arange(self.mesh.offset[2] * self.mesh.nx * self.mesh.ny,
-                              (self.mesh.offset[2] + self.mesh.nz) * self.mesh.nx * self.mesh.ny)
+        return self._blockCellIDs((0, 0, 0), (self.mesh.nx, self.mesh.ny, self.mesh.nz),
+                                  self.mesh.offset, self.mesh._globalShape)
 
     @property
     def _localNonOverlappingCellIDs(self):
@@ -299,8 +328,8 @@ class _Grid3DTopology(_GridTopology):
 
         .. note:: Trivial except for parallel meshes
         """
-        return numerix.arange(self.mesh.overlap['front'] * self.mesh.nx * self.mesh.ny,
-                              (self.mesh.nz - self.mesh.overlap['back']) * self.mesh.nx * self.mesh.ny)
+        return self._blockCellIDs(self._blockLower, self._blockUpper,
+                                  (0, 0, 0), (self.mesh.nx, self.mesh.ny, self.mesh.nz))
 
     @property
     def _localOverlappingCellIDs(self):
@@ -312,6 +341,17 @@ class _Grid3DTopology(_GridTopology):
         """
         return numerix.arange(0, self.mesh.ny * self.mesh.nx * self.mesh.nz)
 
+    @property
+    def _blockLower(self):
+        return (self.mesh.overlap['left'], self.mesh.overlap['bottom'],
+                self.mesh.overlap['front'])
+
+    @property
+    def _blockUpper(self):
+        return (self.mesh.nx - self.mesh.overlap['right'],
+                self.mesh.ny - self.mesh.overlap['top'],
+                self.mesh.nz - self.mesh.overlap['back'])
+
     @property
     def _cellTopology(self):
         """return a map of the topology of each cell of grid"""
@@ -325,3 +365,10 @@ class _PeriodicGrid1DTopology(_Grid1DTopology):
     @property
     def _globalOverlappingCellIDs(self):
         return super(_PeriodicGrid1DTopology, self)._globalOverlappingCellIDs % self.mesh.args['nx']
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
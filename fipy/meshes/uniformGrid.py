@@ -1,6 +1,7 @@
 __docformat__ = 'restructuredtext'
 
 from fipy.meshes.abstractMesh import AbstractMesh
+from fipy.tools import numerix
 
 __all__ = ["UniformGrid"]
 
@@ -48,3 +49,46 @@ class UniformGrid(AbstractMesh):
 
     _faceToCellDistances = property(_getFaceToCellDistances,
                                     _setFaceToCellDistances)
+
+    def _getContainingCellID(self, points):
+        """Return the ID of the local cell that contains each of the
+        `points`, or -1 for points outside of the mesh.
+
+           >>> from fipy import Grid2D, Grid3D
+           >>> m = Grid2D(nx=3, ny=2)
+           >>> print m._getContainingCellID(((0., .9, 2.5, 3.5), (0., 1.5, 1.5, 0.5)))
+           [ 0  3  5 -1]
+           >>> m = Grid3D(nx=3, ny=4, nz=5, dx=.1, dy=.2, dz=.3)
+           >>> ids = m._getContainingCellID(m.cellCenters.value + ((0.06,), (0.,), (0.,)))
+           >>> i = numerix.arange(m.numberOfCells)
+           >>> print numerix.allequal(ids, numerix.where(i % 3 < 2, i + 1, -1))
+           True
+        """
+        points = numerix.asarray(points, dtype=float)
+        if points.ndim == 1:
+            return self._getContainingCellID(points[..., numerix.newaxis])[0]
+
+        if self.numberOfCells == 0:
+            return -numerix.ones(points.shape[-1:], dtype=numerix.INT_DTYPE)
+
+        ds = numerix.array([getattr(self, "d" + axis) for axis in "xyz"[:self.dim]], dtype=float)
+        lower = self._cellCenters[..., 0] - ds / 2
+        shape = numerix.array(self.shape)[..., numerix.newaxis]
+
+        indices = numerix.floor((points - lower[..., numerix.newaxis]) / ds[..., numerix.newaxis]).astype(numerix.INT_DTYPE)
+        # the far faces belong to the last cells
+        onFarFaces = (indices == shape) & numerix.isclose(points, (lower + shape[..., 0] * ds)[..., numerix.newaxis])
+        indices[onFarFaces] -= 1
+        inside = ((indices >= 0) & (indices < shape)).all(axis=0)
+
+        containing = -numerix.ones(points.shape[-1:], dtype=numerix.INT_DTYPE)
+        containing[inside] = numerix.ravel_multi_index(indices[..., inside], tuple(self.shape), order='F')
+
+        return containing
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -60,6 +60,7 @@ class UniformGrid1D(UniformGrid):
          self.globalNumberOfFaces,
          self.overlap,
          self.offset,
+         self._globalShape,
          self.numberOfVertices,
          self.numberOfFaces,
          self.numberOfCells,
@@ -133,7 +134,7 @@ class UniformGrid1D(UniformGrid):
 
     @property
     def _faceAreas(self):
-        return numerix.ones(self.numberOfFaces,'d')
+        return numerix.ones(self.numberOfFaces, numerix.FLOAT_DTYPE)
 
     @property
     def _faceCenters(self):
@@ -141,7 +142,7 @@ class UniformGrid1D(UniformGrid):
 
     @property
     def faceNormals(self):
-        faceNormals = numerix.ones((1, self.numberOfFaces), 'd')
+        faceNormals = numerix.ones((1, self.numberOfFaces), numerix.FLOAT_DTYPE)
         # The left-most face has neighboring cells None and the left-most cell.
         # We must reverse the normal to make fluxes work correctly.
         if self.numberOfFaces > 0:
@@ -154,7 +155,7 @@ class UniformGrid1D(UniformGrid):
 
     @property
     def _cellVolumes(self):
-        return numerix.ones(self.numberOfCells, 'd') * self.dx
+        return numerix.ones(self.numberOfCells, numerix.FLOAT_DTYPE) * self.dx
 
     @property
     def _cellCenters(self):
@@ -164,7 +165,7 @@ class UniformGrid1D(UniformGrid):
 
     @property
     def _cellDistances(self):
-        distances = numerix.ones(self.numberOfFaces, 'd')
+        distances = numerix.ones(self.numberOfFaces, numerix.FLOAT_DTYPE)
         distances *= self.dx
         if len(distances) > 0:
             distances[0] = self.dx / 2.
@@ -173,15 +174,15 @@ class UniformGrid1D(UniformGrid):
 
     @property
     def _faceTangents1(self):
-        return numerix.zeros(self.numberOfFaces, 'd')[numerix.NewAxis, ...]
+        return numerix.zeros(self.numberOfFaces, numerix.FLOAT_DTYPE)[numerix.NewAxis, ...]
 
     @property
     def _faceTangents2(self):
-        return numerix.zeros(self.numberOfFaces, 'd')[numerix.NewAxis, ...]
+        return numerix.zeros(self.numberOfFaces, numerix.FLOAT_DTYPE)[numerix.NewAxis, ...]
 
     @property
     def _cellToCellDistances(self):
-        distances = MA.zeros((2, self.numberOfCells), 'd')
+        distances = MA.zeros((2, self.numberOfCells), numerix.FLOAT_DTYPE)
         distances[:] = self.dx
         if self.numberOfCells > 0:
             distances[0,0] = self.dx / 2.
@@ -190,14 +191,14 @@ class UniformGrid1D(UniformGrid):
 
     @property
     def _cellNormals(self):
-        normals = numerix.ones((1, 2, self.numberOfCells), 'd')
+        normals = numerix.ones((1, 2, self.numberOfCells), numerix.FLOAT_DTYPE)
         if self.numberOfCells > 0:
             normals[:,0] = -1
         return normals
 
     @property
     def _cellAreas(self):
-        return numerix.ones((2, self.numberOfCells), 'd')
+        return numerix.ones((2, self.numberOfCells), numerix.FLOAT_DTYPE)
 
     @property
     def _cellAreaProjections(self):
@@ -205,7 +206,7 @@ class UniformGrid1D(UniformGrid):
 
     @property
     def _cellVolumes(self):
-        return numerix.ones(self.numberOfCells, 'd') * self.dx
+        return numerix.ones(self.numberOfCells, numerix.FLOAT_DTYPE) * self.dx
 
     """
     Scaled geometry set and calc
@@ -218,7 +219,7 @@ class UniformGrid1D(UniformGrid):
         distance from center of face to center of first cell divided by distance
         between cell centers
         """
-        distances = numerix.ones(self.numberOfFaces, 'd')
+        distances = numerix.ones(self.numberOfFaces, numerix.FLOAT_DTYPE)
         distances *= 0.5
         if len(distances) > 0:
             distances[0] = 1
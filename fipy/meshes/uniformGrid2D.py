@@ -22,7 +22,7 @@ class UniformGrid2D(UniformGrid):
     first and then vertical faces.
     """
     def __init__(self, dx=1., dy=1., nx=1, ny=1, origin=((0,),(0,)),
-                       overlap=2, communicator=parallelComm,
+                       overlap=2, communicator=parallelComm, partition=None,
                        _RepresentationClass=_Grid2DRepresentation,
                        _TopologyClass=_Grid2DTopology):
 
@@ -39,11 +39,18 @@ class UniformGrid2D(UniformGrid):
             'nx': nx,
             'ny': ny,
             'origin': origin,
-            'overlap': overlap
+            'overlap': overlap,
+            'partition': partition
+        }
+
+        self._scale = {
+            'length': 1.,
+            'area': 1.,
+            'volume': 1.
         }
 
         builder.buildGridData([dx, dy], [nx, ny], overlap, communicator,
-                              origin)
+                              origin, partition=partition)
 
         ([self.dx, self.dy],
          [self.nx, self.ny],
@@ -53,6 +60,7 @@ class UniformGrid2D(UniformGrid):
          self.globalNumberOfFaces,
          self.overlap,
          self.offset,
+         self._globalShape,
          self.numberOfVertices,
          self.numberOfFaces,
          self.numberOfCells,
@@ -222,7 +230,7 @@ class UniformGrid2D(UniformGrid):
     if inline.doInline:
         @property
         def _areaProjections(self):
-            areaProjections = numerix.zeros((2, self.numberOfFaces), 'd')
+            areaProjections = numerix.zeros((2, self.numberOfFaces), numerix.FLOAT_DTYPE)
 
             inline._runInline("""
                               if (i < nx) {
@@ -257,14 +265,14 @@ class UniformGrid2D(UniformGrid):
 
     @property
     def _faceAreas(self):
-        faceAreas = numerix.zeros(self.numberOfFaces, 'd')
+        faceAreas = numerix.zeros(self.numberOfFaces, numerix.FLOAT_DTYPE)
         faceAreas[:self.numberOfHorizontalFaces] = self.dx
         faceAreas[self.numberOfHorizontalFaces:] = self.dy
         return faceAreas
 
     @property
     def faceNormals(self):
-        normals = numerix.zeros((2, self.numberOfFaces), 'd')
+        normals = numerix.zeros((2, self.numberOfFaces), numerix.FLOAT_DTYPE)
 
         normals[1, :self.numberOfHorizontalFaces] = 1
         normals[1, :self.nx] = -1
@@ -277,11 +285,11 @@ class UniformGrid2D(UniformGrid):
 
     @property
     def _cellVolumes(self):
-        return numerix.ones(self.numberOfCells, 'd') * self.dx * self.dy
+        return numerix.ones(self.numberOfCells, numerix.FLOAT_DTYPE) * self.dx * self.dy
 
     @property
     def _cellCenters(self):
-        centers = numerix.zeros((2, self.nx, self.ny), 'd')
+        centers = numerix.zeros((2, self.nx, self.ny), numerix.FLOAT_DTYPE)
         indices = numerix.indices((self.nx, self.ny))
         centers[0] = (indices[0] + 0.5) * self.dx
         centers[1] = (indices[1] + 0.5) * self.dy
@@ -313,7 +321,7 @@ class UniformGrid2D(UniformGrid):
         distance from center of face to center of first cell divided by distance
         between cell centers
         """
-        faceToCellDistanceRatios = numerix.zeros(self.numberOfFaces, 'd')
+        faceToCellDistanceRatios = numerix.zeros(self.numberOfFaces, numerix.FLOAT_DTYPE)
         faceToCellDistanceRatios[:] = 0.5
         faceToCellDistanceRatios[:self.nx] = 1.
         faceToCellDistanceRatios[self.numberOfHorizontalFaces - self.nx:self.numberOfHorizontalFaces] = 1.
@@ -327,7 +335,7 @@ class UniformGrid2D(UniformGrid):
             """faces have been connected."""
             return self._internalFaceToCellDistances
         else:
-            faceToCellDistances = numerix.zeros((2, self.numberOfFaces), 'd')
+            faceToCellDistances = numerix.zeros((2, self.numberOfFaces), numerix.FLOAT_DTYPE)
             distances = self._cellDistances
             ratios = self._faceToCellDistanceRatio
             faceToCellDistances[0] = distances * ratios
@@ -343,7 +351,7 @@ class UniformGrid2D(UniformGrid):
 
     @property
     def _faceTangents1(self):
-        tangents = numerix.zeros((2,self.numberOfFaces), 'd')
+        tangents = numerix.zeros((2,self.numberOfFaces), numerix.FLOAT_DTYPE)
 
         if self.numberOfFaces > 0:
             tangents[0, :self.numberOfHorizontalFaces] = -1
@@ -355,11 +363,11 @@ class UniformGrid2D(UniformGrid):
 
     @property
     def _faceTangents2(self):
-        return numerix.zeros((2, self.numberOfFaces), 'd')
+        return numerix.zeros((2, self.numberOfFaces), numerix.FLOAT_DTYPE)
 
     @property
     def _cellToCellDistances(self):
-        distances = numerix.zeros((4, self.nx, self.ny), 'd')
+        distances = numerix.zeros((4, self.nx, self.ny), numerix.FLOAT_DTYPE)
         distances[0] = self.dy
         distances[1] = self.dx
         distances[2] = self.dy
@@ -377,7 +385,7 @@ class UniformGrid2D(UniformGrid):
 
     @property
     def _cellNormals(self):
-        normals = numerix.zeros((2, 4, self.numberOfCells), 'd')
+        normals = numerix.zeros((2, 4, self.numberOfCells), numerix.FLOAT_DTYPE)
         normals[:, 0] = [[ 0], [-1]]
         normals[:, 1] = [[ 1], [ 0]]
         normals[:, 2] = [[ 0], [ 1]]
@@ -387,7 +395,7 @@ class UniformGrid2D(UniformGrid):
 
     @property
     def _cellAreas(self):
-        areas = numerix.ones((4, self.numberOfCells), 'd')
+        areas = numerix.ones((4, self.numberOfCells), numerix.FLOAT_DTYPE)
         areas[0] = self.dx
         areas[1] = self.dy
         areas[2] = self.dx
@@ -400,12 +408,12 @@ class UniformGrid2D(UniformGrid):
 
     @property
     def _faceCenters(self):
-        Hcen = numerix.zeros((2, self.nx, self.numberOfHorizontalRows), 'd')
+        Hcen = numerix.zeros((2, self.nx, self.numberOfHorizontalRows), numerix.FLOAT_DTYPE)
         indices = numerix.indices((self.nx, self.numberOfHorizontalRows))
         Hcen[0,...] = (indices[0] + 0.5) * self.dx
         Hcen[1,...] = indices[1] * self.dy
 
-        Vcen = numerix.zeros((2, self.numberOfVerticalColumns, self.ny), 'd')
+        Vcen = numerix.zeros((2, self.numberOfVerticalColumns, self.ny), numerix.FLOAT_DTYPE)
         indices = numerix.indices((self.numberOfVerticalColumns, self.ny))
         Vcen[0,...] = indices[0] * self.dx
         Vcen[1,...] = (indices[1] + 0.5) * self.dy
@@ -418,7 +426,8 @@ class UniformGrid2D(UniformGrid):
     def _translate(self, vector):
         return self.__class__(dx = self.args['dx'], nx = self.args['nx'],
                               dy = self.args['dy'], ny = self.args['ny'],
-                             origin = numerix.array(self.args['origin']) + vector, overlap=self.args['overlap'])
+                             origin = numerix.array(self.args['origin']) + vector, overlap=self.args['overlap'],
+                              partition=self.args['partition'])
 
     def __mul__(self, factor):
         if numerix.shape(factor) is ():
@@ -426,7 +435,8 @@ class UniformGrid2D(UniformGrid):
 
         return UniformGrid2D(dx=self.args['dx'] * numerix.array(factor[0]), nx=self.args['nx'],
                              dy=self.args['dy'] * numerix.array(factor[1]), ny=self.args['ny'],
-                             origin=numerix.array(self.args['origin']) * factor, overlap=self.args['overlap'])
+                             origin=numerix.array(self.args['origin']) * factor, overlap=self.args['overlap'],
+                             partition=self.args['partition'])
 
     @property
     def _concatenableMesh(self):
@@ -435,6 +445,7 @@ class UniformGrid2D(UniformGrid):
         origin = args['origin']
         from fipy.tools import serialComm
         args['communicator'] = serialComm
+        args['partition'] = None
         del args['origin']
         return NonUniformGrid2D(**args) + origin
 
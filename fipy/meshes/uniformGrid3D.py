@@ -30,6 +30,7 @@ class UniformGrid3D(UniformGrid):
     """
     def __init__(self, dx = 1., dy = 1., dz = 1., nx = 1, ny = 1, nz = 1,
                  origin = [[0], [0], [0]], overlap=2, communicator=parallelComm,
+                 partition=None,
                  _RepresentationClass=_Grid3DRepresentation,
                  _TopologyClass=_Grid3DTopology):
 
@@ -47,11 +48,18 @@ class UniformGrid3D(UniformGrid):
             'ny': ny,
             'nz': nz,
             'origin': origin,
-            'overlap': overlap
+            'overlap': overlap,
+            'partition': partition
+        }
+
+        self._scale = {
+            'length': 1.,
+            'area': 1.,
+            'volume': 1.
         }
 
         builder.buildGridData([dx, dy, dz], [nx, ny, nz], overlap,
-                              communicator, origin)
+                              communicator, origin, partition=partition)
 
         ([self.dx, self.dy, self.dz],
          [self.nx, self.ny, self.nz],
@@ -61,6 +69,7 @@ class UniformGrid3D(UniformGrid):
          self.globalNumberOfFaces,
          self.overlap,
          self.offset,
+         self._globalShape,
          self.numberOfVertices,
          self.numberOfFaces,
          self.numberOfCells,
@@ -193,11 +202,11 @@ class UniformGrid3D(UniformGrid):
 
     @property
     def _cellVolumes(self):
-        return numerix.ones(self.numberOfCells, 'd') * self.dx * self.dy * self.dz
+        return numerix.ones(self.numberOfCells, numerix.FLOAT_DTYPE) * self.dx * self.dy * self.dz
 
     @property
     def _cellCenters(self):
-        centers = numerix.zeros((3, self.nx, self.ny, self.nz), 'd')
+        centers = numerix.zeros((3, self.nx, self.ny, self.nz), numerix.FLOAT_DTYPE)
         indices = numerix.indices((self.nx, self.ny, self.nz))
         centers[0] = (indices[0] + 0.5) * self.dx
         centers[1] = (indices[1] + 0.5) * self.dy
@@ -207,17 +216,17 @@ class UniformGrid3D(UniformGrid):
 
     @property
     def _cellDistances(self):
-        XYdis = numerix.zeros((self.nz + 1, self.ny, self.nx),'d')
+        XYdis = numerix.zeros((self.nz + 1, self.ny, self.nx), numerix.FLOAT_DTYPE)
         XYdis[:] = self.dz
         XYdis[ 0,...] = self.dz / 2.
         XYdis[-1,...] = self.dz / 2.
 
-        XZdis = numerix.zeros((self.nz, self.ny + 1, self.nx),'d')
+        XZdis = numerix.zeros((self.nz, self.ny + 1, self.nx), numerix.FLOAT_DTYPE)
         XZdis[:] = self.dy
         XZdis[:, 0, :] = self.dy / 2.
         XZdis[:,-1, :] = self.dy / 2.
 
-        YZdis = numerix.zeros((self.nz, self.ny, self.nx + 1),'d')
+        YZdis = numerix.zeros((self.nz, self.ny, self.nx + 1), numerix.FLOAT_DTYPE)
         YZdis[:] = self.dx
         YZdis[..., 0] = self.dx / 2.
         YZdis[...,-1] = self.dx / 2.
@@ -233,17 +242,17 @@ class UniformGrid3D(UniformGrid):
         distance from center of face to center of first cell divided by distance
         between cell centers
         """
-        XYdis = numerix.zeros((self.nx, self.ny, self.nz + 1),'d')
+        XYdis = numerix.zeros((self.nx, self.ny, self.nz + 1), numerix.FLOAT_DTYPE)
         XYdis[:] = 0.5
         XYdis[..., 0] = 1
         XYdis[...,-1] = 1
 
-        XZdis = numerix.zeros((self.nx, self.ny + 1, self.nz),'d')
+        XZdis = numerix.zeros((self.nx, self.ny + 1, self.nz), numerix.FLOAT_DTYPE)
         XZdis[:] = 0.5
         XZdis[:, 0, :] = 1
         XZdis[:,-1, :] = 1
 
-        YZdis = numerix.zeros((self.nx + 1, self.ny, self.nz),'d')
+        YZdis = numerix.zeros((self.nx + 1, self.ny, self.nz), numerix.FLOAT_DTYPE)
         YZdis[:] = 0.5
         YZdis[ 0,...] = 1
         YZdis[-1,...] = 1
@@ -288,7 +297,7 @@ class UniformGrid3D(UniformGrid):
 
     @property
     def _cellToCellDistances(self):
-        distances = numerix.zeros((6, self.nx, self.ny, self.nz), 'd')
+        distances = numerix.zeros((6, self.nx, self.ny, self.nz), numerix.FLOAT_DTYPE)
         distances[0] = self.dx
         distances[1] = self.dx
         distances[2] = self.dy
@@ -307,7 +316,7 @@ class UniformGrid3D(UniformGrid):
 
     @property
     def _cellNormals(self):
-        normals = numerix.zeros((3, 6, self.numberOfCells), 'd')
+        normals = numerix.zeros((3, 6, self.numberOfCells), numerix.FLOAT_DTYPE)
         normals[:, 0, :] = [[-1], [ 0], [ 0]]
         normals[:, 1, :] = [[ 1], [ 0], [ 0]]
         normals[:, 2, :] = [[ 0], [-1], [ 0]]
@@ -319,7 +328,7 @@ class UniformGrid3D(UniformGrid):
 
     @property
     def _cellAreas(self):
-        areas = numerix.ones((6, self.numberOfCells), 'd')
+        areas = numerix.ones((6, self.numberOfCells), numerix.FLOAT_DTYPE)
         areas[0] = self.dy * self.dz
         areas[1] = self.dy * self.dz
         areas[2] = self.dx * self.dz
@@ -337,19 +346,19 @@ class UniformGrid3D(UniformGrid):
     @property
     def _faceCenters(self):
 
-        XYcen = numerix.zeros((3, self.nx, self.ny, self.nz + 1), 'd')
+        XYcen = numerix.zeros((3, self.nx, self.ny, self.nz + 1), numerix.FLOAT_DTYPE)
         indices = numerix.indices((self.nx, self.ny, self.nz + 1))
         XYcen[0] = (indices[0] + 0.5) * self.dx
         XYcen[1] = (indices[1] + 0.5) * self.dy
         XYcen[2] = indices[2] * self.dz
 
-        XZcen = numerix.zeros((3, self.nx, self.ny + 1, self.nz), 'd')
+        XZcen = numerix.zeros((3, self.nx, self.ny + 1, self.nz), numerix.FLOAT_DTYPE)
         indices = numerix.indices((self.nx, self.ny + 1, self.nz))
         XZcen[0] = (indices[0] + 0.5) * self.dx
         XZcen[1] = indices[1] * self.dy
         XZcen[2] = (indices[2] + 0.5) * self.dz
 
-        YZcen = numerix.zeros((3, self.nx + 1, self.ny, self.nz), 'd')
+        YZcen = numerix.zeros((3, self.nx + 1, self.ny, self.nz), numerix.FLOAT_DTYPE)
         indices = numerix.indices((self.nx + 1, self.ny, self.nz))
         YZcen[0] = indices[0] * self.dx
         YZcen[1] = (indices[1] + 0.5) * self.dy
@@ -375,7 +384,8 @@ class UniformGrid3D(UniformGrid):
         return self.__class__(dx = self.args['dx'], nx = self.args['nx'],
                               dy = self.args['dy'], ny = self.args['ny'],
                               dz = self.args['dz'], nz = self.args['nz'],
-                             origin = numerix.array(self.args['origin']) + vector, overlap=self.args['overlap'])
+                             origin = numerix.array(self.args['origin']) + vector, overlap=self.args['overlap'],
+                              partition=self.args['partition'])
 
     def __mul__(self, factor):
         return UniformGrid3D(dx = self.dx * factor, nx = self.nx,
@@ -390,6 +400,7 @@ class UniformGrid3D(UniformGrid):
         origin = args['origin']
         from fipy.tools import serialComm
         args['communicator'] = serialComm
+        args['partition'] = None
         del args['origin']
         return NonUniformGrid3D(**args) + origin
 
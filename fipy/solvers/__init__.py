@@ -129,6 +129,18 @@ elif solver is None:
 else:
     raise ImportError, 'Unknown solver package %s' % solver
 
+try:
+    # the multigrid, spectral and banded solvers assemble SciPy
+    # matrices, whatever the suite
+    from fipy.solvers.multigrid import *
+    __all__.extend(multigrid.__all__)
+    from fipy.solvers.spectral import *
+    __all__.extend(spectral.__all__)
+    from fipy.solvers.banded import *
+    __all__.extend(banded.__all__)
+except ImportError:
+    pass
+
 
 from fipy.tests.doctestPlus import register_skipper
 
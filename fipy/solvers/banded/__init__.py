@@ -0,0 +1,6 @@
+from fipy.solvers.banded.linearBandedSolver import *
+from fipy.solvers.banded.linearADISolver import *
+
+__all__ = []
+__all__.extend(linearBandedSolver.__all__)
+__all__.extend(linearADISolver.__all__)
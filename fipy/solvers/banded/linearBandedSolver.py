@@ -0,0 +1,147 @@
+__docformat__ = 'restructuredtext'
+
+import os
+
+from scipy.linalg import solve_banded
+
+from fipy.solvers.scipy.scipySolver import _ScipySolver
+from fipy.solvers.scipy.linearLUSolver import LinearLUSolver
+from fipy.tools import numerix
+
+__all__ = ["LinearBandedSolver"]
+
+def _bandwidths(A):
+    """The numbers of lower and upper diagonals of the `coo_matrix` `A`
+
+        >>> import scipy.sparse as sp
+        >>> A = sp.coo_matrix([[4., 1., 0., 0.],
+        ...                    [2., 5., 1., 0.],
+        ...                    [7., 2., 6., 1.],
+        ...                    [0., 0., 2., 7.]])
+        >>> print _bandwidths(A)
+        (2, 1)
+    """
+    offsets = A.col - A.row
+    if len(offsets) > 0:
+        return (int(max(-offsets.min(), 0)), int(max(offsets.max(), 0)))
+    else:
+        return (0, 0)
+
+def _bandedStorage(A, bandwidths):
+    """The diagonals of the `coo_matrix` `A`, with `bandwidths` lower and
+    upper diagonals, in the LAPACK banded storage of
+    `scipy.linalg.solve_banded`.
+
+        >>> import scipy.sparse as sp
+        >>> A = sp.coo_matrix([[4., 1., 0., 0.],
+        ...                    [2., 5., 1., 0.],
+        ...                    [7., 2., 6., 1.],
+        ...                    [0., 0., 2., 7.]])
+        >>> print _bandedStorage(A, (2, 1))
+        [[ 0.  1.  1.  1.]
+         [ 4.  5.  6.  7.]
+         [ 2.  2.  2.  0.]
+         [ 7.  0.  0.  0.]]
+    """
+    lower, upper = bandwidths
+    ab = numerix.zeros((lower + upper + 1, A.shape[1]), dtype=A.dtype)
+    ab[upper - (A.col - A.row), A.col] = A.data
+    return ab
+
+class LinearBandedSolver(_ScipySolver):
+    """
+    The `LinearBandedSolver` solves a linear system of equations by
+    Gaussian elimination with partial pivoting of its band, with the
+    LAPACK routine wrapped by `scipy.linalg.solve_banded`.
+
+    The cells of a `Grid1D` or `NonUniformGrid1D` couple only to their
+    neighbors, so the band of a second order equation is tridiagonal,
+    and of a fourth order one, pentadiagonal. It is factorized and
+    solved in a time proportional to the number of cells, without the
+    ordering and bookkeeping of a general sparse factorization.
+
+        >>> from fipy import Grid1D, CellVariable, TransientTerm, DiffusionTerm
+        >>> mesh = Grid1D(nx=100)
+        >>> var = CellVariable(mesh=mesh)
+        >>> var.constrain(0., where=mesh.facesLeft)
+        >>> var.constrain(1., where=mesh.facesRight)
+        >>> solver = LinearBandedSolver()
+        >>> DiffusionTerm().solve(var, solver=solver)
+        >>> print numerix.allclose(var, mesh.cellCenters[0] / 100.)
+        True
+        >>> print solver.bandwidths
+        (1, 1)
+
+    A fourth order term widens the band
+
+        >>> from fipy.solvers.scipy import LinearLUSolver
+        >>> def solve(solver):
+        ...     var = CellVariable(mesh=mesh, value=numerix.sin(mesh.x / 10.))
+        ...     eq = TransientTerm() == DiffusionTerm(coeff=(1., -1.))
+        ...     eq.solve(var, dt=1., solver=solver)
+        ...     return var
+        >>> print numerix.allclose(solve(solver), solve(LinearLUSolver()))
+        True
+        >>> print solver.bandwidths
+        (2, 2)
+
+    The band of the matrix of a 2D or 3D grid is as wide as the number of
+    cells in a row or a plane, and that of a periodic grid as wide as the
+    whole grid, because of the couplings across its ends. Rather than
+    store such a band, a matrix with more than `maxBandwidth` diagonals on
+    either side of its main diagonal is solved with the `LinearLUSolver`
+    instead
+
+        >>> from fipy import Grid2D, PeriodicGrid1D
+        >>> for mesh in (Grid2D(nx=20, ny=20), PeriodicGrid1D(nx=100)):
+        ...     var = CellVariable(mesh=mesh, value=numerix.sin(mesh.x / 10.))
+        ...     eq = TransientTerm() == DiffusionTerm()
+        ...     eq.solve(var, dt=1., solver=solver)
+        ...     print solver.bandwidths, solver.fallbacks
+        (20, 20) 1
+        (99, 99) 2
+    """
+
+    def __init__(self, tolerance=1e-10, iterations=1000, precon=None, maxBandwidth=8):
+        """
+        :Parameters:
+          - `tolerance`: not used but maintains a common interface.
+          - `iterations`: not used but maintains a common interface.
+          - `precon`: not used but maintains a common interface.
+          - `maxBandwidth`: The most diagonals on either side of the main
+            diagonal of a matrix that is stored as a band.
+
+        """
+        super(LinearBandedSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon)
+
+        self.maxBandwidth = maxBandwidth
+        self.bandwidths = None
+        self.fallbacks = 0
+
+    def _solve_(self, L, x, b):
+        A = L.matrix.tocoo()
+        A.sum_duplicates()
+        self.bandwidths = _bandwidths(A)
+
+        if max(self.bandwidths) > self.maxBandwidth:
+            self.fallbacks += 1
+            fallback = LinearLUSolver(tolerance=self.tolerance, iterations=self.iterations)
+            return fallback._solve_(L, x, b)
+
+        ab = _bandedStorage(A, self.bandwidths)
+        x = solve_banded(self.bandwidths, ab, numerix.asarray(b, dtype=ab.dtype),
+                         overwrite_ab=True, check_finite=False)
+
+        if 'FIPY_VERBOSE_SOLVER' in os.environ:
+            from fipy.tools.debug import PRINT
+            PRINT('bandwidths:', self.bandwidths)
+            PRINT('residual:', numerix.L2norm(b - L.matrix * x))
+
+        return x
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
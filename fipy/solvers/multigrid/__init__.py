@@ -0,0 +1,6 @@
+from fipy.solvers.multigrid.geometricMultigridSolver import *
+from fipy.solvers.multigrid.geometricMultigridPreconditioner import *
+
+__all__ = []
+__all__.extend(geometricMultigridSolver.__all__)
+__all__.extend(geometricMultigridPreconditioner.__all__)
@@ -0,0 +1,79 @@
+__docformat__ = 'restructuredtext'
+
+from scipy.sparse.linalg import LinearOperator
+
+from fipy.solvers.scipy.preconditioners.preconditioner import Preconditioner
+from fipy.solvers.multigrid.gridHierarchy import _GridHierarchy, _gridShape
+from fipy.tools import numerix
+
+__all__ = ["GeometricMultigridPreconditioner"]
+
+class GeometricMultigridPreconditioner(Preconditioner):
+    """
+    Geometric multigrid preconditioner for the SciPy Krylov solvers,
+    applying one V-cycle over successively coarsened grids of `mesh`,
+    which must be a `Grid1D`, `Grid2D` or `Grid3D`.
+
+    The V-cycle is symmetric, so it may precondition `LinearPCGSolver`
+    for a symmetric matrix.
+
+        >>> from fipy import Grid2D, CellVariable, DiffusionTerm
+        >>> from fipy.solvers.scipy import LinearPCGSolver
+        >>> mesh = Grid2D(nx=40, ny=40)
+        >>> var = CellVariable(mesh=mesh)
+        >>> var.constrain(0., where=mesh.facesLeft)
+        >>> var.constrain(1., where=mesh.facesRight)
+        >>> precon = GeometricMultigridPreconditioner(mesh)
+        >>> solver = LinearPCGSolver(tolerance=1e-10, precon=precon)
+        >>> DiffusionTerm().solve(var, solver=solver)
+        >>> print numerix.allclose(var, mesh.cellCenters[0] / 40., atol=1e-8)
+        True
+    """
+
+    def __init__(self, mesh, smoother="redBlack", omega=None, sweeps=1,
+                 coarsestSize=64, reuse=False, degradation=2.):
+        """
+        Create a `GeometricMultigridPreconditioner` object.
+
+        :Parameters:
+          - `mesh`: The grid of the equations to be solved.
+          - `smoother`: "redBlack" for red-black Gauss-Seidel or
+            "jacobi" for weighted Jacobi.
+          - `omega`: The relaxation factor of the smoother, by default 1
+            for "redBlack" and 2/3 for "jacobi".
+          - `sweeps`: The number of smoothing sweeps before and after
+            each coarse grid correction.
+          - `coarsestSize`: The largest number of rows of the matrix
+            solved directly on the coarsest grid.
+          - `reuse`: If `True`, keep the grid hierarchy between solves.
+          - `degradation`: The factor by which the number of iterations
+            may grow before a reused hierarchy is rebuilt.
+        """
+        Preconditioner.__init__(self, reuse=reuse, degradation=degradation)
+
+        self.mesh = mesh
+        self.smoother = smoother
+        self.omega = omega
+        self.sweeps = sweeps
+        self.coarsestSize = coarsestSize
+
+    def _build(self, A):
+        hierarchy = _GridHierarchy(A, _gridShape(self.mesh),
+                                   blocks=A.shape[0] // self.mesh.numberOfCells,
+                                   smoother=self.smoother,
+                                   omega=self.omega,
+                                   sweeps=self.sweeps,
+                                   coarsestSize=self.coarsestSize)
+
+        def cycle(r):
+            r = numerix.ravel(r)
+            return hierarchy.cycle(r, numerix.zeros(r.shape, dtype=A.dtype))
+
+        return LinearOperator(A.shape, matvec=cycle, dtype=A.dtype)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -0,0 +1,126 @@
+__docformat__ = 'restructuredtext'
+
+import os
+
+from fipy.solvers.scipy.scipySolver import _ScipySolver
+from fipy.solvers.multigrid.gridHierarchy import _GridHierarchy, _gridShape
+from fipy.tools import numerix
+
+__all__ = ["GeometricMultigridSolver"]
+
+class GeometricMultigridSolver(_ScipySolver):
+    """
+    The `GeometricMultigridSolver` solves a linear system of equations
+    on a `Grid1D`, `Grid2D` or `Grid3D`, uniform or not, by V-cycles
+    over successively coarsened grids. The cost of each cycle, and the
+    number of cycles needed for Poisson and diffusion problems, grow no
+    faster than the number of cells.
+
+    The solver relies only on NumPy and SciPy and assembles SciPy
+    matrices, whichever solver suite is selected.
+
+        >>> from fipy import Grid2D, CellVariable, DiffusionTerm
+        >>> mesh = Grid2D(nx=40, ny=30)
+        >>> var = CellVariable(mesh=mesh)
+        >>> var.constrain(0., where=mesh.facesLeft)
+        >>> var.constrain(1., where=mesh.facesRight)
+        >>> solver = GeometricMultigridSolver(tolerance=1e-10)
+        >>> DiffusionTerm().solve(var, solver=solver)
+        >>> print numerix.allclose(var, mesh.cellCenters[0] / 40., atol=1e-8)
+        True
+        >>> print solver.cycles < 20
+        True
+
+    Transient problems are solved in the same way, with either smoother
+
+        >>> from fipy import Grid3D, TransientTerm
+        >>> mesh = Grid3D(nx=12, ny=10, nz=8)
+        >>> def transient(solver):
+        ...     var = CellVariable(mesh=mesh)
+        ...     var.constrain(1., where=mesh.facesBottom)
+        ...     eq = TransientTerm() == DiffusionTerm()
+        ...     for step in range(3):
+        ...         eq.solve(var, dt=1., solver=solver)
+        ...     return var
+        >>> from fipy.solvers.scipy import LinearLUSolver
+        >>> print numerix.allclose(transient(GeometricMultigridSolver(smoother="jacobi")),
+        ...                        transient(LinearLUSolver()), atol=1e-8)
+        True
+
+    Meshes that are not grids are rejected
+
+        >>> from fipy import Tri2D
+        >>> mesh = Tri2D(nx=2, ny=2)
+        >>> DiffusionTerm().solve(CellVariable(mesh=mesh), solver=GeometricMultigridSolver())
+        Traceback (most recent call last):
+            ...
+        TypeError: geometric multigrid requires a Grid1D, Grid2D or Grid3D mesh
+    """
+
+    def __init__(self, tolerance=1e-10, iterations=100, precon=None,
+                 smoother="redBlack", omega=None, sweeps=2, coarsestSize=64):
+        """
+        :Parameters:
+          - `tolerance`: The required error tolerance.
+          - `iterations`: The maximum number of V-cycles to perform.
+          - `precon`: not used but maintains a common interface.
+          - `smoother`: "redBlack" for red-black Gauss-Seidel or
+            "jacobi" for weighted Jacobi.
+          - `omega`: The relaxation factor of the smoother, by default 1
+            for "redBlack" and 2/3 for "jacobi".
+          - `sweeps`: The number of smoothing sweeps before and after
+            each coarse grid correction.
+          - `coarsestSize`: The largest number of rows of the matrix
+            solved directly on the coarsest grid.
+
+        """
+        super(GeometricMultigridSolver, self).__init__(tolerance=tolerance,
+                                                       iterations=iterations,
+                                                       precon=precon)
+        self.smoother = smoother
+        self.omega = omega
+        self.sweeps = sweeps
+        self.coarsestSize = coarsestSize
+
+        self.cycles = 0
+
+    def _solve_(self, L, x, b):
+        A = L.matrix
+        hierarchy = _GridHierarchy(A, _gridShape(L.mesh),
+                                   blocks=A.shape[0] // L.mesh.numberOfCells,
+                                   smoother=self.smoother,
+                                   omega=self.omega,
+                                   sweeps=self.sweeps,
+                                   coarsestSize=self.coarsestSize)
+
+        b = numerix.asarray(b)
+        bnorm = numerix.L2norm(b)
+        if bnorm == 0:
+            bnorm = 1.
+
+        x = numerix.array(x, dtype=A.dtype)
+        relres = numerix.L2norm(b - A * x) / bnorm
+        iteration = 0
+        while relres > self.tolerance and iteration < self.iterations:
+            x = hierarchy.cycle(b, x)
+            relres = numerix.L2norm(b - A * x) / bnorm
+            iteration += 1
+
+        self.cycles += iteration
+
+        if relres > self.tolerance:
+            self._raiseWarning(-1, iteration, relres)
+
+        if 'FIPY_VERBOSE_SOLVER' in os.environ:
+            from fipy.tools.debug import PRINT
+            PRINT('cycles: %d / %d' % (iteration, self.iterations))
+            PRINT('residual:', relres)
+
+        return x
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
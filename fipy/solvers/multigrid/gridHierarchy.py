@@ -0,0 +1,208 @@
+__docformat__ = 'restructuredtext'
+
+__all__ = []
+
+import scipy.sparse as sp
+from scipy.sparse.linalg import splu
+
+from fipy.tools import numerix
+
+def _gridShape(mesh):
+    """The numbers of cells along the axes of a structured grid, with
+    the cells numbered along `x` first.
+
+        >>> from fipy import Grid1D, Grid2D, Grid3D, Tri2D
+        >>> print _gridShape(Grid1D(nx=4))
+        (4,)
+        >>> print _gridShape(Grid2D(nx=4, ny=3))
+        (4, 3)
+        >>> print _gridShape(Grid3D(dx=(1., 2.), ny=3, nz=2))
+        (2, 3, 2)
+        >>> _gridShape(Tri2D(nx=2, ny=2))
+        Traceback (most recent call last):
+            ...
+        TypeError: geometric multigrid requires a Grid1D, Grid2D or Grid3D mesh
+    """
+    shape = getattr(mesh, "shape", None)
+    if (shape is None
+        or len(shape) != mesh.dim
+        or numerix.prod(shape) != mesh.numberOfCells):
+        raise TypeError("geometric multigrid requires a Grid1D, Grid2D or Grid3D mesh")
+    return tuple(int(n) for n in shape)
+
+def _prolongation1D(n):
+    """Linear interpolation from the `(n + 1) // 2` cells of a coarsened
+    axis to its `n` cells.
+
+    Each pair of cells is coarsened into one. Each fine cell takes 3/4
+    of its parent and 1/4 of the coarse cell on its other side, or all
+    of its parent at the ends of the axis.
+
+        >>> print _prolongation1D(5).toarray()
+        [[ 1.    0.    0.  ]
+         [ 0.75  0.25  0.  ]
+         [ 0.25  0.75  0.  ]
+         [ 0.    0.75  0.25]
+         [ 0.    0.    1.  ]]
+        >>> print _prolongation1D(1).toarray()
+        [[ 1.]]
+    """
+    nc = (n + 1) // 2
+    fine = numerix.arange(n)
+    parent = fine // 2
+    neighbor = parent + numerix.where(fine % 2 == 0, -1, 1)
+    valid = ((neighbor >= 0) & (neighbor < nc)
+             & ~((n % 2 == 1) & (fine == n - 1)))
+    neighbor = numerix.where(valid, neighbor, parent)
+    weights = numerix.where(valid, 0.75, 1.)
+
+    P = sp.coo_matrix((numerix.concatenate((weights, 1. - weights)),
+                       (numerix.concatenate((fine, fine)),
+                        numerix.concatenate((parent, neighbor)))),
+                      shape=(n, nc)).tocsr()
+    P.eliminate_zeros()
+    return P
+
+def _prolongation(shape, blocks=1):
+    """Interpolation from the coarsened `shape` to `shape`, for each of
+    `blocks` variables numbered one after the other.
+
+        >>> P = _prolongation((4, 3))
+        >>> print P.shape
+        (12, 4)
+        >>> print numerix.allclose(P.sum(axis=1), 1.)
+        True
+        >>> print _prolongation((4, 3), blocks=2).shape
+        (24, 8)
+    """
+    P = sp.identity(blocks, format="csr")
+    # the cells are numbered along x first, so x is the innermost factor
+    for n in shape[::-1]:
+        P = sp.kron(P, _prolongation1D(n), format="csr")
+    return P
+
+def _redCells(shape, blocks=1):
+    """Whether each cell is "red" in a checkerboard coloring of `shape`.
+
+        >>> print _redCells((3, 2)).astype(int)
+        [1 0 1 0 1 0]
+    """
+    indices = numerix.indices(shape)
+    red = numerix.ravel(indices.sum(axis=0) % 2 == 0, order="F")
+    return numerix.tile(red, blocks)
+
+class _GridLevel(object):
+    def __init__(self, A, shape, blocks):
+        self.A = A.tocsr()
+        self.shape = shape
+        diagonal = self.A.diagonal()
+        self.diagonal = numerix.where(diagonal == 0, 1, diagonal)
+        self.red = _redCells(shape, blocks)
+        self.black = ~self.red
+        self.P = None
+        self.R = None
+        self.LU = None
+
+class _GridHierarchy(object):
+    """Levels of successively coarsened grids for the `spmatrix` `A`,
+    which is the matrix of `blocks` variables on a grid of `shape`.
+
+    Each level halves the number of cells along every axis that has
+    more than one cell. The operator of each coarse level is the
+    Galerkin product `R A P` of the operator of the level above with
+    the prolongation `P` by linear interpolation and the restriction
+    `R`, its transpose. The coarsest level, with no more than
+    `coarsestSize` rows, is solved by LU-factorization.
+
+    The `smoother` is "redBlack" Gauss-Seidel or weighted "jacobi",
+    applied `sweeps` times before and after the correction from the
+    coarser level, and relaxed by `omega` (by default 1 for
+    "redBlack" and 2/3 for "jacobi"). The red cells are updated first
+    on the way down and last on the way up, so the cycle is symmetric
+    for a symmetric `A`.
+
+        >>> from fipy.tools import numerix
+        >>> shape = (40, 30)
+        >>> T = [sp.diags((-numerix.ones(n - 1), 2 * numerix.ones(n), -numerix.ones(n - 1)),
+        ...               (-1, 0, 1)).tolil() for n in shape]
+        >>> for t in T:
+        ...     t[0, 0] = t[-1, -1] = 3.
+        >>> A = (sp.kron(sp.identity(shape[1]), T[0])
+        ...      + sp.kron(T[1], sp.identity(shape[0]))).tocsr()
+        >>> hierarchy = _GridHierarchy(A, shape)
+        >>> print [level.shape for level in hierarchy.levels]
+        [(40, 30), (20, 15), (10, 8), (5, 4)]
+
+    A few cycles reduce the residual by orders of magnitude
+
+        >>> b = numerix.ones(A.shape[0])
+        >>> x = numerix.zeros(A.shape[0])
+        >>> for cycle in range(8):
+        ...     x = hierarchy.cycle(b, x)
+        >>> print numerix.L2norm(b - A * x) / numerix.L2norm(b) < 1e-5
+        True
+        >>> hierarchy = _GridHierarchy(A, shape, smoother="jacobi")
+        >>> x = numerix.zeros(A.shape[0])
+        >>> for cycle in range(8):
+        ...     x = hierarchy.cycle(b, x)
+        >>> print numerix.L2norm(b - A * x) / numerix.L2norm(b) < 1e-2
+        True
+    """
+
+    def __init__(self, A, shape, blocks=1, smoother="redBlack", omega=None,
+                 sweeps=2, coarsestSize=64):
+        if smoother not in ("redBlack", "jacobi"):
+            raise ValueError("unknown smoother '%s'" % smoother)
+        if omega is None:
+            omega = {"redBlack": 1., "jacobi": 2. / 3}[smoother]
+
+        self.smoother = smoother
+        self.omega = omega
+        self.sweeps = sweeps
+
+        self.levels = [_GridLevel(A, shape, blocks)]
+        level = self.levels[0]
+        while (level.A.shape[0] > coarsestSize
+               and max(level.shape) > 1):
+            level.P = _prolongation(level.shape, blocks)
+            level.R = level.P.T.tocsr()
+            coarse = _GridLevel(level.R * level.A * level.P,
+                                tuple((n + 1) // 2 for n in level.shape),
+                                blocks)
+            self.levels.append(coarse)
+            level = coarse
+
+        level.LU = splu(level.A.tocsc())
+
+    def _smooth(self, level, b, x, reverse=False):
+        for sweep in range(self.sweeps):
+            if self.smoother == "jacobi":
+                x = x + self.omega * (b - level.A * x) / level.diagonal
+            else:
+                colors = (level.red, level.black)
+                if reverse:
+                    colors = colors[::-1]
+                for color in colors:
+                    residual = b - level.A * x
+                    x[color] += self.omega * residual[color] / level.diagonal[color]
+        return x
+
+    def cycle(self, b, x, index=0):
+        """Improve the solution `x` of `A x = b` by one V-cycle"""
+        level = self.levels[index]
+        if level.LU is not None:
+            return level.LU.solve(b)
+
+        x = self._smooth(level, b, numerix.array(x, dtype=level.A.dtype))
+        residual = level.R * (b - level.A * x)
+        x = x + level.P * self.cycle(residual,
+                                     numerix.zeros(residual.shape, dtype=x.dtype),
+                                     index + 1)
+        return self._smooth(level, b, x, reverse=True)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
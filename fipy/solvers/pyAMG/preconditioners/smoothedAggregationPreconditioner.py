@@ -1,10 +1,113 @@
+__docformat__ = 'restructuredtext'
+
+import copy
+import hashlib
+
 from pyamg import smoothed_aggregation_solver
+from pyamg.relaxation.smoothing import change_smoothers
+
+from fipy.solvers.scipy.preconditioners.preconditioner import Preconditioner
+from fipy.tools import numerix
 
 __all__ = ["SmoothedAggregationPreconditioner"]
 
-class SmoothedAggregationPreconditioner():
-    def __init__(self):
-        pass
+class SmoothedAggregationPreconditioner(Preconditioner):
+    """
+    Smoothed aggregation algebraic multigrid preconditioner from pyAMG.
+
+    Setting up the multigrid hierarchy (aggregation, smoothing of the
+    prolongators and the coarse grid solver) usually costs more than the
+    V-cycles it saves. With `reuse=True`, the hierarchy is kept between
+    solves:
+
+    - if the matrix is unchanged, the hierarchy is used as it is;
+    - if only its values have changed, the aggregates and prolongators
+      are kept and only the Galerkin products of the coarse grid
+      matrices are recomputed, along with the smoothers;
+    - once the number of iterations exceeds `degradation` times the
+      number taken just after the hierarchy was built, it is rebuilt
+      from scratch.
+
+        >>> from fipy import Grid2D, CellVariable, TransientTerm, DiffusionTerm
+        >>> from fipy.solvers.pyAMG import LinearPCGSolver
+        >>> mesh = Grid2D(nx=20, ny=20)
+        >>> def solve(precon):
+        ...     var = CellVariable(mesh=mesh)
+        ...     var.constrain(0., where=mesh.facesLeft)
+        ...     var.constrain(1., where=mesh.facesRight)
+        ...     eq = TransientTerm() == DiffusionTerm()
+        ...     solver = LinearPCGSolver(tolerance=1e-10, precon=precon)
+        ...     for dt in (1., 1., 2.):
+        ...         eq.solve(var, dt=dt, solver=solver)
+        ...     return var
+        >>> precon = SmoothedAggregationPreconditioner(reuse=True)
+        >>> var = solve(precon)
+        >>> print precon.builds, precon.reuses, precon.updates
+        1 2 1
+        >>> print numerix.allclose(var, solve(SmoothedAggregationPreconditioner()))
+        True
+    """
+
+    _smoother = ('gauss_seidel', {'sweep': 'symmetric'})
+
+    def __init__(self, reuse=False, degradation=2.):
+        """
+        :Parameters:
+          - `reuse`: If `True`, keep the multigrid hierarchy between solves.
+          - `degradation`: The factor by which the number of iterations
+            may grow before a reused hierarchy is rebuilt.
+        """
+        Preconditioner.__init__(self, reuse=reuse, degradation=degradation)
+        self._hierarchy = None
+        self._fingerprint = None
+        self.updates = 0
+
+    @staticmethod
+    def _hash(A):
+        h = hashlib.sha1()
+        for arr in (A.indptr, A.indices, A.data):
+            h.update(numerix.ascontiguousarray(arr).data)
+        return h.hexdigest()
+
+    def _build(self, A):
+        A = A.tocsr()
+        self._hierarchy = smoothed_aggregation_solver(A,
+                                                      presmoother=self._smoother,
+                                                      postsmoother=self._smoother)
+        self._fingerprint = self._hash(A)
+        return self._hierarchy.aspreconditioner(cycle='V')
+
+    def _refresh(self, A):
+        A = A.tocsr()
+        fingerprint = self._hash(A)
+        if fingerprint == self._fingerprint:
+            return self._operator
+
+        self.updates += 1
+
+        levels = []
+        for level in self._hierarchy.levels:
+            level = copy.copy(level)
+            # smoothers are set up for the old matrices
+            for smoother in ("presmoother", "postsmoother"):
+                level.__dict__.pop(smoother, None)
+            levels.append(level)
+
+        levels[0].A = A
+        for fine, coarse in zip(levels[:-1], levels[1:]):
+            coarse.A = (fine.R * fine.A * fine.P).tocsr()
+
+        self._hierarchy = self._hierarchy.__class__(levels)
+        change_smoothers(self._hierarchy,
+                         presmoother=self._smoother,
+                         postsmoother=self._smoother)
+        self._fingerprint = fingerprint
+
+        return self._hierarchy.aspreconditioner(cycle='V')
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
 
-    def _applyToMatrix(self, A):
-        return smoothed_aggregation_solver(A).aspreconditioner(cycle='V')
+if __name__ == "__main__":
+    _test()
@@ -56,6 +56,9 @@ class PysparseSolver(_PysparseMatrixSolver):
             raise Exception("Pysparse solvers cannot be used with multiple processors")
 
         array = self.var.numericValue.ravel()
+        if not array.flags.writeable:
+            # the cached value of a constrained `Variable`
+            array = array.copy()
 
         from fipy.terms import SolutionVariableNumberError
 
@@ -41,6 +41,9 @@ class _PysparseMatrixSolver(Solver):
                             % self.__class__)
 
         array = self.var.numericValue
+        if not array.flags.writeable:
+            # the cached value of a constrained `Variable`
+            array = array.copy()
         newArr = self._solve_(self.matrix, array, self.RHSvector)
 
         if newArr is not None:
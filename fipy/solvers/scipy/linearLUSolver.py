@@ -1,6 +1,7 @@
 __docformat__ = 'restructuredtext'
 
 import os
+import hashlib
 
 from scipy.sparse.linalg import splu
 
@@ -14,8 +15,150 @@ class LinearLUSolver(_ScipySolver):
     The `LinearLUSolver` solves a linear system of equations using
     LU-factorization.  The `LinearLUSolver` is a wrapper class for the
     the Scipy `scipy.sparse.linalg.splu` moduleq.
+
+    By default, the matrix is factorized afresh on every solve. With
+    `reuseFactorization=True`, the factorization is kept between solves:
+
+    - if the matrix is identical to the one last factorized (same
+      structure and values, as judged by a fingerprint of its CSC
+      arrays), only the back-substitutions are performed;
+    - if only the values have changed, the matrix is refactorized with
+      the column permutation found by the first factorization, skipping
+      the ordering step.
+
+    For a linear problem with a constant time step, this reduces every
+    step after the first to a back-substitution.
+
+        >>> from fipy import Grid1D, CellVariable, TransientTerm, DiffusionTerm
+        >>> mesh = Grid1D(nx=10)
+        >>> var = CellVariable(mesh=mesh, value=mesh.cellCenters[0])
+        >>> var.constrain(0., where=mesh.facesLeft)
+        >>> var.constrain(1., where=mesh.facesRight)
+        >>> eq = TransientTerm() == DiffusionTerm()
+        >>> solver = LinearLUSolver(reuseFactorization=True)
+        >>> for step in range(3):
+        ...     eq.solve(var, dt=1., solver=solver)
+        >>> print solver.factorizations, solver.refactorizations, solver.reuses
+        1 0 2
+
+    The matrix changes when the time step does, but its structure does not
+
+        >>> eq.solve(var, dt=2., solver=solver)
+        >>> print solver.factorizations, solver.refactorizations, solver.reuses
+        1 1 2
+
+    The fingerprint check can be skipped when the caller knows that the
+    matrix has not changed
+
+        >>> solver.matrixUnchanged()
+        >>> eq.solve(var, dt=2., solver=solver)
+        >>> print solver.factorizations, solver.refactorizations, solver.reuses
+        1 1 3
+
+    The solution is the same as with fresh factorizations
+
+        >>> var2 = CellVariable(mesh=mesh, value=mesh.cellCenters[0])
+        >>> var2.constrain(0., where=mesh.facesLeft)
+        >>> var2.constrain(1., where=mesh.facesRight)
+        >>> for dt in (1., 1., 1., 2., 2.):
+        ...     eq.solve(var2, dt=dt, solver=LinearLUSolver())
+        >>> print numerix.allclose(var, var2)
+        True
     """
 
+    def __init__(self, tolerance=1e-10, iterations=1000, precon=None, reuseFactorization=False):
+        """
+        :Parameters:
+          - `tolerance`: The required error tolerance.
+          - `iterations`: The maximum number of iterative steps to perform.
+          - `precon`: not used but maintains a common interface.
+          - `reuseFactorization`: If `True`, keep the LU factorization
+            and the column permutation between solves.
+
+        """
+        super(LinearLUSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon)
+
+        self.reuseFactorization = reuseFactorization
+        self._unchanged = False
+        self._LU = None
+        self._structure = None
+        self._fingerprint = None
+        self._permc = None
+        self._columnOrder = None
+
+        self.factorizations = 0
+        self.refactorizations = 0
+        self.reuses = 0
+
+    def matrixUnchanged(self):
+        """Declare that the matrix of the next solve is the one last
+        factorized, so that its factorization is reused without
+        comparing fingerprints. Only has an effect if
+        `reuseFactorization` is `True`.
+        """
+        self._unchanged = True
+
+    @staticmethod
+    def _hash(*arrays):
+        h = hashlib.sha1()
+        for arr in arrays:
+            h.update(numerix.ascontiguousarray(arr).data)
+        return h.hexdigest()
+
+    def _factorize(self, A):
+        if not self.reuseFactorization:
+            self.factorizations += 1
+            self._LU = splu(A, diag_pivot_thresh=1.,
+                               relax=1,
+                               panel_size=10,
+                               permc_spec=3)
+            self._permc = None
+            return
+
+        unchanged = self._unchanged and self._LU is not None
+        self._unchanged = False
+
+        if unchanged:
+            self.reuses += 1
+            return
+
+        structure = self._hash(A.indptr, A.indices) + repr(A.shape)
+        fingerprint = self._hash(A.data)
+
+        if structure == self._structure and self._LU is not None:
+            if fingerprint == self._fingerprint:
+                self.reuses += 1
+            else:
+                self.refactorizations += 1
+                # factorize the matrix with its columns already in the
+                # order found by the first factorization
+                self._permc = self._columnOrder
+                self._LU = splu(A[:, self._permc].tocsc(),
+                                diag_pivot_thresh=1.,
+                                relax=1,
+                                panel_size=10,
+                                permc_spec="NATURAL")
+        else:
+            self.factorizations += 1
+            self._LU = splu(A, diag_pivot_thresh=1.,
+                               relax=1,
+                               panel_size=10,
+                               permc_spec=3)
+            self._permc = None
+            self._columnOrder = numerix.argsort(self._LU.perm_c)
+
+        self._structure = structure
+        self._fingerprint = fingerprint
+
+    def _LUsolve(self, b):
+        y = self._LU.solve(b)
+        if self._permc is None:
+            return y
+        else:
+            x = numerix.empty_like(y)
+            x[self._permc] = y
+            return x
+
     def _solve_(self, L, x, b):
         diag = L.takeDiagonal()
         maxdiag = max(numerix.absolute(diag))
@@ -23,10 +166,7 @@ class LinearLUSolver(_ScipySolver):
         L = L * (1 / maxdiag)
         b = b * (1 / maxdiag)
 
-        LU = splu(L.matrix.asformat("csc"), diag_pivot_thresh=1.,
-                                            relax=1,
-                                            panel_size=10,
-                                            permc_spec=3)
+        self._factorize(L.matrix.asformat("csc"))
 
         error0 = numerix.sqrt(numerix.sum((L * x - b)**2))
 
@@ -36,7 +176,7 @@ class LinearLUSolver(_ScipySolver):
             if (numerix.sqrt(numerix.sum(errorVector**2)) / error0)  <= self.tolerance:
                 break
 
-            xError = LU.solve(errorVector)
+            xError = self._LUsolve(errorVector)
             x[:] = x - xError
 
         if 'FIPY_VERBOSE_SOLVER' in os.environ:
@@ -44,4 +184,14 @@ class LinearLUSolver(_ScipySolver):
             PRINT('iterations: %d / %d' % (iteration+1, self.iterations))
             PRINT('residual:', numerix.sqrt(numerix.sum(errorVector**2)))
 
+        if not self.reuseFactorization:
+            self._LU = None
+
         return x
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -12,15 +12,20 @@ class LinearPCGSolver(_ScipyKrylovSolver):
     with no preconditioning by default.
     """
 
-    def __init__(self, tolerance=1e-15, iterations=2000, precon=None):
+    def __init__(self, tolerance=1e-15, iterations=2000, precon=None, precision=None, refinements=0):
         """
         :Parameters:
           - `tolerance`: The required error tolerance.
           - `iterations`: The maximum number of iterative steps to perform.
           - `precon`: Preconditioner to use.
+          - `precision`: The floating point type of the iterations, if
+            not that of the matrix.
+          - `refinements`: The maximum number of corrections of the
+            solution against the double precision residual.
         """
 
-        super(LinearPCGSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon)
+        super(LinearPCGSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon,
+                                              precision=precision, refinements=refinements)
         self.solveFnc = cg
 
     def _canSolveAsymmetric(self):
@@ -0,0 +1,51 @@
+__docformat__ = 'restructuredtext'
+
+from scipy.sparse.linalg import LinearOperator, spilu
+
+from fipy.solvers.scipy.preconditioners.preconditioner import Preconditioner
+
+__all__ = ["ILUPreconditioner"]
+
+class ILUPreconditioner(Preconditioner):
+    """
+    Incomplete LU preconditioner for the SciPy Krylov solvers.
+    Really just a wrapper for `scipy.sparse.linalg.spilu`.
+
+        >>> from fipy import Grid2D, CellVariable, DiffusionTerm
+        >>> from fipy.solvers.scipy import LinearGMRESSolver
+        >>> from fipy.tools import numerix
+        >>> mesh = Grid2D(nx=10, ny=10)
+        >>> var = CellVariable(mesh=mesh)
+        >>> var.constrain(0., where=mesh.facesLeft)
+        >>> var.constrain(1., where=mesh.facesRight)
+        >>> solver = LinearGMRESSolver(tolerance=1e-10, precon=ILUPreconditioner())
+        >>> DiffusionTerm().solve(var, solver=solver)
+        >>> print numerix.allclose(var, mesh.cellCenters[0] / 10., atol=1e-6)
+        True
+    """
+
+    def __init__(self, dropTolerance=None, fillFactor=None, reuse=False, degradation=2.):
+        """
+        :Parameters:
+          - `dropTolerance`: Entries of the factors smaller than this,
+            relative to their row, are dropped. Default: 1e-4.
+          - `fillFactor`: The maximum ratio of the number of nonzeros in
+            the factors to that in the matrix. Default: 10.
+          - `reuse`: If `True`, keep the factorization between solves.
+          - `degradation`: The factor by which the number of iterations
+            may grow before a reused factorization is rebuilt.
+        """
+        Preconditioner.__init__(self, reuse=reuse, degradation=degradation)
+        self.dropTolerance = dropTolerance
+        self.fillFactor = fillFactor
+
+    def _build(self, A):
+        ilu = spilu(A.tocsc(), drop_tol=self.dropTolerance, fill_factor=self.fillFactor)
+        return LinearOperator(A.shape, matvec=ilu.solve, dtype=A.dtype)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
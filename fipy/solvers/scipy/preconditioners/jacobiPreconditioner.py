@@ -0,0 +1,37 @@
+__docformat__ = 'restructuredtext'
+
+import scipy.sparse as sp
+
+from fipy.solvers.scipy.preconditioners.preconditioner import Preconditioner
+from fipy.tools import numerix
+
+__all__ = ["JacobiPreconditioner"]
+
+class JacobiPreconditioner(Preconditioner):
+    """
+    Jacobi preconditioner for the SciPy Krylov solvers, dividing by the
+    diagonal of the matrix.
+
+        >>> from fipy import Grid2D, CellVariable, DiffusionTerm
+        >>> from fipy.solvers.scipy import LinearPCGSolver
+        >>> mesh = Grid2D(nx=10, ny=10)
+        >>> var = CellVariable(mesh=mesh)
+        >>> var.constrain(0., where=mesh.facesLeft)
+        >>> var.constrain(1., where=mesh.facesRight)
+        >>> solver = LinearPCGSolver(tolerance=1e-10, precon=JacobiPreconditioner())
+        >>> DiffusionTerm().solve(var, solver=solver)
+        >>> print numerix.allclose(var, mesh.cellCenters[0] / 10., atol=1e-6)
+        True
+    """
+
+    def _build(self, A):
+        diagonal = A.diagonal()
+        diagonal = numerix.where(diagonal == 0, 1, diagonal)
+        return sp.spdiags(1. / diagonal, 0, A.shape[0], A.shape[1]).tocsr()
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -0,0 +1,111 @@
+__docformat__ = 'restructuredtext'
+
+__all__ = ["Preconditioner"]
+
+class Preconditioner:
+    """
+    The base Preconditioner class for the SciPy Krylov solvers.
+
+    Building a preconditioner, particularly an incomplete factorization,
+    can cost as much as the iterations it saves. With `reuse=True`, the
+    preconditioner built for one matrix is kept for the solves that
+    follow, over sweeps and time steps, as long as the matrix keeps its
+    shape and the number of iterations does not exceed `degradation`
+    times the number taken just after it was built.
+
+        >>> from fipy import Grid1D, CellVariable, TransientTerm, DiffusionTerm
+        >>> from fipy.solvers.scipy import LinearPCGSolver
+        >>> from fipy.solvers.scipy.preconditioners import JacobiPreconditioner
+        >>> mesh = Grid1D(nx=50)
+        >>> var = CellVariable(mesh=mesh)
+        >>> var.constrain(0., where=mesh.facesLeft)
+        >>> var.constrain(1., where=mesh.facesRight)
+        >>> eq = TransientTerm() == DiffusionTerm()
+        >>> precon = JacobiPreconditioner(reuse=True)
+        >>> solver = LinearPCGSolver(tolerance=1e-10, precon=precon)
+        >>> for step in range(3):
+        ...     eq.solve(var, dt=1., solver=solver)
+        >>> print precon.builds, precon.reuses
+        1 2
+
+    Once the iterations degrade, the preconditioner is rebuilt for the
+    next solve
+
+        >>> precon._recordIterations(10 * precon._baseline)
+        >>> eq.solve(var, dt=1., solver=solver)
+        >>> print precon.builds, precon.reuses
+        2 2
+
+    .. attention:: This class is abstract. Always create one of its subclasses.
+    """
+
+    def __init__(self, reuse=False, degradation=2.):
+        """
+        Create a `Preconditioner` object.
+
+        :Parameters:
+          - `reuse`: If `True`, keep the preconditioner between solves.
+          - `degradation`: The factor by which the number of iterations
+            may grow before a reused preconditioner is rebuilt.
+        """
+        if self.__class__ is Preconditioner:
+            raise NotImplementedError, "can't instantiate abstract base class"
+
+        self.reuse = reuse
+        self.degradation = degradation
+
+        self._operator = None
+        self._shape = None
+        self._baseline = None
+        self._degraded = False
+
+        self.builds = 0
+        self.reuses = 0
+
+    def _build(self, A):
+        """
+        Returns the preconditioner for the SciPy `spmatrix` `A`, as a
+        matrix or a `LinearOperator`.
+        """
+        raise NotImplementedError
+
+    def _refresh(self, A):
+        """
+        Returns the reused preconditioner, adapted to the SciPy
+        `spmatrix` `A` if that is cheaper than building it afresh.
+        """
+        return self._operator
+
+    def _applyToMatrix(self, A):
+        if (self.reuse
+            and self._operator is not None
+            and not self._degraded
+            and self._shape == A.shape
+            and self._operator.dtype == A.dtype):
+            self.reuses += 1
+            self._operator = self._refresh(A)
+        else:
+            self.builds += 1
+            self._operator = self._build(A)
+            self._shape = A.shape
+            self._baseline = None
+            self._degraded = False
+
+        return self._operator
+
+    def _recordIterations(self, iterations):
+        """
+        Note the number of iterations of a solve with the preconditioner
+        last returned by `_applyToMatrix`.
+        """
+        if self._baseline is None:
+            self._baseline = max(iterations, 1)
+        elif iterations > self.degradation * self._baseline:
+            self._degraded = True
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
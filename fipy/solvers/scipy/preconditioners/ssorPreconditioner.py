@@ -0,0 +1,75 @@
+__docformat__ = 'restructuredtext'
+
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator, splu
+
+from fipy.solvers.scipy.preconditioners.preconditioner import Preconditioner
+from fipy.tools import numerix
+
+__all__ = ["SsorPreconditioner"]
+
+class SsorPreconditioner(Preconditioner):
+    r"""
+    Symmetric successive over-relaxation preconditioner for the SciPy
+    Krylov solvers,
+
+    .. math::
+
+       M = \frac{\omega}{2 - \omega}
+           \left(\frac{D}{\omega} + L\right)
+           \left(\frac{D}{\omega}\right)^{-1}
+           \left(\frac{D}{\omega} + U\right)
+
+    where :math:`D`, :math:`L` and :math:`U` are the diagonal, strictly
+    lower and strictly upper parts of the matrix. The two triangular
+    factors are prepared for compiled solves when the preconditioner is
+    built.
+
+        >>> from fipy import Grid2D, CellVariable, DiffusionTerm
+        >>> from fipy.solvers.scipy import LinearPCGSolver
+        >>> mesh = Grid2D(nx=10, ny=10)
+        >>> var = CellVariable(mesh=mesh)
+        >>> var.constrain(0., where=mesh.facesLeft)
+        >>> var.constrain(1., where=mesh.facesRight)
+        >>> solver = LinearPCGSolver(tolerance=1e-10, precon=SsorPreconditioner(omega=1.2))
+        >>> DiffusionTerm().solve(var, solver=solver)
+        >>> print numerix.allclose(var, mesh.cellCenters[0] / 10., atol=1e-6)
+        True
+    """
+
+    def __init__(self, omega=1., reuse=False, degradation=2.):
+        """
+        :Parameters:
+          - `omega`: The relaxation factor, between 0 and 2.
+          - `reuse`: If `True`, keep the preconditioner between solves.
+          - `degradation`: The factor by which the number of iterations
+            may grow before a reused preconditioner is rebuilt.
+        """
+        Preconditioner.__init__(self, reuse=reuse, degradation=degradation)
+        self.omega = omega
+
+    def _build(self, A):
+        A = A.tocsr()
+        N = A.shape[0]
+        diagonal = A.diagonal()
+        diagonal = numerix.where(diagonal == 0, 1, diagonal) / self.omega
+        D = sp.spdiags(diagonal, 0, N, N)
+
+        # triangular matrices are factorized without pivoting or fill
+        lower = splu((sp.tril(A, k=-1) + D).tocsc(),
+                     permc_spec="NATURAL", diag_pivot_thresh=0.)
+        upper = splu((sp.triu(A, k=1) + D).tocsc(),
+                     permc_spec="NATURAL", diag_pivot_thresh=0.)
+        scale = (2. - self.omega) / self.omega
+
+        def matvec(x):
+            return scale * upper.solve(diagonal * lower.solve(numerix.ravel(x)))
+
+        return LinearOperator(A.shape, matvec=matvec, dtype=A.dtype)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -5,28 +5,116 @@ __all__ = []
 import os
 
 from fipy.solvers.scipy.scipySolver import _ScipySolver
+from fipy.solvers.scipy.preconditioners.preconditioner import Preconditioner
+from fipy.tools import numerix
 
 class _ScipyKrylovSolver(_ScipySolver):
     """
     The base `ScipyKrylovSolver` class.
 
+    The iterations are performed in the floating point type of the
+    matrix, or in `precision` if given. Iterations in single precision
+    move half as many bytes, but cannot reduce the residual much below
+    the resolution of `float32`. Each of up to `refinements` corrections
+    then solves, in the same precision, for the error of the solution
+    against the residual evaluated in double precision, until that
+    residual is below `tolerance` relative to the right-hand side.
+
+        >>> from fipy import Grid1D, CellVariable, DiffusionTerm
+        >>> from fipy.solvers.scipy import LinearPCGSolver
+        >>> mesh = Grid1D(nx=20)
+        >>> def solve(solver):
+        ...     var = CellVariable(mesh=mesh)
+        ...     var.constrain(0., where=mesh.facesLeft)
+        ...     var.constrain(1., where=mesh.facesRight)
+        ...     DiffusionTerm().solve(var, solver=solver)
+        ...     return var
+        >>> exact = mesh.cellCenters[0] / 20.
+        >>> single = solve(LinearPCGSolver(precision=numerix.float32))
+        >>> print numerix.allclose(single, exact, rtol=1e-5, atol=1e-5)
+        True
+        >>> print numerix.allclose(single, exact, rtol=1e-12, atol=0)
+        False
+        >>> refined = solve(LinearPCGSolver(tolerance=1e-15, precision=numerix.float32,
+        ...                                 refinements=5))
+        >>> print numerix.allclose(refined, exact, rtol=1e-12, atol=0)
+        True
+
     .. attention:: This class is abstract. Always create one of its subclasses.
     """
 
     def _solve_(self, L, x, b):
         A = L.matrix
+        if self.precision is None:
+            dtype = A.dtype
+        else:
+            dtype = numerix.dtype(self.precision)
+        if A.dtype != dtype:
+            A = A.astype(dtype)
+
+        tolerance = self.tolerance
+        if dtype != numerix.float64:
+            # iterations cannot reach below the resolution of their precision
+            tolerance = max(tolerance, numerix.finfo(dtype).resolution)
+
         if self.preconditioner is None:
             M = None
         else:
             M = self.preconditioner._applyToMatrix(A)
 
-        x, info = self.solveFnc(A, b, x,
-                                tol=self.tolerance,
+        if isinstance(self.preconditioner, Preconditioner):
+            # count the iterations, so the preconditioner can tell
+            # when it needs to be rebuilt
+            iterations = [0]
+            def callback(xk):
+                iterations[0] += 1
+        else:
+            callback = None
+
+        x, info = self.solveFnc(A, numerix.asarray(b, dtype=dtype),
+                                numerix.asarray(x, dtype=dtype),
+                                tol=tolerance,
                                 maxiter=self.iterations,
-                                M=M)
+                                M=M,
+                                callback=callback)
+
+        if self.refinements > 0:
+            A64 = L.matrix
+            if A64.dtype != numerix.float64:
+                A64 = A64.astype(numerix.float64)
+            b64 = numerix.asarray(b, dtype=numerix.float64)
+            x = numerix.asarray(x, dtype=numerix.float64)
+            bnorm = numerix.L2norm(b64)
+
+            for refinement in range(self.refinements):
+                residual = b64 - A64 * x
+                rnorm = numerix.L2norm(residual)
+                if rnorm <= self.tolerance * bnorm:
+                    break
+
+                # solve for the error against the normalized residual, as
+                # the tiny residual itself would already satisfy the
+                # absolute tolerance of the SciPy solvers
+                error, info = self.solveFnc(A, numerix.asarray(residual / rnorm, dtype=dtype),
+                                            numerix.zeros(len(residual), dtype),
+                                            tol=tolerance,
+                                            maxiter=self.iterations,
+                                            M=M,
+                                            callback=callback)
+                x = x + rnorm * numerix.asarray(error, dtype=numerix.float64)
+
+        if callback is not None:
+            self.preconditioner._recordIterations(iterations[0])
 
         if 'FIPY_VERBOSE_SOLVER' in os.environ:
             if info < 0:
                 PRINT('failure', self._warningList[info].__class__.__name__)
 
         return x
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
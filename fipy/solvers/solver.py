@@ -63,7 +63,7 @@ class Solver(object):
     .. attention:: This class is abstract. Always create one of its subclasses.
     """
 
-    def __init__(self, tolerance=1e-10, iterations=1000, precon=None):
+    def __init__(self, tolerance=1e-10, iterations=1000, precon=None, precision=None, refinements=0):
         """
         Create a `Solver` object.
 
@@ -71,6 +71,12 @@ class Solver(object):
           - `tolerance`: The required error tolerance.
           - `iterations`: The maximum number of iterative steps to perform.
           - `precon`: Preconditioner to use. This parameter is only available for Trilinos solvers.
+          - `precision`: The floating point type, e.g. `numerix.float32`,
+            of the iterations, if not that of the matrix. This parameter
+            is only available for SciPy Krylov solvers.
+          - `refinements`: The maximum number of corrections of the
+            solution against the residual evaluated in double precision.
+            This parameter is only available for SciPy Krylov solvers.
 
         """
         if self.__class__ is Solver:
@@ -80,6 +86,8 @@ class Solver(object):
         self.iterations = iterations
 
         self.preconditioner = precon
+        self.precision = precision
+        self.refinements = refinements
 
     def _storeMatrix(self, var, matrix, RHSvector):
         self.var = var
@@ -0,0 +1,4 @@
+from fipy.solvers.spectral.fourierSolver import *
+
+__all__ = []
+__all__.extend(fourierSolver.__all__)
@@ -0,0 +1,226 @@
+__docformat__ = 'restructuredtext'
+
+import os
+import hashlib
+
+from fipy.solvers.scipy.scipySolver import _ScipySolver
+from fipy.solvers.scipy.linearLUSolver import LinearLUSolver
+from fipy.solvers.multigrid.gridHierarchy import _gridShape
+from fipy.tools import numerix
+
+__all__ = ["FourierSolver"]
+
+class FourierSolver(_ScipySolver):
+    """
+    The `FourierSolver` solves a linear system of equations on a
+    `PeriodicGrid1D`, `PeriodicGrid2D` or `PeriodicGrid3D` with uniform
+    spacing by discrete Fourier transforms, when the coefficients of
+    the equation are the same in every cell.
+
+    Such a matrix couples every cell to its neighbors in the same way,
+    so it is diagonalized by the Fourier transform of the grid. Its
+    eigenvalues, the symbol of the discretized terms, are the transform
+    of the column of the matrix for the first cell. The symbol is
+    computed and inverted once, and kept for as long as the matrix does
+    not change, so every solve that follows costs only a forward and an
+    inverse transform.
+
+        >>> from fipy import PeriodicGrid2D, CellVariable, TransientTerm, DiffusionTerm
+        >>> mesh = PeriodicGrid2D(nx=16, ny=12, dx=0.5, dy=0.5)
+        >>> x, y = mesh.cellCenters
+        >>> def transient(solver):
+        ...     var = CellVariable(mesh=mesh, value=numerix.sin(2 * numerix.pi * x / 8.) * y)
+        ...     eq = TransientTerm() == DiffusionTerm(coeff=2.)
+        ...     for step in range(3):
+        ...         eq.solve(var, dt=0.1, solver=solver)
+        ...     return var
+        >>> solver = FourierSolver()
+        >>> print numerix.allclose(transient(solver), transient(LinearLUSolver()))
+        True
+        >>> print solver.transforms, solver.reuses, solver.fallbacks
+        1 2 0
+
+    Fourth order terms and coupled equations are diagonalized in the
+    same way. For the linearized Cahn-Hilliard equations
+
+        >>> from fipy import PeriodicGrid1D, ImplicitSourceTerm
+        >>> mesh = PeriodicGrid1D(nx=32, dx=0.25)
+        >>> def cahnHilliard(solver):
+        ...     phi = CellVariable(mesh=mesh, value=numerix.cos(2 * numerix.pi * mesh.x / 8.))
+        ...     psi = CellVariable(mesh=mesh)
+        ...     eq = ((TransientTerm(var=phi) == DiffusionTerm(coeff=1., var=psi))
+        ...           & (ImplicitSourceTerm(coeff=1., var=psi)
+        ...              == ImplicitSourceTerm(coeff=-1., var=phi)
+        ...              - DiffusionTerm(coeff=0.5, var=phi)))
+        ...     for step in range(3):
+        ...         eq.solve(dt=0.1, solver=solver)
+        ...     return phi, psi
+        >>> phi, psi = cahnHilliard(FourierSolver())
+        >>> phi2, psi2 = cahnHilliard(LinearLUSolver())
+        >>> print numerix.allclose(phi, phi2), numerix.allclose(psi, psi2)
+        True True
+
+    or for a single fourth order term
+
+        >>> phi = CellVariable(mesh=mesh, value=numerix.cos(2 * numerix.pi * mesh.x / 8.))
+        >>> phi2 = phi.copy()
+        >>> eq = TransientTerm() == DiffusionTerm(coeff=(1., -0.5))
+        >>> eq.solve(phi, dt=0.1, solver=FourierSolver())
+        >>> eq.solve(phi2, dt=0.1, solver=LinearLUSolver())
+        >>> print numerix.allclose(phi, phi2)
+        True
+
+    The average of a steady periodic diffusion problem is undetermined,
+    so it is left as it was
+
+        >>> phi = CellVariable(mesh=mesh, value=1. + numerix.cos(2 * numerix.pi * mesh.x / 8.))
+        >>> (DiffusionTerm() == numerix.sin(2 * numerix.pi * mesh.x / 8.)).solve(phi, solver=FourierSolver())
+        >>> print numerix.allclose(phi.cellVolumeAverage, 1.)
+        True
+        >>> print numerix.allclose(phi, 1. - (8. / (2 * numerix.pi))**2
+        ...                        * numerix.sin(2 * numerix.pi * mesh.x / 8.), atol=0.02)
+        True
+
+    Any other system, such as one with fixed values at the boundaries,
+    or coefficients that vary from cell to cell, is solved by
+    `LinearLUSolver` instead
+
+        >>> from fipy import Grid1D
+        >>> mesh = Grid1D(nx=10)
+        >>> var = CellVariable(mesh=mesh)
+        >>> var.constrain(0., where=mesh.facesLeft)
+        >>> var.constrain(1., where=mesh.facesRight)
+        >>> solver = FourierSolver()
+        >>> DiffusionTerm().solve(var, solver=solver)
+        >>> print numerix.allclose(var, mesh.cellCenters[0] / 10.)
+        True
+        >>> print solver.transforms, solver.fallbacks
+        0 1
+    """
+
+    def __init__(self, tolerance=1e-10, iterations=10, precon=None):
+        """
+        :Parameters:
+          - `tolerance`: The required error tolerance of `LinearLUSolver`,
+            for systems that cannot be solved by Fourier transforms.
+          - `iterations`: The maximum number of iterative steps of
+            `LinearLUSolver`.
+          - `precon`: not used but maintains a common interface.
+
+        """
+        super(FourierSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon)
+
+        self._fingerprint = None
+        self._inverse = None
+        self._singular = None
+
+        self.transforms = 0
+        self.reuses = 0
+        self.fallbacks = 0
+
+    @staticmethod
+    def _hash(*arrays):
+        h = hashlib.sha1()
+        for arr in arrays:
+            h.update(numerix.ascontiguousarray(arr).data)
+        return h.hexdigest()
+
+    def _transform(self, v, shape):
+        """The Fourier transform of `v`, as the values of `blocks`
+        variables on a grid of `shape`, with the variables last
+        """
+        v = numerix.reshape(v, (-1,) + shape[::-1])
+        v = numerix.fft.fftn(v, axes=range(1, len(shape) + 1))
+        return numerix.rollaxis(v, 0, len(shape) + 1)
+
+    def _inverseTransform(self, V, shape):
+        V = numerix.rollaxis(V, -1, 0)
+        v = numerix.fft.ifftn(V, axes=range(1, len(shape) + 1))
+        return numerix.ravel(v.real)
+
+    def _symbol(self, A, shape, blocks):
+        """The Fourier transform of the matrix `A` of `blocks` variables
+        on a periodic grid of `shape`, as one `(blocks, blocks)` matrix
+        for each wavenumber
+        """
+        N = A.shape[0] // blocks
+        columns = A.tocsc()[:, numerix.arange(blocks) * N].toarray()
+        # the coupling of each cell of each variable to the first cell
+        # of each variable is the convolution kernel of its block
+        columns = numerix.reshape(columns, (blocks, N, blocks))
+        symbol = numerix.array([self._transform(columns[..., j], shape) for j in range(blocks)])
+        return numerix.rollaxis(symbol, 0, len(shape) + 2)
+
+    def _diagonalize(self, A, shape, blocks):
+        """Invert the symbol of `A`, or return `False` if `A` is not
+        diagonalized by the Fourier transform
+        """
+        symbol = self._symbol(A, shape, blocks)
+
+        # the matrix must act as a convolution with its first column
+        v = numerix.random.RandomState(0).random_sample(A.shape[0])
+        Av = A * v
+        convolved = self._inverseTransform(numerix.sum(symbol * self._transform(v, shape)[..., numerix.newaxis, :],
+                                                       axis=-1),
+                                           shape)
+        if (numerix.L2norm(Av - convolved)
+            > 1000 * numerix.finfo(A.dtype).eps * numerix.L2norm(Av)):
+            return False
+
+        if blocks == 1:
+            scale = abs(symbol).max()
+            self._singular = (abs(symbol[..., 0])
+                              <= 1000 * numerix.finfo(A.dtype).eps * scale)
+            self._inverse = 1. / numerix.where(self._singular[..., numerix.newaxis], 1., symbol)
+        else:
+            try:
+                self._inverse = numerix.linalg.inv(symbol)
+            except numerix.linalg.LinAlgError:
+                return False
+            self._singular = None
+
+        return True
+
+    def _solve_(self, L, x, b):
+        A = L.matrix
+        try:
+            shape = _gridShape(L.mesh)
+        except TypeError:
+            shape = None
+
+        if shape is not None:
+            blocks = A.shape[0] // L.mesh.numberOfCells
+            fingerprint = self._hash(A.indptr, A.indices, A.data) + repr((A.shape, shape))
+            if fingerprint == self._fingerprint:
+                self.reuses += 1
+            elif self._diagonalize(A, shape, blocks):
+                self.transforms += 1
+                self._fingerprint = fingerprint
+            else:
+                shape = None
+
+        if shape is None:
+            self.fallbacks += 1
+            self._fingerprint = None
+            fallback = LinearLUSolver(tolerance=self.tolerance, iterations=self.iterations)
+            return fallback._solve_(L, x, b)
+
+        B = self._transform(numerix.asarray(b), shape)
+        X = numerix.sum(self._inverse * B[..., numerix.newaxis, :], axis=-1)
+        if self._singular is not None:
+            # leave the undetermined modes of the solution as they were
+            X = numerix.where(self._singular, self._transform(x, shape), X)
+        x = numerix.asarray(self._inverseTransform(X, shape), dtype=A.dtype)
+
+        if 'FIPY_VERBOSE_SOLVER' in os.environ:
+            from fipy.tools.debug import PRINT
+            PRINT('residual:', numerix.L2norm(b - A * x))
+
+        return x
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -1,11 +1,37 @@
+from __future__ import absolute_import
+
 __all__ = []
 
-from fipy.tests.lateImportTest import _LateImportTestSuite
+from fipy.tests.doctestPlus import _LateImportDocTestSuite
 import fipy.tests.testProgram
+from fipy.solvers import solver
+
+if solver == 'scipy' or solver == 'pyamg':
+    docTestModuleNames = ('scipy.linearLUSolver',
+                          'scipy.scipyKrylovSolver',
+                          'scipy.preconditioners.preconditioner',
+                          'scipy.preconditioners.jacobiPreconditioner',
+                          'scipy.preconditioners.iluPreconditioner',
+                          'scipy.preconditioners.ssorPreconditioner')
+else:
+    docTestModuleNames = ()
+
+if solver == 'pyamg':
+    docTestModuleNames += ('pyAMG.preconditioners.smoothedAggregationPreconditioner',)
+
+try:
+    import scipy.sparse
+    docTestModuleNames += ('multigrid.gridHierarchy',
+                           'multigrid.geometricMultigridSolver',
+                           'multigrid.geometricMultigridPreconditioner',
+                           'spectral.fourierSolver',
+                           'banded.linearBandedSolver',
+                           'banded.linearADISolver')
+except ImportError:
+    pass
 
 def _suite():
-    return _LateImportTestSuite(testModuleNames = (),
-                                base = __name__)
+    return _LateImportDocTestSuite(docTestModuleNames=docTestModuleNames, base=__name__)
 
 if __name__ == '__main__':
     fipy.tests.testProgram.main(defaultTest='_suite')
@@ -3,6 +3,7 @@ __docformat__ = 'restructuredtext'
 from fipy.steppers.stepper import Stepper
 from fipy.steppers.pseudoRKQSStepper import PseudoRKQSStepper
 from fipy.steppers.pidStepper import PIDStepper
+from fipy.steppers.adaptiveStepper import AdaptiveStepper
 
 __all__ = ["L1error", "L2error", "LINFerror", "sweepMonotonic"]
 
@@ -0,0 +1,252 @@
+__docformat__ = 'restructuredtext'
+
+import time
+
+from fipy.steppers.stepper import Stepper
+from fipy.tools import numerix
+
+__all__ = ["AdaptiveStepper"]
+
+class AdaptiveStepper(Stepper):
+    r"""
+    Adaptive stepper that estimates the local error of each step from the
+    solutions themselves, rather than relying on `sweepFn` to return one.
+
+    `TransientTerm` discretizes time with the backward Euler (BDF1)
+    method. The local error of a BDF1 step of size :math:`\Delta t`,
+    following a step of size :math:`\Delta t_\text{prev}`, is estimated
+    with one of
+
+    - ``"bdf"``: by comparison with the second order prediction
+      extrapolated from the last two accepted solutions,
+
+      .. math::
+
+         e \approx \frac{\Delta t}{2 \Delta t + \Delta t_\text{prev}}
+         \left(\phi^{n+1} - \phi^{n+1}_\text{P}\right),
+         \qquad
+         \phi^{n+1}_\text{P} = \phi^n + \frac{\Delta t}{\Delta t_\text{prev}}
+         \left(\phi^n - \phi^{n-1}\right),
+
+      which costs nothing beyond the step itself. Richardson
+      extrapolation is used until there are two solutions to
+      extrapolate from.
+
+    - ``"richardson"``: by comparison of one step of :math:`\Delta t`
+      with two steps of :math:`\Delta t / 2`, :math:`e \approx
+      \phi^{n+1}_{\Delta t / 2} - \phi^{n+1}_{\Delta t}`. This triples
+      the cost of each step, but also applies when the solution is not
+      smooth in time. The solution of the two half steps is kept.
+
+    A step is accepted if the root-mean-square of :math:`e / (\mathtt{atol}
+    + \mathtt{rtol} |\phi^{n+1}|)`, over the cells of all of the
+    variables, is at most 1. Whether accepted or not, the next step is
+    scaled by :math:`\mathtt{safety} \cdot \text{error}^{-1/2}`, within
+    the bounds of `shrink` and `grow`. A rejected step only restores the
+    value of each variable from its `old` value.
+
+    The last `historyLength` accepted solutions are kept. They supply
+    the ``"bdf"`` prediction and, if `extrapolate` is `True`, the
+    initial guess of each step (which benefits iterative solvers and
+    nonlinear sweeps).
+
+    The value returned by `sweepFn` is ignored. The number of `accepted`
+    and `rejected` steps, the number of calls to `sweepFn` (`solves` and
+    `rejectedSolves`) and the wall time spent on rejected steps
+    (`rejectedTime`) are counted, from construction or from the last
+    call to `reset()`.
+
+    Solve the diffusion of a sine wave, which decays as
+    :math:`e^{-\pi^2 t}`
+
+        >>> from fipy import Grid1D, CellVariable, TransientTerm, DiffusionTerm
+        >>> mesh = Grid1D(nx=50, dx=1. / 50)
+        >>> def setup():
+        ...     var = CellVariable(mesh=mesh, hasOld=True,
+        ...                        value=numerix.sin(numerix.pi * mesh.x))
+        ...     var.constrain(0., where=mesh.exteriorFaces)
+        ...     return var, ((var, TransientTerm() == DiffusionTerm(), ()),)
+        >>> var, vardata = setup()
+        >>> stepper = AdaptiveStepper(vardata=vardata, rtol=1e-3, atol=1e-6)
+        >>> dt, dtNext = stepper.step(dt=0.2, dtTry=1e-4)
+        >>> print numerix.allclose(var, numerix.exp(-numerix.pi**2 * 0.2) * numerix.sin(numerix.pi * mesh.x),
+        ...                        atol=1e-2)
+        True
+
+    The step grows as the solution decays, with few rejections
+
+        >>> print stepper.accepted < 60, stepper.rejected < 5
+        True True
+
+    Richardson extrapolation reaches the same solution with more solves
+
+        >>> var2, vardata = setup()
+        >>> stepper2 = AdaptiveStepper(vardata=vardata, rtol=1e-3, atol=1e-6, estimator="richardson")
+        >>> dt, dtNext = stepper2.step(dt=0.2, dtTry=1e-4)
+        >>> print numerix.allclose(var2, var, atol=1e-2)
+        True
+        >>> print stepper2.solves > stepper.solves
+        True
+
+    """
+    def __init__(self, vardata=(), rtol=1e-3, atol=1e-6, estimator="bdf",
+                 safety=0.9, shrink=0.2, grow=5., historyLength=3, extrapolate=True):
+        """
+        :Parameters:
+          - `vardata`: A `tuple` of `(var, eqn, bcs)` `tuple` objects.
+          - `rtol`: The relative tolerance of the local error.
+          - `atol`: The absolute tolerance of the local error.
+          - `estimator`: ``"bdf"`` or ``"richardson"``.
+          - `safety`: Factor by which to scale the step predicted from the error.
+          - `shrink`: The smallest factor by which to scale a step.
+          - `grow`: The largest factor by which to scale a step.
+          - `historyLength`: The number of accepted solutions to keep (at least 2).
+          - `extrapolate`: Whether to start each step from the solution
+            extrapolated from the history.
+
+        """
+        Stepper.__init__(self, vardata=vardata)
+
+        if estimator not in ("bdf", "richardson"):
+            raise ValueError("Unknown error estimator '%s'" % estimator)
+
+        self.rtol = rtol
+        self.atol = atol
+        self.estimator = estimator
+        self.safety = safety
+        self.shrink = shrink
+        self.grow = grow
+        self.historyLength = max(historyLength, 2)
+        self.extrapolate = extrapolate
+
+        self.reset()
+
+    def reset(self):
+        """Forget the history and the statistics, *e.g.*, after the
+        variables have been changed outside of the stepper.
+        """
+        self.time = 0.
+        self.history = []
+
+        self.accepted = 0
+        self.rejected = 0
+        self.solves = 0
+        self.rejectedSolves = 0
+        self.rejectedTime = 0.
+
+    def _values(self, old=False):
+        if old:
+            return [numerix.array(var.old.value) for var, eqn, bcs in self.vardata]
+        else:
+            return [numerix.array(var.value) for var, eqn, bcs in self.vardata]
+
+    def _setValues(self, values):
+        for (var, eqn, bcs), value in zip(self.vardata, values):
+            var.setValue(value)
+
+    def _remember(self, values):
+        self.history.append((self.time, values))
+        del self.history[:-self.historyLength]
+
+    def _predict(self, dt):
+        """Extrapolate the solution at `dt` past the last in the history,
+        or return `None` if there is no history to extrapolate from.
+        """
+        if len(self.history) < 2:
+            return None
+
+        (t0, values0), (t1, values1) = self.history[-2:]
+        ratio = dt / (t1 - t0)
+
+        return [value1 + ratio * (value1 - value0) for value0, value1 in zip(values0, values1)]
+
+    def _errorNorm(self, errors):
+        """The root-mean-square of the scaled `errors`, over all processors
+        """
+        sumOfSquares = 0.
+        count = 0
+        for (var, eqn, bcs), error in zip(self.vardata, errors):
+            ids = var.mesh._localNonOverlappingCellIDs
+            value = numerix.array(var.value)[..., ids]
+            scaled = error[..., ids] / (self.atol + self.rtol * abs(value))
+            sumOfSquares += var.mesh.communicator.sum(numerix.array(numerix.sum(scaled**2)))
+            count += var.mesh.communicator.sum(numerix.array(scaled.size))
+
+        return numerix.sqrt(sumOfSquares / max(count, 1))
+
+    def _sweep(self, dt, sweepFn, *args, **kwargs):
+        self.solves += 1
+        sweepFn(vardata=self.vardata, dt=dt, *args, **kwargs)
+
+    def _richardson(self, dt, sweepFn, old, *args, **kwargs):
+        """Take one step of `dt` and two of `dt / 2`, keeping the latter
+        """
+        self._sweep(dt, sweepFn, *args, **kwargs)
+        full = self._values()
+
+        self._setValues(old)
+        self._sweep(dt / 2., sweepFn, *args, **kwargs)
+        for var, eqn, bcs in self.vardata:
+            var.updateOld()
+        self._sweep(dt / 2., sweepFn, *args, **kwargs)
+
+        # `Stepper.step()` expects `old` to hold the start of the step
+        for (var, eqn, bcs), value in zip(self.vardata, old):
+            var.old.setValue(value)
+
+        return [half - whole for half, whole in zip(self._values(), full)]
+
+    def _step(self, dt, dtPrev, sweepFn, failFn, *args, **kwargs):
+        old = self._values(old=True)
+        if (len(self.history) == 0
+            or not numerix.all([numerix.allequal(a, b) for a, b in zip(self.history[-1][1], old)])):
+            # the variables were changed since the last step
+            self.history = []
+            self._remember(old)
+
+        while True:
+            start = time.time()
+            solves = self.solves
+
+            prediction = self._predict(dt)
+            if self.extrapolate and prediction is not None:
+                self._setValues(prediction)
+
+            if self.estimator == "bdf" and prediction is not None:
+                self._sweep(dt, sweepFn, *args, **kwargs)
+                dtLast = self.history[-1][0] - self.history[-2][0]
+                factor = dt / (2 * dt + dtLast)
+                errors = [factor * (value - predicted)
+                          for value, predicted in zip(self._values(), prediction)]
+            else:
+                errors = self._richardson(dt, sweepFn, old, *args, **kwargs)
+
+            error = self._errorNorm(errors)
+            scale = self.safety * max(error, 1e-10)**-0.5
+            scale = min(max(scale, self.shrink), self.grow)
+
+            if error > 1. and dt > self.dtMin:
+                # reject the step
+                failFn(vardata=self.vardata, dt=dt, *args, **kwargs)
+
+                self.rejected += 1
+                self.rejectedSolves += self.solves - solves
+                self._setValues(old)
+                self.rejectedTime += time.time() - start
+
+                dt = self._lowerBound(min(scale, 1.) * dt)
+            else:
+                break
+
+        self.accepted += 1
+        self.time += dt
+        self._remember(self._values())
+
+        return dt, dt * scale
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
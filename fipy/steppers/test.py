@@ -0,0 +1,14 @@
+__all__ = []
+
+from fipy.tests.doctestPlus import _LateImportDocTestSuite
+import fipy.tests.testProgram
+
+def _suite():
+    theSuite = _LateImportDocTestSuite(docTestModuleNames = (
+            'adaptiveStepper',
+        ), base = __name__)
+
+    return theSuite
+
+if __name__ == '__main__':
+    fipy.tests.testProgram.main(defaultTest='_suite')
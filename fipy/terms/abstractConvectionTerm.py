@@ -160,8 +160,19 @@ class _AbstractConvectionTerm(FaceTerm):
 
         mesh = var.mesh
 
+        self.__calcConstraints(var, transientGeomCoeff, diffusionGeomCoeff)
+
+        ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
+        L.addAt(numerix.array(self.constraintL).ravel(), ids.ravel(), ids.swapaxes(0,1).ravel())
+        b += numerix.reshape(self.constraintB.value, ids.shape).sum(0).ravel()
+
+        return (var, L, b)
+
+    def __calcConstraints(self, var, transientGeomCoeff, diffusionGeomCoeff):
         if (not hasattr(self, 'constraintL')) or (not hasattr(self, 'constraintB')):
 
+            mesh = var.mesh
+
             constraintMask = var.faceGrad.constraintMask | var.arithmeticFaceValue.constraintMask
 
             weight = self._getWeight(var, transientGeomCoeff, diffusionGeomCoeff)
@@ -176,11 +187,18 @@ class _AbstractConvectionTerm(FaceTerm):
             self.constraintL = (alpha * constraintMask * exteriorCoeff).divergence * mesh.cellVolumes
             self.constraintB =  -((1 - alpha) * var.arithmeticFaceValue * constraintMask * exteriorCoeff).divergence * mesh.cellVolumes
 
-        ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
-        L.addAt(numerix.array(self.constraintL).ravel(), ids.ravel(), ids.swapaxes(0,1).ravel())
-        b += numerix.reshape(self.constraintB.value, ids.shape).sum(0).ravel()
+    def _buildMatrixFree(self, var, vector, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
+        if var.rank != 0 or boundaryConditions:
+            return FaceTerm._buildMatrixFree(self, var, vector, SparseMatrix, boundaryConditions=boundaryConditions, dt=dt, transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
 
-        return (var, L, b)
+        var, Lx, b = FaceTerm._buildMatrixFree(self, var, vector, SparseMatrix, dt=dt, transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
+
+        self.__calcConstraints(var, transientGeomCoeff, diffusionGeomCoeff)
+
+        Lx += numerix.array(self.constraintL).ravel() * vector
+        b += numerix.array(self.constraintB).ravel()
+
+        return (var, Lx, b)
 
 class __ConvectionTerm(_AbstractConvectionTerm):
     """
@@ -286,40 +286,43 @@ class _AbstractDiffusionTerm(_UnaryTerm):
 
         if self.order == 2:
 
-            if (not hasattr(self, 'constraintL')) or (not hasattr(self, 'constraintB')):
+            self.__calcConstraints(var)
 
-                normals = FaceVariable(mesh=mesh, rank=1, value=mesh._orientedFaceNormals)
+            ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
+            L.addAt(self.constraintL.ravel(), ids.ravel(), ids.swapaxes(0,1).ravel())
+            b += numerix.reshape(self.constraintB.ravel(), ids.shape).sum(-2).ravel()
 
-                if len(var.shape) == 1 and len(self.nthCoeff.shape) > 1:
-                    nthCoeffFaceGrad = var.faceGrad.dot(self.nthCoeff)
-                    normalsNthCoeff =  normals.dot(self.nthCoeff)
-                else:
+        return (var, L, b)
 
-                    if self.nthCoeff.shape != () and not isinstance(self.nthCoeff, FaceVariable):
-                        coeff = self.nthCoeff[...,numerix.newaxis]
-                    else:
-                        coeff = self.nthCoeff
+    def __calcConstraints(self, var):
+        if (not hasattr(self, 'constraintL')) or (not hasattr(self, 'constraintB')):
 
-                    nthCoeffFaceGrad = coeff[numerix.newaxis] * var.faceGrad[:,numerix.newaxis]
-                    s = (slice(0,None,None),) + (numerix.newaxis,) * (len(coeff.shape) - 1) + (slice(0,None,None),)
-                    normalsNthCoeff = coeff[numerix.newaxis] * normals[s]
+            mesh = var.mesh
 
-                self.constraintB = -(var.faceGrad.constraintMask * nthCoeffFaceGrad).divergence * mesh.cellVolumes
+            normals = FaceVariable(mesh=mesh, rank=1, value=mesh._orientedFaceNormals)
 
-                constrainedNormalsDotCoeffOverdAP = var.arithmeticFaceValue.constraintMask * \
-                                                    normalsNthCoeff / mesh._cellDistances
+            if len(var.shape) == 1 and len(self.nthCoeff.shape) > 1:
+                nthCoeffFaceGrad = var.faceGrad.dot(self.nthCoeff)
+                normalsNthCoeff =  normals.dot(self.nthCoeff)
+            else:
 
-                self.constraintB -= (constrainedNormalsDotCoeffOverdAP * var.arithmeticFaceValue).divergence * mesh.cellVolumes
+                if self.nthCoeff.shape != () and not isinstance(self.nthCoeff, FaceVariable):
+                    coeff = self.nthCoeff[...,numerix.newaxis]
+                else:
+                    coeff = self.nthCoeff
 
-                ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
+                nthCoeffFaceGrad = coeff[numerix.newaxis] * var.faceGrad[:,numerix.newaxis]
+                s = (slice(0,None,None),) + (numerix.newaxis,) * (len(coeff.shape) - 1) + (slice(0,None,None),)
+                normalsNthCoeff = coeff[numerix.newaxis] * normals[s]
 
-                self.constraintL = -constrainedNormalsDotCoeffOverdAP.divergence * mesh.cellVolumes
+            self.constraintB = -(var.faceGrad.constraintMask * nthCoeffFaceGrad).divergence * mesh.cellVolumes
 
-            ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
-            L.addAt(self.constraintL.ravel(), ids.ravel(), ids.swapaxes(0,1).ravel())
-            b += numerix.reshape(self.constraintB.ravel(), ids.shape).sum(-2).ravel()
+            constrainedNormalsDotCoeffOverdAP = var.arithmeticFaceValue.constraintMask * \
+                                                normalsNthCoeff / mesh._cellDistances
 
-        return (var, L, b)
+            self.constraintB -= (constrainedNormalsDotCoeffOverdAP * var.arithmeticFaceValue).divergence * mesh.cellVolumes
+
+            self.constraintL = -constrainedNormalsDotCoeffOverdAP.divergence * mesh.cellVolumes
 
     def __higherOrderbuildMatrix(self, var, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
         mesh = var.mesh
@@ -344,24 +347,7 @@ class _AbstractDiffusionTerm(_UnaryTerm):
             lowerOrderL = volMatrix * lowerOrderL
             del volMatrix
 
-            if not hasattr(self, 'coeffDict'):
-
-                coeff = self._getGeomCoeff(var)[0]
-                minusCoeff = -coeff
-
-                coeff.dontCacheMe()
-                minusCoeff.dontCacheMe()
-
-                self.coeffDict = {
-                    'cell 1 diag':     minusCoeff,
-                    'cell 1 offdiag':  coeff
-                    }
-                del coeff
-                del minusCoeff
-
-                self.coeffDict['cell 2 offdiag'] = self.coeffDict['cell 1 offdiag']
-                self.coeffDict['cell 2 diag'] = self.coeffDict['cell 1 diag']
-
+            self.__calcCoeffDict(var)
 
             mm = self.__getCoefficientMatrix(SparseMatrix, var, self.coeffDict['cell 1 diag'])
             L, b = self.__doBCs(SparseMatrix, higherOrderBCs, N, M, self.coeffDict,
@@ -378,26 +364,7 @@ class _AbstractDiffusionTerm(_UnaryTerm):
 
         elif self.order == 2:
 
-            if not hasattr(self, 'coeffDict'):
-
-                coeff = self._getGeomCoeff(var)
-                minusCoeff = -coeff[0]
-
-                coeff[0].dontCacheMe()
-                minusCoeff.dontCacheMe()
-
-                self.coeffDict = {
-                    'cell 1 diag':    minusCoeff,
-                    'cell 1 offdiag':  coeff[0]
-                    }
-
-                self.coeffDict['cell 2 offdiag'] = self.coeffDict['cell 1 offdiag']
-                self.coeffDict['cell 2 diag'] = self.coeffDict['cell 1 diag']
-
-                self.__calcAnisotropySource(coeff, mesh, var)
-
-                del coeff
-                del minusCoeff
+            self.__calcCoeffDict(var)
 
             higherOrderBCs, lowerOrderBCs = self.__getBoundaryConditions(boundaryConditions)
             del lowerOrderBCs
@@ -419,6 +386,82 @@ class _AbstractDiffusionTerm(_UnaryTerm):
 
         return (var, L, b)
 
+    def __calcCoeffDict(self, var):
+        if not hasattr(self, 'coeffDict'):
+
+            coeff = self._getGeomCoeff(var)
+            minusCoeff = -coeff[0]
+
+            coeff[0].dontCacheMe()
+            minusCoeff.dontCacheMe()
+
+            self.coeffDict = {
+                'cell 1 diag':    minusCoeff,
+                'cell 1 offdiag':  coeff[0]
+                }
+
+            self.coeffDict['cell 2 offdiag'] = self.coeffDict['cell 1 offdiag']
+            self.coeffDict['cell 2 diag'] = self.coeffDict['cell 1 diag']
+
+            if self.order == 2:
+                self.__calcAnisotropySource(coeff, var.mesh, var)
+
+    def __applyCoefficient(self, var, coeff, vector):
+        """Sum the fluxes `coeff * (vector[id2] - vector[id1])` across
+        the interior faces of each cell, i.e., apply the matrix
+        `__getCoefficientMatrix()` would build for `-coeff`.
+        """
+        mesh = var.mesh
+        id1, id2 = mesh._adjacentCellIDs
+        interiorFaces = numerix.nonzero(mesh.interiorFaces)[0]
+
+        id1 = numerix.take(id1, interiorFaces)
+        id2 = numerix.take(id2, interiorFaces)
+
+        interiorCoeff = numerix.take(numerix.asarray(coeff), interiorFaces, axis=-1).ravel()
+        flux = interiorCoeff * (numerix.take(vector, id2) - numerix.take(vector, id1))
+
+        N = mesh.numberOfCells
+        return (numerix.bincount(id1, weights=flux, minlength=N)
+                - numerix.bincount(id2, weights=flux, minlength=N))
+
+    def _buildMatrixFree(self, var, vector, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
+        if var.rank != 0 or boundaryConditions:
+            return _UnaryTerm._buildMatrixFree(self, var, vector, SparseMatrix, boundaryConditions=boundaryConditions, dt=dt, transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
+
+        mesh = var.mesh
+        b = numerix.zeros(len(var.ravel()),'d')
+
+        if self.order > 2:
+
+            var, lowerOrderLx, lowerOrderb = self.lowerOrderDiffusionTerm._buildMatrixFree(var, vector, SparseMatrix,
+                                                                                           dt=dt, transientGeomCoeff=transientGeomCoeff,
+                                                                                           diffusionGeomCoeff=diffusionGeomCoeff)
+
+            self.__calcCoeffDict(var)
+            coeff = self.coeffDict['cell 1 offdiag']
+
+            Lx = self.__applyCoefficient(var, coeff, lowerOrderLx / mesh.cellVolumes)
+            b += self.__applyCoefficient(var, coeff, lowerOrderb / mesh.cellVolumes)
+
+        elif self.order == 2:
+
+            self.__calcCoeffDict(var)
+            self.__calcConstraints(var)
+
+            Lx = self.__applyCoefficient(var, self.coeffDict['cell 1 offdiag'], vector)
+            Lx += numerix.array(self.constraintL).ravel() * vector
+
+            if hasattr(self, 'anisotropySource'):
+                b -= self.anisotropySource
+            b += numerix.array(self.constraintB).ravel()
+
+        else:
+
+            Lx = mesh.cellVolumes * vector
+
+        return (var, Lx, b)
+
     def _getDiffusionGeomCoeff(self, var):
         if var is self.var or self.var is None:
             return self._getGeomCoeff(var)
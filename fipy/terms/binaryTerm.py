@@ -39,6 +39,29 @@ class _BinaryTerm(_AbstractBinaryTerm):
 
         return (var, matrix, RHSvector)
 
+    def _buildAndAddActions(self, var, vector, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None, buildExplicitIfOther=True):
+        """Matrix-free counterpart of `_buildAndAddMatrices()`
+        """
+
+        Lx = 0
+        RHSvector = 0
+
+        for term in (self.term, self.other):
+
+            tmpVar, tmpLx, tmpRHSvector = term._buildAndAddActions(var,
+                                                                   vector,
+                                                                   SparseMatrix,
+                                                                   boundaryConditions=boundaryConditions,
+                                                                   dt=dt,
+                                                                   transientGeomCoeff=transientGeomCoeff,
+                                                                   diffusionGeomCoeff=diffusionGeomCoeff,
+                                                                   buildExplicitIfOther=buildExplicitIfOther)
+
+            Lx += tmpLx
+            RHSvector += tmpRHSvector
+
+        return (var, Lx, RHSvector)
+
     def _getDefaultSolver(self, var, solver, *args, **kwargs):
         for term in (self.term, self.other):
             defaultSolver = term._getDefaultSolver(var, solver, *args, **kwargs)
@@ -130,6 +130,23 @@ class CellTerm(_NonDiffusionTerm):
 
         return (var, L, b)
 
+    def _buildMatrixFree(self, var, vector, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
+        if var.rank != 0:
+            return _NonDiffusionTerm._buildMatrixFree(self, var, vector, SparseMatrix, boundaryConditions=boundaryConditions, dt=dt, transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
+
+        coeffVectors = self._getCoeffVectors_(var=var, transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
+
+        dt = self._checkDt(dt)
+
+        b = numerix.zeros(var.shape,'d').ravel()
+        b += numerix.array(var.old).ravel() * numerix.array(coeffVectors['old value']).ravel() / dt
+        b += numerix.array(coeffVectors['b vector']).ravel()
+
+        diagonal = (numerix.array(coeffVectors['new value']).ravel() / dt
+                    + numerix.array(coeffVectors['diagonal']).ravel())
+
+        return (var, diagonal * vector, b)
+
     def _test(self):
         """
         The following tests demonstrate how the `CellVariable` objects
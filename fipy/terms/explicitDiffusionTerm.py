@@ -1,6 +1,8 @@
 __docformat__ = 'restructuredtext'
 
+from fipy.terms.unaryTerm import _UnaryTerm
 from fipy.terms.abstractDiffusionTerm import _AbstractDiffusionTerm
+from fipy.tools import numerix
 
 __all__ = ["ExplicitDiffusionTerm"]
 
@@ -30,6 +32,21 @@ class ExplicitDiffusionTerm(_AbstractDiffusionTerm):
 
         return (var, SparseMatrix(mesh=var.mesh), b - L * var.value)
 
+    def _buildMatrixFree(self, var, vector, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
+        if var.rank != 0 or boundaryConditions:
+            return _UnaryTerm._buildMatrixFree(self, var, vector, SparseMatrix, boundaryConditions=boundaryConditions, dt=dt, transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
+
+        if hasattr(var, 'old'):
+            varOld = var.old
+        else:
+            varOld = var
+
+        varOld, Lx, b = _AbstractDiffusionTerm._buildMatrixFree(self, varOld, numerix.array(var.value).ravel(), SparseMatrix,
+                                                                boundaryConditions = boundaryConditions, dt = dt,
+                                                                transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
+
+        return (var, numerix.zeros(len(vector),'d'), b - Lx)
+
     def _getNormals(self, mesh):
         return mesh._faceCellToCellNormals
 
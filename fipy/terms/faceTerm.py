@@ -147,3 +147,43 @@ class FaceTerm(_NonDiffusionTerm):
             self._explicitBuildMatrix_(SparseMatrix, var.old, id1, id2, b, weight['explicit'], var, boundaryConditions, interiorFaces, dt)
 
         return (var, L, b)
+
+    def _buildMatrixFree(self, var, vector, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
+        """Implicit portion is evaluated from the interior face fluxes
+        """
+        if var.rank != 0 or boundaryConditions:
+            return _NonDiffusionTerm._buildMatrixFree(self, var, vector, SparseMatrix, boundaryConditions=boundaryConditions, dt=dt, transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
+
+        mesh = var.mesh
+        id1, id2 = mesh._adjacentCellIDs
+        interiorFaces = numerix.nonzero(mesh.interiorFaces)[0]
+
+        id1 = numerix.take(id1, interiorFaces)
+        id2 = numerix.take(id2, interiorFaces)
+
+        N = mesh.numberOfCells
+        b = numerix.zeros(var.shape,'d').ravel()
+        Lx = numerix.zeros(N,'d')
+
+        weight = self._getWeight(var, transientGeomCoeff, diffusionGeomCoeff)
+
+        if 'implicit' in weight:
+            coeffMatrix = self._getCoeffMatrix_(var, weight['implicit'])
+
+            def interior(key):
+                return numerix.take(numerix.asarray(coeffMatrix[key]), interiorFaces)
+
+            vector1 = numerix.take(vector, id1)
+            vector2 = numerix.take(vector, id2)
+
+            Lx += numerix.bincount(id1,
+                                   weights=interior('cell 1 diag') * vector1 + interior('cell 1 offdiag') * vector2,
+                                   minlength=N)
+            Lx += numerix.bincount(id2,
+                                   weights=interior('cell 2 diag') * vector2 + interior('cell 2 offdiag') * vector1,
+                                   minlength=N)
+
+        if 'explicit' in weight:
+            self._explicitBuildMatrix_(SparseMatrix, var.old, id1, id2, b, weight['explicit'], var, boundaryConditions, interiorFaces, dt)
+
+        return (var, Lx, b)
@@ -95,10 +95,10 @@ class FirstOrderAdvectionTerm(_NonDiffusionTerm):
         cellValues = numerix.repeat(oldArray[numerix.newaxis, ...], NCellFaces, axis = 0)
 
         cellIDs = numerix.repeat(numerix.arange(NCells)[numerix.newaxis, ...], NCellFaces, axis = 0)
-        cellToCellIDs = mesh._cellToCellIDs
+        cellToCellIDs = mesh._cellToCellConnectivity
 
         if NCells > 0:
-            cellToCellIDs = MA.where(MA.getmask(cellToCellIDs), cellIDs, cellToCellIDs)
+            cellToCellIDs = numerix.where(cellToCellIDs.valid, cellToCellIDs.ids, cellIDs)
 
             adjacentValues = numerix.take(oldArray, cellToCellIDs)
 
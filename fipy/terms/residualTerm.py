@@ -23,7 +23,7 @@ class ResidualTerm(_ExplicitSourceTerm):
     def _getGeomCoeff(self, var):
         return self.coeff
 
-    def _buildMatrix(self, var, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
+    def __calcCoeff(self, var, boundaryConditions, dt):
         vec = self.equation.justResidualVector(var=None,
                                                boundaryConditions=boundaryConditions,
                                                dt=dt)
@@ -32,4 +32,12 @@ class ResidualTerm(_ExplicitSourceTerm):
         self.geomCoeff = None
         self.coeffVectors = None
 
+    def _buildMatrix(self, var, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
+        self.__calcCoeff(var, boundaryConditions, dt)
+
         return _ExplicitSourceTerm._buildMatrix(self, var=var, SparseMatrix=SparseMatrix, boundaryConditions=boundaryConditions, dt=dt, transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
+
+    def _buildMatrixFree(self, var, vector, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
+        self.__calcCoeff(var, boundaryConditions, dt)
+
+        return _ExplicitSourceTerm._buildMatrixFree(self, var=var, vector=vector, SparseMatrix=SparseMatrix, boundaryConditions=boundaryConditions, dt=dt, transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
@@ -32,6 +32,7 @@ class Term(object):
         self._matrix = None
         self._cacheRHSvector = False
         self._RHSvector = None
+        self._sparsityPattern = None
         self.var = var
 
     def _calcVars(self):
@@ -49,6 +50,36 @@ class Term(object):
     def _buildAndAddMatrices(self, var, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None, buildExplicitIfOther=False):
         raise NotImplementedError
 
+    def _buildMatrixFree(self, var, vector, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
+        """Return `var`, the action `L * vector` of the term's matrix and
+        the term's RHS vector.
+
+        Terms that know how to evaluate their action directly from their
+        face and cell coefficients override this method. All others
+        build the matrix and multiply.
+        """
+        var, L, b = self._buildMatrix(var,
+                                      SparseMatrix,
+                                      boundaryConditions=boundaryConditions,
+                                      dt=dt,
+                                      transientGeomCoeff=transientGeomCoeff,
+                                      diffusionGeomCoeff=diffusionGeomCoeff)
+
+        return (var, L * vector, b)
+
+    def _buildAndAddActions(self, var, vector, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None, buildExplicitIfOther=False):
+        """Matrix-free counterpart of `_buildAndAddMatrices()`
+        """
+        var, matrix, RHSvector = self._buildAndAddMatrices(var,
+                                                           SparseMatrix,
+                                                           boundaryConditions=boundaryConditions,
+                                                           dt=dt,
+                                                           transientGeomCoeff=transientGeomCoeff,
+                                                           diffusionGeomCoeff=diffusionGeomCoeff,
+                                                           buildExplicitIfOther=buildExplicitIfOther)
+
+        return (var, matrix * vector, RHSvector)
+
     def _checkVar(self, var):
         raise NotImplementedError
 
@@ -122,6 +153,8 @@ class Term(object):
                                                            diffusionGeomCoeff=self._getDiffusionGeomCoeff(var),
                                                            buildExplicitIfOther=self._buildExplcitIfOther)
 
+        self._sparsityPattern = matrix._shareSparsityPattern(self._sparsityPattern)
+
         self._buildCache(matrix, RHSvector)
 
         solver._storeMatrix(var=var, matrix=matrix, RHSvector=RHSvector)
@@ -146,6 +179,142 @@ class Term(object):
 
         return solver
 
+    def _prepareLinearAction(self, var, vector, solver, boundaryConditions, dt):
+        solver = self.getDefaultSolver(var, solver)
+
+        var = self._verifyVar(var)
+        self._checkVar(var)
+
+        if type(boundaryConditions) not in (type(()), type([])):
+            boundaryConditions = (boundaryConditions,)
+
+        for bc in boundaryConditions:
+            bc._resetBoundaryConditionApplied()
+
+        if vector is None:
+            vector = numerix.array(var).flatten()
+
+        return self._buildAndAddActions(var,
+                                        vector,
+                                        self._getMatrixClass(solver, var),
+                                        boundaryConditions=boundaryConditions,
+                                        dt=dt,
+                                        transientGeomCoeff=self._getTransientGeomCoeff(var),
+                                        diffusionGeomCoeff=self._getDiffusionGeomCoeff(var),
+                                        buildExplicitIfOther=self._buildExplcitIfOther)
+
+    def apply(self, var=None, vector=None, solver=None, boundaryConditions=(), dt=None):
+        r"""
+        Evaluates :math:`\mathsf{L}\vec{x}`, the action of the `Term`'s
+        matrix on a vector, without building the matrix. Diffusion,
+        convection and cell terms of scalar variables are evaluated
+        directly from their face fluxes and cell coefficients; any other
+        term falls back to building its matrix.
+
+        :Parameters:
+
+           - `var`: The variable that determines the coefficients of the matrix.
+           - `vector`: The vector :math:`\vec{x}`. Defaults to the value of `var`.
+           - `solver`: Only used to select the matrix class of terms that must build their matrix.
+           - `boundaryConditions`: A tuple of boundaryConditions.
+           - `dt`: The time step size.
+
+        >>> from fipy import *
+        >>> m = Grid2D(nx=4, ny=3)
+        >>> v = CellVariable(mesh=m, value=m.x * m.y, hasOld=True)
+        >>> v.constrain(1., where=m.facesLeft)
+        >>> v.faceGrad.constrain(((0.,), (2.,)), where=m.facesTop)
+        >>> eq = (TransientTerm(coeff=2.) == DiffusionTerm(coeff=1. + m.x)
+        ...       + ExponentialConvectionTerm(coeff=(1., -0.5))
+        ...       - ImplicitSourceTerm(coeff=m.y) + m.x)
+        >>> eq.cacheMatrix()
+        >>> eq.cacheRHSvector()
+        >>> r = eq.justResidualVector(v, dt=0.1)
+        >>> print numerix.allclose(eq.apply(v, dt=0.1), eq.matrix * v.value)
+        True
+        >>> x = numerix.random.random(m.numberOfCells)
+        >>> print numerix.allclose(eq.apply(v, x, dt=0.1), eq.matrix * x)
+        True
+
+        The residual :math:`\mathsf{L}\vec{x} - \vec{b}` can be
+        calculated the same way
+
+        >>> print numerix.allclose(eq.justResidualVector(v, dt=0.1, matrixFree=True), r)
+        True
+
+        Higher order diffusion terms are applied as the composition of
+        their lower order parts
+
+        >>> eq = DiffusionTerm(coeff=(1., 2.)) + DiffusionTerm(coeff=(-1.,))
+        >>> eq.cacheMatrix()
+        >>> r = eq.justResidualVector(v)
+        >>> print numerix.allclose(eq.apply(v, x), eq.matrix * x)
+        True
+
+        Terms that can only be evaluated through their matrix give the
+        same results
+
+        >>> eq = ExplicitDiffusionTerm() + UpwindConvectionTerm(coeff=(1., 0.))
+        >>> r = eq.justResidualVector(v, dt=0.1)
+        >>> print numerix.allclose(eq.justResidualVector(v, dt=0.1, matrixFree=True), r)
+        True
+        >>> v0 = CellVariable(mesh=m, value=1.)
+        >>> v1 = CellVariable(mesh=m, value=2.)
+        >>> eq = ((DiffusionTerm(var=v0) + ImplicitSourceTerm(coeff=-1., var=v1))
+        ...       & (ImplicitSourceTerm(var=v0) - DiffusionTerm(var=v1)))
+        >>> eq.cacheMatrix()
+        >>> r = eq.justResidualVector()
+        >>> x = numerix.concatenate((v0.value, v1.value))
+        >>> print numerix.allclose(eq.apply(), eq.matrix * x)
+        True
+
+        """
+        var, Lx, b = self._prepareLinearAction(var, vector, solver, boundaryConditions, dt)
+
+        return Lx
+
+    def linearOperator(self, var=None, solver=None, boundaryConditions=(), dt=None):
+        r"""
+        Returns the `Term`'s matrix as a `scipy.sparse.linalg.LinearOperator`
+        whose products are evaluated by `apply()`. The operator carries
+        the right hand side vector :math:`\vec{b}` as its `RHSvector`
+        attribute, so that the system can be handed to any of the
+        `scipy.sparse.linalg` Krylov solvers.
+
+        :Parameters:
+
+           - `var`: The variable that determines the coefficients of the matrix.
+           - `solver`: Only used to select the matrix class of terms that must build their matrix.
+           - `boundaryConditions`: A tuple of boundaryConditions.
+           - `dt`: The time step size.
+
+        >>> from fipy import *
+        >>> m = Grid1D(nx=20, dx=0.05)
+        >>> v = CellVariable(mesh=m)
+        >>> v.constrain(0., where=m.facesLeft)
+        >>> v.constrain(1., where=m.facesRight)
+        >>> A = DiffusionTerm().linearOperator(v)
+        >>> print A.shape
+        (20, 20)
+        >>> from scipy.sparse.linalg import cg
+        >>> x, info = cg(-A, -A.RHSvector, tol=1e-12)
+        >>> print info, numerix.allclose(x, m.x, atol=1e-8)
+        0 True
+
+        """
+        from scipy.sparse.linalg import LinearOperator
+
+        var, Lx, b = self._prepareLinearAction(var, None, solver, boundaryConditions, dt)
+
+        def matvec(vector):
+            return self._prepareLinearAction(var, numerix.ravel(vector),
+                                             solver, boundaryConditions, dt)[1]
+
+        operator = LinearOperator(shape=(len(b), len(b)), matvec=matvec, dtype=Lx.dtype)
+        operator.RHSvector = b
+
+        return operator
+
     def solve(self, var=None, solver=None, boundaryConditions=(), dt=None):
         r"""
         Builds and solves the `Term`'s linear system once. This method
@@ -208,7 +377,7 @@ class Term(object):
 
         return residual
 
-    def justResidualVector(self, var=None, solver=None, boundaryConditions=(), dt=None, underRelaxation=None, residualFn=None):
+    def justResidualVector(self, var=None, solver=None, boundaryConditions=(), dt=None, underRelaxation=None, residualFn=None, matrixFree=False):
         r"""
         Builds the `Term`'s linear system once. This method
         also recalculates and returns the residual as well as applying
@@ -222,6 +391,9 @@ class Term(object):
            - `dt`: The time step size.
            - `underRelaxation`: Usually a value between `0` and `1` or `None` in the case of no under-relaxation
            - `residualFn`: A function that takes var, matrix, and RHSvector arguments used to customize the residual calculation.
+           - `matrixFree`: If `True`, evaluate :math:`\mathsf{L}\vec{x}` with `apply()`
+             instead of building the matrix. Ignored if `underRelaxation`
+             or `residualFn` are given.
 
         `justResidualVector` returns the overlapping local value in parallel (not the non-overlapping value).
 
@@ -232,12 +404,17 @@ class Term(object):
         True
 
         """
+        if matrixFree and underRelaxation is None and residualFn is None:
+            var, Lx, b = self._prepareLinearAction(var, None, solver, boundaryConditions, dt)
+
+            return Lx - b
+
         solver = self._prepareLinearSystem(var, solver, boundaryConditions, dt)
         solver._applyUnderRelaxation(underRelaxation)
 
         return solver._calcResidualVector(residualFn=residualFn)
 
-    def residualVectorAndNorm(self, var=None, solver=None, boundaryConditions=(), dt=None, underRelaxation=None, residualFn=None):
+    def residualVectorAndNorm(self, var=None, solver=None, boundaryConditions=(), dt=None, underRelaxation=None, residualFn=None, matrixFree=False):
         r"""
         Builds the `Term`'s linear system once. This method
         also recalculates and returns the residual as well as applying
@@ -251,10 +428,12 @@ class Term(object):
            - `dt`: The time step size.
            - `underRelaxation`: Usually a value between `0` and `1` or `None` in the case of no under-relaxation
            - `residualFn`: A function that takes var, matrix, and RHSvector arguments used to customize the residual calculation.
+           - `matrixFree`: If `True`, evaluate the residual without building the matrix.
 
         """
         vector = self.justResidualVector(var=var, solver=solver, boundaryConditions=boundaryConditions, dt=dt,
-                                         underRelaxation=underRelaxation, residualFn=residualFn)
+                                         underRelaxation=underRelaxation, residualFn=residualFn,
+                                         matrixFree=matrixFree)
 
         L2norm = numerix.L2norm(vector)
 
@@ -84,6 +84,34 @@ class _UnaryTerm(Term):
 
         return (var, matrix, RHSvector)
 
+    def _buildAndAddActions(self, var, vector, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None, buildExplicitIfOther=False):
+        """Matrix-free counterpart of `_buildAndAddMatrices()`
+        """
+
+        if var is self.var or self.var is None:
+            var, Lx, RHSvector = self._buildMatrixFree(var,
+                                                       vector,
+                                                       SparseMatrix,
+                                                       boundaryConditions=boundaryConditions,
+                                                       dt=dt,
+                                                       transientGeomCoeff=transientGeomCoeff,
+                                                       diffusionGeomCoeff=diffusionGeomCoeff)
+        elif buildExplicitIfOther:
+            _, Lx, RHSvector = self._buildMatrixFree(self.var,
+                                                     numerix.array(self.var.value).flatten(),
+                                                     SparseMatrix,
+                                                     boundaryConditions=boundaryConditions,
+                                                     dt=dt,
+                                                     transientGeomCoeff=transientGeomCoeff,
+                                                     diffusionGeomCoeff=diffusionGeomCoeff)
+            RHSvector = RHSvector - Lx
+            Lx = numerix.zeros(len(vector),'d')
+        else:
+            RHSvector = numerix.zeros(len(var.ravel()),'d')
+            Lx = numerix.zeros(len(vector),'d')
+
+        return (var, Lx, RHSvector)
+
     def _reshapeIDs(self, var, ids):
         shape = (self._vectorSize(var), self._vectorSize(var), ids.shape[-1])
         ids = numerix.resize(ids, shape)
@@ -7,6 +7,7 @@ class test(_test):
     # name), and help string.
     user_options = _test.user_options + [
         ('inline', None, "run FiPy with inline compilation enabled"),
+        ('fuse', None, "run FiPy with fused evaluation of operator variables"),
         ('pythoncompiled=', None, "directory in which to put weave's work product"),
         ('Trilinos', None, "run FiPy using Trilinos solvers"),
         ('Pysparse', None, "run FiPy using Pysparse solvers (default)"),
@@ -40,6 +41,7 @@ class test(_test):
         self.viewers = False
 
         self.inline = False
+        self.fuse = False
         self.pythoncompiled = None
         self.cache = False
         self.no_cache = True
@@ -0,0 +1,102 @@
+"""Reuse of the arrays that `_OperatorVariable` nodes evaluate into.
+
+Every evaluation of an `_OperatorVariable` normally allocates a new
+array for its result, even though the shape and type of that result do
+not change from one time step to the next. When buffer reuse is
+enabled:
+
+- a cached node writes each new result into the array that holds its
+  previous result;
+- an uncached node takes the array for its result from a pool of free
+  arrays, and the node that consumes the result returns it to the pool.
+
+Buffer reuse is enabled by passing ``--reuse-buffers`` on the command
+line or by setting the ``FIPY_REUSE_BUFFERS`` environment variable.
+Arrays previously obtained from the `value` of a cached node are then
+overwritten when the node is reevaluated; copy them to keep them.
+
+    >>> from fipy.tools import numerix
+    >>> pool = _BufferPool()
+    >>> a = pool.acquire((3,), numerix.float64)
+    >>> pool.release(a)
+    >>> a is pool.acquire((3,), numerix.float64)
+    True
+    >>> a is pool.acquire((3,), numerix.float64)
+    False
+
+Only arrays that the pool issued are taken back, and only if they do not
+share memory with a result that is still in use
+
+    >>> b = pool.acquire((3,), numerix.float64)
+    >>> pool.release(b, keep=b[1:])
+    >>> pool.release(numerix.empty((3,)))
+    >>> b is pool.acquire((3,), numerix.float64)
+    False
+
+Arrays that are no longer referenced are forgotten
+
+    >>> c = pool.acquire((4,), numerix.float64)
+    >>> del c
+    >>> len(pool._issued)
+    2
+"""
+__docformat__ = 'restructuredtext'
+
+__all__ = ["doReuse"]
+
+import os
+import sys
+import weakref
+
+from fipy.tools import numerix
+
+if '--reuse-buffers' in [s.lower() for s in sys.argv[1:]]:
+    doReuse = True
+else:
+    doReuse = 'FIPY_REUSE_BUFFERS' in os.environ
+
+class _BufferPool(object):
+    """Free arrays, by shape and type, for the results of uncached nodes.
+
+    :Parameters:
+      - `depth`: the most free arrays kept for any one shape and type
+    """
+    def __init__(self, depth=4):
+        self.depth = depth
+        self._free = {}
+        self._issued = weakref.WeakValueDictionary()
+
+    def acquire(self, shape, dtype):
+        """Return an array of `shape` and `dtype` with undefined values"""
+        free = self._free.get((shape, numerix.dtype(dtype).str))
+        if free:
+            buf = free.pop()
+        else:
+            buf = numerix.empty(shape, dtype)
+        self._issued[id(buf)] = buf
+        return buf
+
+    def numberFree(self, shape, dtype):
+        """Return the number of free arrays of `shape` and `dtype`"""
+        return len(self._free.get((shape, numerix.dtype(dtype).str), []))
+
+    def release(self, buf, keep=None):
+        """Return `buf` to the pool if it was issued by the pool and does
+        not share memory with `keep`
+        """
+        if (isinstance(buf, numerix.ndarray)
+            and self._issued.get(id(buf)) is buf
+            and (keep is None or not numerix.may_share_memory(buf, keep))):
+            del self._issued[id(buf)]
+            free = self._free.setdefault((buf.shape, buf.dtype.str), [])
+            if len(free) < self.depth:
+                free.append(buf)
+
+_pool = _BufferPool()
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
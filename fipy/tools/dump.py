@@ -2,19 +2,255 @@ __docformat__ = 'restructuredtext'
 
 import cPickle
 import os
+import struct
 import sys
 import gzip
+import json
+import zlib
 
 from fipy.tools import parallelComm
+from fipy.tools import numerix
 
-__all__ = ["write", "read"]
+__all__ = ["write", "read", "readValue", "writeDistributed", "readDistributed"]
+
+# Layout of a checkpoint file, version 1:
+#
+#   _MAGIC, format version (uint32)
+#   the binary data of each array, compressed individually
+#   the pickled object graph, compressed, with the arrays replaced by
+#   references to their records in the header
+#   the header, as JSON
+#   offset and length of the header (uint64), _MAGIC
+#
+# All integers are little-endian. Keeping the header at the end lets the
+# arrays be streamed to the file as they are pickled.
+
+_MAGIC = "FIPYDUMP"
+_VERSION = 1
+_TRAILER = struct.Struct("<QQ8s")
+
+# arrays smaller than this are left inside the pickle
+_MINIMUM_RECORD_BYTES = 256
+
+def _compressors():
+    compressors = {
+        'none': (lambda data: data, lambda data: data),
+        'zlib': (lambda data: zlib.compress(data, 1), zlib.decompress)
+    }
+
+    try:
+        import lz4.frame
+        compressors['lz4'] = (lz4.frame.compress, lz4.frame.decompress)
+    except ImportError:
+        pass
+
+    return compressors
+
+class _NamedValue(object):
+    """The value of a top-level `Variable`, recorded under `name` so that
+    it can be read by `readValue()`
+    """
+    def __init__(self, value, name):
+        self.value = value
+        self.name = name
+
+def _newObject(cls, *args):
+    return cls.__new__(cls, *args)
+
+class _VariableReference(object):
+    """Pickles a top-level `Variable` with its value as a `_NamedValue`
+    """
+    def __init__(self, var, name):
+        self.var = var
+        self.name = name
+
+    def __reduce__(self):
+        reduction = self.var.__reduce_ex__(2)
+        state = reduction[2]
+        if (isinstance(state, dict)
+            and _CheckpointWriter._isRecordable(state.get('value'), name=self.name)):
+            state = state.copy()
+            state['value'] = _NamedValue(state['value'], self.name)
+        func, args = reduction[:2]
+        if getattr(func, "__name__", None) == "__newobj__":
+            # the pickler only accepts `__newobj__` for the object itself
+            func = _newObject
+        return (func, args, state) + reduction[3:]
+
+def _nameVariables(data):
+    """Replace the top-level `Variable` objects of `data`, itself or the
+    items of a `dict`, `list` or `tuple`, with `_VariableReference` objects
+    """
+    from fipy.variables.variable import Variable
+
+    if isinstance(data, Variable):
+        return _VariableReference(data, data.name or "0")
+    elif type(data) is dict:
+        return dict([(key, _VariableReference(value, str(key)) if isinstance(value, Variable) else value)
+                     for key, value in data.items()])
+    elif type(data) in (list, tuple):
+        return type(data)([_VariableReference(value, value.name or str(i)) if isinstance(value, Variable) else value
+                           for i, value in enumerate(data)])
+    else:
+        return data
+
+class _CheckpointWriter(object):
+    def __init__(self, fileStream, compression):
+        self.fileStream = fileStream
+        self.compression = compression
+        self.compressors = _compressors()
+        self.records = []
+        self.named = {}
+        self.offset = 0
+
+    def _write(self, data):
+        self.fileStream.write(data)
+        self.offset += len(data)
+
+    def _compression(self, name):
+        if isinstance(self.compression, dict):
+            method = self.compression.get(name, self.compression.get(None, 'zlib'))
+        else:
+            method = self.compression
+        if method not in self.compressors:
+            if method == 'lz4':
+                # lz4 is optional
+                method = 'zlib'
+            else:
+                raise ValueError("Unknown compression '%s'" % method)
+        return method
+
+    def _writeBlob(self, data, name=None):
+        method = self._compression(name)
+        data = self.compressors[method][0](data)
+        record = dict(offset=self.offset, nbytes=len(data), compression=method)
+        self._write(data)
+        return record
+
+    def _writeArray(self, arr, name=None):
+        if arr.flags.f_contiguous and not arr.flags.c_contiguous:
+            order = 'F'
+        else:
+            order = 'C'
+        record = self._writeBlob(arr.tostring(order=order), name=name)
+        record.update(dtype=arr.dtype.str, shape=list(arr.shape), order=order)
+        self.records.append(record)
+        return len(self.records) - 1
+
+    @staticmethod
+    def _isRecordable(arr, name=None):
+        return (type(arr) in (numerix.ndarray, numerix.MA.MaskedArray)
+                and not arr.dtype.hasobject
+                and arr.dtype.fields is None
+                and (name is not None or arr.nbytes >= _MINIMUM_RECORD_BYTES))
+
+    def persistent_id(self, obj):
+        name = None
+        if isinstance(obj, _NamedValue):
+            name = obj.name
+            obj = obj.value
+        elif not self._isRecordable(obj):
+            return None
+
+        if type(obj) is numerix.MA.MaskedArray:
+            index = self._writeArray(numerix.MA.getdata(obj), name=name)
+            self.records[index]['mask'] = self._writeArray(numerix.MA.getmaskarray(obj), name=name)
+            self.records[index]['fill_value'] = obj.fill_value.item()
+        else:
+            index = self._writeArray(obj, name=name)
+
+        if name is not None:
+            self.named[name] = index
+
+        return str(index)
+
+    def dump(self, data):
+        self._write(_MAGIC + struct.pack("<I", _VERSION))
+
+        import StringIO
+        graph = StringIO.StringIO()
+        pickler = cPickle.Pickler(graph, 2)
+        pickler.persistent_id = self.persistent_id
+        pickler.dump(_nameVariables(data))
+        pickle = self._writeBlob(graph.getvalue())
+
+        header = json.dumps(dict(version=_VERSION,
+                                 arrays=self.records,
+                                 values=self.named,
+                                 pickle=pickle))
+        offset = self.offset
+        self._write(header)
+        self._write(_TRAILER.pack(offset, len(header), _MAGIC))
+
+class _CheckpointReader(object):
+    def __init__(self, fileStream):
+        self.fileStream = fileStream
+        self.compressors = _compressors()
+
+        fileStream.seek(0)
+        magic, version = struct.unpack("<8sI", fileStream.read(12))
+        if magic != _MAGIC:
+            raise IOError("Not a FiPy checkpoint")
+        if version > _VERSION:
+            raise IOError("Checkpoint format version %d is newer than %d" % (version, _VERSION))
+
+        fileStream.seek(-_TRAILER.size, os.SEEK_END)
+        offset, length, magic = _TRAILER.unpack(fileStream.read(_TRAILER.size))
+        if magic != _MAGIC:
+            raise IOError("Truncated FiPy checkpoint")
+        fileStream.seek(offset)
+        self.header = json.loads(fileStream.read(length))
+
+    def _readBlob(self, record):
+        if record['compression'] not in self.compressors:
+            raise ImportError("Reading this checkpoint requires '%s'" % record['compression'])
+        self.fileStream.seek(record['offset'])
+        data = self.fileStream.read(record['nbytes'])
+        return self.compressors[record['compression']][1](data)
+
+    def _readArray(self, index):
+        record = self.header['arrays'][index]
+        arr = numerix.frombuffer(bytearray(self._readBlob(record)), dtype=numerix.dtype(str(record['dtype'])))
+        arr = arr.reshape(record['shape'], order=record['order'])
+        if 'mask' in record:
+            arr = numerix.MA.array(arr, mask=self._readArray(record['mask']),
+                                   fill_value=record['fill_value'])
+        return arr
+
+    def persistent_load(self, index):
+        return self._readArray(int(index))
+
+    def load(self, find_global=None):
+        import StringIO
+        unpickler = cPickle.Unpickler(StringIO.StringIO(self._readBlob(self.header['pickle'])))
+        unpickler.persistent_load = self.persistent_load
+        if find_global is not None:
+            unpickler.find_global = find_global
+        return unpickler.load()
+
+    def value(self, name):
+        if name not in self.header['values']:
+            raise KeyError(str("No value named '%s' in checkpoint; found %s"
+                               % (name, ", ".join(sorted(self.header['values'].keys())))))
+        return self._readArray(self.header['values'][name])
+
+def _isCheckpoint(fileStream):
+    magic = fileStream.read(len(_MAGIC))
+    fileStream.seek(0)
+    return magic == _MAGIC
 
 # TODO: add test to show that round trip pickle of mesh doesn't work properly
 # FIXME: pickle fails to work properly on numpy 1.1 (run gapFillMesh.py)
-def write(data, filename = None, extension = '', communicator=parallelComm):
+def write(data, filename = None, extension = '', communicator=parallelComm, compression='zlib', format='binary'):
     """
-    Pickle an object and write it to a file. Wrapper for
-    `cPickle.dump()`.
+    Pickle an object and write it to a file.
+
+    By default, the object is written in a binary checkpoint format: the
+    object graph is pickled with `cPickle`, but arrays (like the values of
+    variables and the topology of meshes) are stored outside the pickle,
+    as raw, individually compressed, binary data. The values of the
+    `Variable` objects at the top level of `data` can then be read with
+    `readValue()` without unpickling anything else.
 
     :Parameters:
       - `data`: The object to be pickled.
@@ -22,6 +258,12 @@ def write(data, filename = None, extension = '', communicator=parallelComm):
         then a temporary file will be used and the file object and file name will be returned as a tuple
       - `extension`: Used if filename is not given.
       - `communicator`: Object with `procID` and `Nproc` attributes.
+      - `compression`: How to compress the arrays: 'none', 'zlib', or
+        'lz4' (if the `lz4` package can be imported, otherwise 'zlib').
+        A `dict` chooses the compression of the value of each named
+        `Variable`, with the key `None` for everything else.
+      - `format`: 'binary' for the checkpoint format or 'pickle' for
+        the gzipped, ASCII pickle written by older versions of FiPy.
 
     Test to check pickling and unpickling.
 
@@ -32,39 +274,79 @@ def write(data, filename = None, extension = '', communicator=parallelComm):
         >>> print old.numberOfCells == new.numberOfCells
         True
 
+    Variables, and the mesh they share, survive the round trip
+
+        >>> from fipy import CellVariable, Grid2D
+        >>> mesh = Grid2D(nx=30, ny=20)
+        >>> phi = CellVariable(mesh=mesh, name="phi", value=mesh.x * mesh.y, hasOld=True)
+        >>> psi = CellVariable(mesh=mesh, name="psi", value=-mesh.x)
+        >>> f, tempfile = write({'phi': phi, 'psi': psi, 'time': 1.5},
+        ...                     compression={'psi': 'none', None: 'zlib'})
+        >>> data = read(tempfile)
+        >>> print numerix.allequal(data['phi'], phi), numerix.allequal(data['psi'], psi)
+        True True
+        >>> print data['phi'].mesh is data['psi'].mesh, data['time']
+        True 1.5
+        >>> print data['phi'].old is not None
+        True
+
+    A single value can be read without unpickling the rest
+
+        >>> print numerix.allequal(readValue(tempfile, 'psi'), psi.value)
+        True
+        >>> readValue(tempfile, 'chi')
+        Traceback (most recent call last):
+            ...
+        KeyError: "No value named 'chi' in checkpoint; found phi, psi"
+        >>> os.close(f)
+        >>> os.remove(tempfile)
+
+    The older format can still be written and read
+
+        >>> f, tempfile = write(phi, format='pickle')
+        >>> print numerix.allequal(read(tempfile, f), phi)
+        True
+
     """
+    if format not in ('binary', 'pickle'):
+        raise ValueError("Unknown format '%s'" % format)
+
     if communicator.procID == 0:
         if filename is None:
             import tempfile
             (f, _filename) =  tempfile.mkstemp(extension)
         else:
             (f, _filename) = (None, filename)
-        fileStream = gzip.GzipFile(filename = _filename, mode = 'w', fileobj = None)
+        if format == 'pickle':
+            fileStream = gzip.GzipFile(filename = _filename, mode = 'w', fileobj = None)
+        else:
+            fileStream = open(_filename, mode='wb')
     else:
         fileStream = open(os.devnull, mode='w')
         (f, _filename) = (None, os.devnull)
 
-    cPickle.dump(data, fileStream, 0)
+    if format == 'pickle':
+        cPickle.dump(data, fileStream, 0)
+    else:
+        # every processor pickles, so that collective operations match
+        _CheckpointWriter(fileStream, compression=compression).dump(data)
     fileStream.close()
 
     if filename is None:
         return (f, _filename)
 
-def read(filename, fileobject=None, communicator=parallelComm, mesh_unmangle=False):
-    """
-    Read a pickled object from a file. Returns the unpickled object.
-    Wrapper for `cPickle.load()`.
-
-    :Parameters:
-      - `filename`: The name of the file to unpickle the object from.
-      - `fileobject`: Used to remove temporary files
-      - `communicator`: Object with `procID` and `Nproc` attributes.
-      - `mesh_unmangle`: Correct improper pickling of non-uniform meshes (ticket:243)
-
+def _readBytes(filename, fileobject, communicator):
+    """Read the contents of `filename` on the first processor and share
+    them with the others
     """
     if communicator.procID == 0:
-        fileStream = gzip.GzipFile(filename = filename, mode = 'r', fileobj = None)
-        data = fileStream.read()
+        fileStream = open(filename, mode='rb')
+        if _isCheckpoint(fileStream):
+            data = fileStream.read()
+        else:
+            fileStream.close()
+            fileStream = gzip.GzipFile(filename = filename, mode = 'r', fileobj = None)
+            data = fileStream.read()
         fileStream.close()
         if fileobject is not None:
             os.close(fileobject)
@@ -77,12 +359,56 @@ def read(filename, fileobject=None, communicator=parallelComm, mesh_unmangle=Fal
 
     if sys.version_info < (3,0):
         import StringIO
-        f = StringIO.StringIO(data)
+        return StringIO.StringIO(data)
     else:
         import io
-        f = io.BytesIO(data)
+        return io.BytesIO(data)
 
-    unpickler = cPickle.Unpickler(f)
+def readValue(filename, name, communicator=parallelComm):
+    """
+    Read the value of the top-level `Variable` called `name` from a file
+    written by `write()` in the binary checkpoint format, without
+    unpickling anything else.
+
+    :Parameters:
+      - `filename`: The name of the file.
+      - `name`: The name of the `Variable` or, if `write()` was given a
+        `dict`, `list` or `tuple`, its key or index.
+      - `communicator`: Object with `procID` and `Nproc` attributes.
+
+    """
+    if communicator.procID == 0:
+        fileStream = open(filename, mode='rb')
+        try:
+            value = _CheckpointReader(fileStream).value(name)
+        finally:
+            fileStream.close()
+    else:
+        value = None
+
+    if communicator.Nproc > 1:
+        value = communicator.bcast(value, root=0)
+
+    return value
+
+def read(filename, fileobject=None, communicator=parallelComm, mesh_unmangle=False):
+    """
+    Read a pickled object from a file, in either of the formats written
+    by `write()`. Returns the unpickled object.
+
+    :Parameters:
+      - `filename`: The name of the file to unpickle the object from.
+      - `fileobject`: Used to remove temporary files
+      - `communicator`: Object with `procID` and `Nproc` attributes.
+      - `mesh_unmangle`: Correct improper pickling of non-uniform meshes (ticket:243)
+
+    """
+    f = _readBytes(filename, fileobject, communicator)
+
+    if _isCheckpoint(f):
+        reader = _CheckpointReader(f)
+    else:
+        reader = cPickle.Unpickler(f)
 
     if mesh_unmangle:
         def find_class(module, name):
@@ -110,9 +436,203 @@ def read(filename, fileobject=None, communicator=parallelComm, mesh_unmangle=Fal
             else:
                 return klass
 
-        unpickler.find_global = find_class
+    else:
+        find_class = None
+
+    if isinstance(reader, _CheckpointReader):
+        return reader.load(find_global=find_class)
+    else:
+        if find_class is not None:
+            reader.find_global = find_class
+        return reader.load()
+
+def _pieceName(filename, procID):
+    return "%s.%d" % (filename, procID)
+
+def writeDistributed(data, filename, communicator=parallelComm, compression='zlib'):
+    """
+    Write a checkpoint of a parallel run, without gathering the values of
+    the variables on one processor.
+
+    Each processor writes the values of its own cells of each `CellVariable`
+    (the ones it solves for, `mesh._localNonOverlappingCellIDs`), with their
+    global IDs, to its own file, `filename.<procID>`. The first processor
+    also writes `filename`, with the mesh, the number of pieces and
+    everything in `data` that is not a `CellVariable`. Both are in the
+    binary checkpoint format of `write()`.
+
+    :Parameters:
+      - `data`: A `dict` of the objects to write. Its `CellVariable` objects
+        must share a mesh.
+      - `filename`: The name of the checkpoint.
+      - `communicator`: Object with `procID` and `Nproc` attributes.
+      - `compression`: How to compress the arrays, as for `write()`.
+
+    A checkpoint written by three processors
+
+        >>> from fipy import Grid1D, CellVariable
+        >>> class _Comm(object):
+        ...     def __init__(self, procID, Nproc):
+        ...         self.procID = procID
+        ...         self.Nproc = Nproc
+        ...     def Barrier(self):
+        ...         pass
+        >>> import tempfile
+        >>> filename = os.path.join(tempfile.mkdtemp(), "checkpoint")
+        >>> for procID in range(3):
+        ...     comm = _Comm(procID, 3)
+        ...     mesh = Grid1D(nx=10, communicator=comm)
+        ...     phi = CellVariable(mesh=mesh, value=mesh.x**2, hasOld=True)
+        ...     phi.updateOld()
+        ...     phi.value = mesh.x**3
+        ...     writeDistributed({'phi': phi, 'time': 3.},
+        ...                      filename=filename, communicator=comm)
+
+    can be read by two
+
+        >>> for procID in range(2):
+        ...     comm = _Comm(procID, 2)
+        ...     mesh = Grid1D(nx=10, communicator=comm)
+        ...     data = readDistributed(filename, mesh=mesh, communicator=comm)
+        ...     phi = data['phi']
+        ...     print data['time'], numerix.allclose(phi.value, mesh.x.value**3),
+        ...     print numerix.allclose(phi.old.value, mesh.x.value**2)
+        3.0 True True
+        3.0 True True
+
+    or by one, with the mesh from the checkpoint
+
+        >>> data = readDistributed(filename)
+        >>> print data['phi'].mesh.numberOfCells
+        10
+        >>> print numerix.allclose(data['phi'], data['phi'].mesh.x**3)
+        True
+
+        >>> import shutil
+        >>> shutil.rmtree(os.path.dirname(filename))
+
+    """
+    from fipy.variables.cellVariable import CellVariable
+
+    variables = {}
+    mesh = None
+    for key, value in data.items():
+        if isinstance(value, CellVariable):
+            if mesh is None:
+                mesh = value.mesh
+            elif value.mesh is not mesh:
+                raise ValueError("The CellVariables of a distributed checkpoint must share a mesh")
+            variables[key] = value
+
+    if mesh is None:
+        raise ValueError("A distributed checkpoint needs at least one CellVariable")
+
+    localIDs = mesh._localNonOverlappingCellIDs
+    globalIDs = numerix.asarray(mesh._globalNonOverlappingCellIDs)
+
+    piece = {'cellIDs': _NamedValue(globalIDs, 'cellIDs')}
+    for key, var in variables.items():
+        value = numerix.array(var.value)
+        piece[key] = _NamedValue(value[..., localIDs], str(key))
+        if var._old is not None:
+            old = numerix.array(var._old.value)
+            piece['old:' + key] = _NamedValue(old[..., localIDs], 'old:' + str(key))
+
+    fileStream = open(_pieceName(filename, communicator.procID), mode='wb')
+    _CheckpointWriter(fileStream, compression=compression).dump(piece)
+    fileStream.close()
+
+    if communicator.procID == 0:
+        manifest = dict([(key, item) for key, item in data.items() if key not in variables])
+        manifest['_distributed'] = dict(
+            pieces=communicator.Nproc,
+            globalNumberOfCells=mesh.globalNumberOfCells,
+            mesh=mesh,
+            variables=dict([(key, (var.__class__, var.name, var.unit, var._old is not None))
+                            for key, var in variables.items()]))
+
+        fileStream = open(filename, mode='wb')
+        _CheckpointWriter(fileStream, compression=compression).dump(manifest)
+        fileStream.close()
+
+    communicator.Barrier()
+
+def readDistributed(filename, mesh=None, communicator=parallelComm):
+    """
+    Read a checkpoint written by `writeDistributed()`, possibly by a
+    different number of processors. Returns a `dict` like the one that
+    was written.
+
+    Every processor reads the files itself, so they must be on a file
+    system shared by all of them. Each reads only the values of its own
+    cells (including ghost cells), from the pieces that hold any of them.
+
+    :Parameters:
+      - `filename`: The name of the checkpoint.
+      - `mesh`: The mesh of the `CellVariable` objects. If `None`, the
+        mesh in the checkpoint is unpickled; `Grid` meshes are then
+        partitioned anew for `communicator`, but other meshes are only
+        restored as the part that belonged to the first processor.
+      - `communicator`: Object with `procID` and `Nproc` attributes.
+
+    """
+    fileStream = open(filename, mode='rb')
+    try:
+        data = _CheckpointReader(fileStream).load()
+    finally:
+        fileStream.close()
+
+    manifest = data.pop('_distributed')
+    if mesh is None:
+        mesh = manifest['mesh']
+
+    if mesh.globalNumberOfCells != manifest['globalNumberOfCells']:
+        raise ValueError("The checkpoint has %d cells, but the mesh has %d"
+                         % (manifest['globalNumberOfCells'], mesh.globalNumberOfCells))
+
+    wanted = numerix.asarray(mesh._globalOverlappingCellIDs)
+    order = numerix.argsort(wanted)
+    wanted = wanted[order]
+
+    values = {}
+    found = numerix.zeros(wanted.shape, dtype=bool)
+    for procID in range(manifest['pieces']):
+        fileStream = open(_pieceName(filename, procID), mode='rb')
+        try:
+            reader = _CheckpointReader(fileStream)
+            cellIDs = reader.value('cellIDs')
+            if len(cellIDs) == 0 or len(wanted) == 0:
+                continue
+            positions = numerix.searchsorted(wanted, cellIDs).clip(max=len(wanted) - 1)
+            hits = wanted[positions] == cellIDs
+            if not hits.any():
+                continue
+            positions = positions[hits]
+            found[positions] = True
+            for key in reader.header['values']:
+                if key == 'cellIDs':
+                    continue
+                value = reader.value(key)
+                if key not in values:
+                    values[key] = numerix.zeros(value.shape[:-1] + wanted.shape, dtype=value.dtype)
+                values[key][..., positions] = value[..., hits]
+        finally:
+            fileStream.close()
+
+    if not found.all():
+        raise IOError("The checkpoint does not hold all the cells of the mesh")
+
+    for key, (cls, name, unit, hasOld) in manifest['variables'].items():
+        value = numerix.empty_like(values[key])
+        value[..., order] = values[key]
+        var = cls(mesh=mesh, name=name, value=value, unit=unit, hasOld=hasOld)
+        if hasOld:
+            old = numerix.empty_like(values['old:' + key])
+            old[..., order] = values['old:' + key]
+            var._old.value = old
+        data[key] = var
 
-    return unpickler.load()
+    return data
 
 def _test():
     import fipy.tests.doctestPlus
@@ -0,0 +1,338 @@
+"""Fused evaluation of `_OperatorVariable` expression trees.
+
+Without fusion, every node of an expression such as ``D * phi.faceGrad``
+allocates a full-size temporary for its result each time the expression
+is evaluated. When fusion is enabled, an `_OperatorVariable` instead
+collects the uncached, element-wise nodes below it into a single
+expression string, e.g. ``((a0 * a1) + numerix.sin(a2))``, and evaluates
+that string with a kernel that is generated once for each distinct
+expression (and shape and type of its arguments) and then reused:
+
+- the ``"numpy"`` engine (the default) emits one NumPy ufunc call per
+  node, with the result written into scratch buffers that are allocated
+  once per kernel and recycled between nodes, so that an evaluation
+  allocates only its final result;
+- the ``"numexpr"`` engine hands the whole expression to `numexpr`, if
+  it can be imported, which evaluates it in a single blocked pass.
+
+Fusion is enabled by passing ``--fuse`` on the command line or by
+setting the ``FIPY_FUSE`` environment variable. ``FIPY_FUSE=numexpr``
+selects the `numexpr` engine. Any expression the kernel generator does
+not understand is evaluated node by node, as usual.
+
+    >>> from fipy.tools import numerix
+    >>> a0 = numerix.array((1., 2., 3.))
+    >>> a1 = numerix.array(((1., 2., 3.), (4., 5., 6.)))
+    >>> kernel = _getKernel("((a0 * a1) + numerix.sin(a0))", [a0, a1], engine="numpy")
+    >>> print numerix.allclose(kernel(a0, a1), a0 * a1 + numerix.sin(a0))
+    True
+
+Kernels are cached by expression and by the shapes and types of the
+arguments
+
+    >>> kernel is _getKernel("((a0 * a1) + numerix.sin(a0))", [a0, a1], engine="numpy")
+    True
+    >>> kernel is _getKernel("((a0 * a1) + numerix.sin(a0))", [a0, a1[0]], engine="numpy")
+    False
+
+Intermediate results of matching shape and type are computed in place
+
+    >>> print kernel.source # doctest: +NORMALIZE_WHITESPACE
+    def kernel(a0, a1, _out=None):
+        _s0 = _f0(a0, a1, out=_scratch[0])
+        _s1 = _f1(a0, out=_scratch[1])
+        _s0 = _f2(_s0, _s1, out=_empty(_shape, _dtype) if _out is None else _out)
+        return _s0
+
+The final result is allocated anew, unless an array of the kernel's
+`shape` and `dtype` is passed to write it into
+
+    >>> out = numerix.empty(kernel.shape, kernel.dtype)
+    >>> kernel(a0, a1, _out=out) is out
+    True
+
+Expressions that cannot be fused are reported as such
+
+    >>> print _getKernel("numerix.dot(a0, a0)", [a0], engine="numpy")
+    None
+"""
+__docformat__ = 'restructuredtext'
+
+__all__ = ["doFusion"]
+
+import ast
+import os
+import sys
+
+from fipy.tools import numerix
+
+if '--fuse' in [s.lower() for s in sys.argv[1:]]:
+    doFusion = True
+else:
+    doFusion = 'FIPY_FUSE' in os.environ
+
+if os.environ.get('FIPY_FUSE', '').lower() == 'numexpr':
+    _engine = "numexpr"
+else:
+    _engine = "numpy"
+
+class _UnfusableError(Exception):
+    pass
+
+if sys.version_info[0] < 3:
+    _divide = numerix.divide
+else:
+    _divide = numerix.true_divide
+
+_binops = {
+    ast.Add: numerix.add,
+    ast.Sub: numerix.subtract,
+    ast.Mult: numerix.multiply,
+    ast.Div: _divide,
+    ast.FloorDiv: numerix.floor_divide,
+    ast.Mod: numerix.remainder,
+    ast.Pow: numerix.power,
+    ast.LShift: numerix.left_shift,
+    ast.RShift: numerix.right_shift,
+    ast.BitAnd: numerix.bitwise_and,
+    ast.BitOr: numerix.bitwise_or,
+    ast.BitXor: numerix.bitwise_xor
+}
+
+_unops = {
+    ast.USub: numerix.negative,
+    ast.UAdd: numerix.positive,
+    ast.Invert: numerix.invert
+}
+
+_compareops = {
+    ast.Lt: numerix.less,
+    ast.LtE: numerix.less_equal,
+    ast.Gt: numerix.greater,
+    ast.GtE: numerix.greater_equal,
+    ast.Eq: numerix.equal,
+    ast.NotEq: numerix.not_equal
+}
+
+# ndarray.__pow__ special cases these exponents for inexact arrays
+_fastPowers = {
+    2: numerix.square,
+    0.5: numerix.sqrt,
+    -1: numerix.reciprocal
+}
+
+class _KernelBuilder(object):
+    """Translate an expression into a sequence of ufunc calls.
+
+    The expression is evaluated once, node by node, with the sample
+    `leaves`. The shape and type of each intermediate result determine
+    which scratch buffer it is written to.
+    """
+    def __init__(self, leaves):
+        self.leaves = leaves
+        self.functions = []
+        self.scratch = []
+        self.free = []
+        self.lines = []
+
+    def _function(self, fn):
+        for i, f in enumerate(self.functions):
+            if f is fn:
+                return "_f%d" % i
+        self.functions.append(fn)
+        return "_f%d" % (len(self.functions) - 1)
+
+    def _slot(self, value, operands):
+        """Pick a scratch buffer for `value`, preferring one of `operands`
+        """
+        slot = None
+        for ref, val, s in operands:
+            if s is not None:
+                if (slot is None
+                    and val.shape == value.shape
+                    and val.dtype == value.dtype):
+                    slot = s
+                else:
+                    self.free.append(s)
+
+        if slot is None:
+            for s in self.free:
+                buf = self.scratch[s]
+                if buf.shape == value.shape and buf.dtype == value.dtype:
+                    slot = s
+                    self.free.remove(s)
+                    break
+
+        if slot is None:
+            self.scratch.append(numerix.empty(value.shape, value.dtype))
+            slot = len(self.scratch) - 1
+
+        return slot
+
+    def _apply(self, fn, operands, root):
+        value = fn(*[val for ref, val, s in operands])
+        args = ", ".join([ref for ref, val, s in operands])
+        name = self._function(fn)
+
+        if not isinstance(value, numerix.ndarray) or value.shape == ():
+            # nothing to be gained by buffering scalars
+            for ref, val, s in operands:
+                if s is not None:
+                    self.free.append(s)
+            return ("%s(%s)" % (name, args), value, None)
+
+        slot = self._slot(value, operands)
+        if root:
+            self.shape = value.shape
+            self.dtype = value.dtype
+            out = "_empty(_shape, _dtype) if _out is None else _out"
+        else:
+            out = "_scratch[%d]" % slot
+        self.lines.append("_s%d = %s(%s, out=%s)" % (slot, name, args, out))
+
+        return ("_s%d" % slot, value, slot)
+
+    def visit(self, node, root=False):
+        if isinstance(node, ast.Name):
+            if not node.id.startswith("a"):
+                raise _UnfusableError(node.id)
+            try:
+                value = self.leaves[int(node.id[1:])]
+            except (ValueError, IndexError):
+                raise _UnfusableError(node.id)
+            return (node.id, value, None)
+        elif isinstance(node, ast.Num):
+            return (repr(node.n), node.n, None)
+        elif isinstance(node, ast.BinOp) and type(node.op) in _binops:
+            operands = [self.visit(node.left), self.visit(node.right)]
+            fn = _binops[type(node.op)]
+            if (fn is numerix.power
+                and isinstance(node.right, ast.Num)
+                and node.right.n in _fastPowers
+                and numerix.asarray(operands[0][1]).dtype.kind in 'fc'):
+                fn = _fastPowers[node.right.n]
+                operands = operands[:1]
+            return self._apply(fn, operands, root)
+        elif isinstance(node, ast.UnaryOp) and type(node.op) in _unops:
+            return self._apply(_unops[type(node.op)], [self.visit(node.operand)], root)
+        elif (isinstance(node, ast.Compare)
+              and len(node.ops) == 1
+              and type(node.ops[0]) in _compareops):
+            operands = [self.visit(node.left), self.visit(node.comparators[0])]
+            return self._apply(_compareops[type(node.ops[0])], operands, root)
+        elif (isinstance(node, ast.Call)
+              and isinstance(node.func, ast.Attribute)
+              and isinstance(node.func.value, ast.Name)
+              and node.func.value.id == "numerix"
+              and not node.keywords
+              and not getattr(node, "starargs", None)
+              and not getattr(node, "kwargs", None)):
+            fn = getattr(numerix, node.func.attr, None)
+            if not isinstance(fn, numerix.ufunc) or fn.nout != 1:
+                raise _UnfusableError(node.func.attr)
+            return self._apply(fn, [self.visit(arg) for arg in node.args], root)
+        else:
+            raise _UnfusableError(ast.dump(node))
+
+    def build(self, expression):
+        tree = ast.parse(expression, mode='eval')
+        ref, value, slot = self.visit(tree.body, root=True)
+        if slot is None:
+            raise _UnfusableError(expression)
+
+        names = ["a%d" % i for i in range(len(self.leaves))]
+        source = "def kernel(%s):\n" % ", ".join(names + ["_out=None"])
+        for line in self.lines:
+            source += "    %s\n" % line
+        source += "    return %s\n" % ref
+
+        namespace = dict([("_f%d" % i, fn) for i, fn in enumerate(self.functions)])
+        namespace.update(_scratch=self.scratch,
+                         _empty=numerix.empty,
+                         _shape=self.shape,
+                         _dtype=self.dtype)
+        exec compile(source, "<fused %s>" % expression, "exec") in namespace
+
+        kernel = namespace["kernel"]
+        kernel.source = source
+        kernel.expression = expression
+        kernel.shape = self.shape
+        kernel.dtype = self.dtype
+
+        return kernel
+
+def _numexprKernel(expression, leaves):
+    try:
+        import numexpr
+    except ImportError:
+        raise _UnfusableError("numexpr")
+
+    for leaf in leaves:
+        if numerix.asarray(leaf).dtype.kind not in 'fc':
+            # numexpr's integer division does not follow NumPy's
+            raise _UnfusableError("numexpr")
+
+    stripped = expression.replace("numerix.", "")
+    names = ["a%d" % i for i in range(len(leaves))]
+    try:
+        value = numexpr.evaluate(stripped, local_dict=dict(zip(names, leaves)))
+    except (KeyError, TypeError, ValueError, NotImplementedError, SyntaxError):
+        raise _UnfusableError(stripped)
+
+    def kernel(*args, **kwargs):
+        return numexpr.evaluate(stripped, local_dict=dict(zip(names, args)),
+                                out=kwargs.get("_out"))
+
+    kernel.source = stripped
+    kernel.expression = expression
+    kernel.shape = value.shape
+    kernel.dtype = value.dtype
+
+    return kernel
+
+_kernels = {}
+
+def _leafSignature(leaf):
+    if type(leaf) in (int, float, bool):
+        return (type(leaf).__name__,)
+    elif type(leaf) is numerix.ndarray or isinstance(leaf, numerix.generic):
+        return (leaf.shape, leaf.dtype.str)
+    else:
+        # masked arrays, physical fields, ...
+        raise _UnfusableError(type(leaf).__name__)
+
+def _getKernel(expression, leaves, engine=None):
+    """Return the kernel that evaluates `expression` for arguments like `leaves`
+
+    :Returns:
+      A function of the leaves or `None` if the expression cannot be fused.
+    """
+    engine = engine or _engine
+
+    try:
+        key = (engine, expression) + tuple([_leafSignature(leaf) for leaf in leaves])
+    except _UnfusableError:
+        return None
+
+    if key not in _kernels:
+        kernel = None
+        if engine == "numexpr":
+            try:
+                kernel = _numexprKernel(expression, leaves)
+            except _UnfusableError:
+                pass
+        if kernel is None:
+            try:
+                kernel = _KernelBuilder(leaves).build(expression)
+            except (_UnfusableError, SyntaxError):
+                pass
+        _kernels[key] = kernel
+
+    return _kernels[key]
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -56,6 +56,19 @@ elif arch == '64bit':
 else:
     raise Exception('Cannot set integer dtype because architecture is unknown.')
 
+# Mesh geometry, `MeshVariable` storage and assembled SciPy matrices are
+# floating point arrays of `FLOAT_DTYPE`. Single precision, selected with
+# `--single` or `FIPY_PRECISION=single`, halves the memory traffic of
+# calculations that are limited by memory bandwidth.
+
+import os
+import sys
+if ('--single' in [s.lower() for s in sys.argv[1:]]
+    or os.environ.get('FIPY_PRECISION', '').lower() == 'single'):
+    FLOAT_DTYPE = NUMERIX.float32
+else:
+    FLOAT_DTYPE = NUMERIX.float64
+
 from numpy.core import umath
 from numpy import newaxis as NewAxis
 from numpy import *
@@ -0,0 +1,264 @@
+r"""Profiling of the evaluation of `Variable` objects.
+
+The values of `Variable` objects are calculated implicitly, whenever
+they are needed, so an ordinary profile of a slow script attributes the
+time to `_calcValue` without saying which `_OperatorVariable`, face
+interpolation or gradient is responsible. While a `VariableProfiler` is
+active, each evaluation of a `Variable` is recorded with
+
+- the number of times the `Variable` was evaluated,
+- the cumulative time of those evaluations, including the evaluation of
+  the `Variable` objects it requires,
+- the time spent in the `Variable` itself, excluding them,
+- the cumulative number of bytes of the values it produced,
+
+together with the line of the script that created it, if it was created
+while a profiler was active.
+
+    >>> from fipy import Variable
+    >>> from fipy.tools import fusion
+    >>> fusion.doFusion, doFusion = False, fusion.doFusion
+    >>> with VariableProfiler() as profiler:
+    ...     a = Variable(value=(1., 2., 3.), name="a")
+    ...     b = (a * 2) + 1
+    ...     b.cacheMe()
+    ...     print b
+    ...     a.value = (2., 3., 4.)
+    ...     print b
+    [ 3.  5.  7.]
+    [ 5.  7.  9.]
+    >>> for record in profiler.sortedRecords(key="label"):
+    ...     print record.label, record.calls, record.bytes, record.source # doctest: +ELLIPSIS
+    ((a * 2) + 1) 2 48 <doctest ...>:3
+    (a * 2) 2 48 <doctest ...>:3
+
+Evaluations after the profiler is closed are not recorded
+
+    >>> print b
+    [ 5.  7.  9.]
+    >>> print profiler.records[id(b)].calls
+    2
+
+The records can be reported as a table, sorted by cumulative time by
+default, or exported as a graph in the DOT language of Graphviz, with an
+edge from each `Variable` to the ones that require it
+
+    >>> print profiler.report(sort="calls").splitlines()[0]
+       calls    total (s)     self (s)        bytes  variable
+    >>> print profiler.toDot() # doctest: +ELLIPSIS
+    digraph variables {
+        n0 [label="(a * 2)\n2 calls, ... s"];
+        n1 [label="((a * 2) + 1)\n2 calls, ... s"];
+        n0 -> n1;
+    }
+    >>> fusion.doFusion = doFusion
+
+Passing ``--profile-variables`` on the command line or setting the
+``FIPY_PROFILE_VARIABLES`` environment variable profiles the whole
+script and prints the table to `stderr` when it exits.
+
+Nodes that are evaluated together by a fused kernel (see
+`fipy.tools.fusion`) or by ``--inline`` are recorded as one evaluation
+of the `Variable` at their root.
+"""
+__docformat__ = 'restructuredtext'
+
+__all__ = ["VariableProfiler"]
+
+import os
+import sys
+import weakref
+from timeit import default_timer
+
+from fipy.tools import numerix
+
+_profilers = []
+_nested = []
+
+_fipyDirectory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _isFiPy(filename):
+    return (not filename.startswith("<")
+            and os.path.abspath(filename).startswith(_fipyDirectory + os.sep))
+
+def _creationSite():
+    """The file and line outside of FiPy that is being executed"""
+    frame = sys._getframe(1)
+    while frame is not None and _isFiPy(frame.f_code.co_filename):
+        frame = frame.f_back
+
+    if frame is None:
+        return None
+    else:
+        return "%s:%d" % (frame.f_code.co_filename, frame.f_lineno)
+
+def _label(var, width=60):
+    """A short description of `var`"""
+    from fipy.variables.constant import _Constant
+
+    # the `name` of an `_OperatorVariable` falls back to a representation
+    # that spells out its `_Constant` operands, so only honor a given name
+    if var._name:
+        label = var._name
+    elif isinstance(var, _Constant) and numerix.size(var.value) == 1:
+        label = repr(var)
+    elif getattr(var, "_fusedTemplate", None) is not None:
+        label = var._fusedTemplate.format(*[_label(v, width=width) for v in var.var])
+    elif var.name:
+        label = var.name
+    else:
+        label = var.__class__.__name__.lstrip("_")
+
+    if len(label) > width:
+        label = label[:width - 3] + "..."
+
+    return label
+
+def _evaluate(var):
+    """Calculate the value of `var`, recording the evaluation with the
+    active profilers
+    """
+    nested = [0.]
+    _nested.append(nested)
+    start = default_timer()
+    try:
+        value = var._calcValue()
+    finally:
+        elapsed = default_timer() - start
+        _nested.pop()
+        if _nested:
+            _nested[-1][0] += elapsed
+
+    if hasattr(value, "numericValue"):
+        nbytes = getattr(value.numericValue, "nbytes", 0)
+    else:
+        nbytes = getattr(value, "nbytes", 0)
+
+    for profiler in _profilers:
+        profiler._record(var, elapsed, elapsed - nested[0], nbytes)
+
+    return value
+
+class _VariableRecord(object):
+    """The evaluations of one `Variable`"""
+    def __init__(self, var, index):
+        self.index = index
+        self.ref = weakref.ref(var)
+        self.label = _label(var)
+        self.source = getattr(var, "_source", None)
+        self.calls = 0
+        self.time = 0.
+        self.selfTime = 0.
+        self.bytes = 0
+
+class VariableProfiler(object):
+    """Record the evaluations of `Variable` objects while active.
+
+    Profilers are activated with a ``with`` statement, or with `start`
+    and `stop`. The records are kept in `records`, keyed by the `id` of
+    each `Variable`.
+    """
+    _sortKeys = {
+        "time": lambda r: -r.time,
+        "self": lambda r: -r.selfTime,
+        "calls": lambda r: -r.calls,
+        "bytes": lambda r: -r.bytes,
+        "label": lambda r: r.label
+    }
+
+    def __init__(self):
+        self.records = {}
+        self._retired = []
+
+    def start(self):
+        if self not in _profilers:
+            _profilers.append(self)
+
+    def stop(self):
+        if self in _profilers:
+            _profilers.remove(self)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _record(self, var, elapsed, selfElapsed, nbytes):
+        record = self.records.get(id(var))
+        if record is None or record.ref() is not var:
+            if record is not None:
+                # the `id` of a deleted `Variable` has been reused
+                self._retired.append(record)
+            record = _VariableRecord(var, index=len(self.records) + len(self._retired))
+            self.records[id(var)] = record
+
+        record.calls += 1
+        record.time += elapsed
+        record.selfTime += selfElapsed
+        record.bytes += nbytes
+
+    def sortedRecords(self, key="time"):
+        """The records of all evaluated `Variable` objects, sorted by
+        cumulative time ("time"), time in the `Variable` itself ("self"),
+        number of evaluations ("calls"), bytes produced ("bytes") or
+        description ("label")
+        """
+        return sorted(self._allRecords(), key=self._sortKeys[key])
+
+    def _allRecords(self):
+        return sorted(self.records.values() + self._retired,
+                      key=lambda r: r.index)
+
+    def report(self, sort="time", limit=None):
+        """A table of the `limit` first records, sorted by `sort`"""
+        lines = ["%8s %12s %12s %12s  %s" % ("calls", "total (s)", "self (s)",
+                                             "bytes", "variable")]
+        for record in self.sortedRecords(key=sort)[:limit]:
+            lines.append("%8d %12.6f %12.6f %12d  %s  %s"
+                         % (record.calls, record.time, record.selfTime,
+                            record.bytes, record.label, record.source or "?"))
+        return "\n".join(lines)
+
+    def toDot(self):
+        """The graph of the recorded `Variable` objects in the DOT language"""
+        records = self._allRecords()
+
+        lines = ["digraph variables {"]
+        for record in records:
+            label = record.label.replace('"', r'\"')
+            lines.append(r'    n%d [label="%s\n%d calls, %.6f s"];'
+                         % (record.index, label, record.calls, record.time))
+
+        for record in records:
+            var = record.ref()
+            if var is None:
+                continue
+            for required in var.requiredVariables:
+                source = self.records.get(id(required))
+                if source is not None and source.ref() is required:
+                    lines.append("    n%d -> n%d;" % (source.index, record.index))
+        lines.append("}")
+
+        return "\n".join(lines)
+
+if ('--profile-variables' in [s.lower() for s in sys.argv[1:]]
+    or 'FIPY_PROFILE_VARIABLES' in os.environ):
+    import atexit
+
+    _scriptProfiler = VariableProfiler()
+    _scriptProfiler.start()
+
+    def _reportScript():
+        _scriptProfiler.stop()
+        print >>sys.stderr, _scriptProfiler.report()
+
+    atexit.register(_reportScript)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
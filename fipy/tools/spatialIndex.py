@@ -0,0 +1,147 @@
+"""Spatial indices for finding the nearest of a set of fixed points.
+
+`numerix.nearest` compares every query point with every data point, so
+finding the nearest cells of `M` points on a mesh of `N` cells costs
+`O(N M)`. The indices here are built once, from `(D, N)` `data`, and
+then answer batches of `(D, M)` queries:
+
+- `_RectilinearIndex`, for data that lie on a (possibly non-uniform)
+  rectilinear grid, finds the nearest grid line along each axis by
+  bisection, at a cost of `O(M log N)`;
+- `_KDTreeIndex` uses `scipy.spatial.cKDTree`, if it can be imported,
+  for arbitrary data, at a cost of `O(M log N)`;
+- `_BruteForceIndex` falls back to `numerix.nearest`.
+
+`_spatialIndex()` picks the best index that applies to `data`
+
+    >>> from fipy import Grid2D, Tri2D
+    >>> m0 = Grid2D(dx=(.1, 1., 10.), dy=(.1, 1., 10.))
+    >>> m1 = Grid2D(nx=2, ny=2, dx=5., dy=5.)
+    >>> index = _spatialIndex(m0.cellCenters.globalValue)
+    >>> print index.__class__.__name__
+    _RectilinearIndex
+    >>> print index.nearest(m1.cellCenters.globalValue)
+    [4 5 7 8]
+
+Irregular data are indexed with a KD-tree, if `scipy` is available
+
+    >>> tri = Tri2D(nx=20, ny=20)
+    >>> index = _spatialIndex(tri.cellCenters.globalValue)
+    >>> print index.__class__.__name__ in ("_KDTreeIndex", "_BruteForceIndex")
+    True
+    >>> points = numerix.array((numerix.linspace(-1.013, 21.3, 100),
+    ...                         numerix.linspace(20.7, 0.11, 100)))
+    >>> print numerix.allequal(index.nearest(points),
+    ...                        numerix.nearest(tri.cellCenters.globalValue, points))
+    True
+
+A single point gives a single index
+
+    >>> print tri.cellCenters.globalValue[..., index.nearest((0.5, 0.1))]
+    [ 0.5         0.16666667]
+"""
+__docformat__ = 'restructuredtext'
+
+__all__ = []
+
+from fipy.tools import numerix
+
+class _BruteForceIndex(object):
+    """Find nearest points by comparing with all of `data`
+    """
+    def __init__(self, data):
+        self.data = data
+
+    def nearest(self, points):
+        points = numerix.asanyarray(points)
+        if points.ndim == 1:
+            return self.nearest(points[..., numerix.newaxis])[0]
+        return numerix.nearest(self.data, points)
+
+class _RectilinearIndex(_BruteForceIndex):
+    """Find nearest points of data on a rectilinear grid
+    """
+    def __init__(self, data, axes, ids):
+        """
+        :Parameters:
+          - `data`: `(D, N)` coordinates.
+          - `axes`: `D` sorted arrays of the distinct coordinates
+            along each axis.
+          - `ids`: the index in `data` of each node of the grid.
+        """
+        self.data = data
+        self.ids = ids
+        # a point is nearest to the node below the first midpoint above it
+        self.midpoints = [(axis[1:] + axis[:-1]) / 2. for axis in axes]
+
+    @classmethod
+    def _build(cls, data):
+        """Return a `_RectilinearIndex` of `data`, or `None` if `data`
+        do not lie on a complete rectilinear grid.
+        """
+        axes = [numerix.unique(coordinates) for coordinates in data]
+        shape = tuple([len(axis) for axis in axes])
+        if numerix.multiply.reduce(shape) != data.shape[-1]:
+            return None
+
+        nodes = numerix.ravel_multi_index([numerix.searchsorted(axis, coordinates)
+                                           for axis, coordinates in zip(axes, data)],
+                                          shape)
+        ids = -numerix.ones(shape, dtype=numerix.INT_DTYPE).ravel()
+        ids[nodes] = numerix.arange(data.shape[-1])
+        if (ids < 0).any():
+            return None
+
+        return cls(data, axes, ids.reshape(shape))
+
+    def nearest(self, points):
+        points = numerix.asarray(points, dtype=float)
+        if points.ndim == 1:
+            return self.nearest(points[..., numerix.newaxis])[0]
+
+        nodes = tuple([numerix.searchsorted(midpoints, coordinates)
+                       for midpoints, coordinates in zip(self.midpoints, points)])
+
+        return self.ids[nodes]
+
+class _KDTreeIndex(_BruteForceIndex):
+    """Find nearest points of `data` with a KD-tree
+    """
+    def __init__(self, data):
+        from scipy.spatial import cKDTree
+
+        self.data = data
+        self.tree = cKDTree(data.swapaxes(0, 1))
+
+    def nearest(self, points):
+        points = numerix.asarray(points, dtype=float)
+        if points.ndim == 1:
+            return self.nearest(points[..., numerix.newaxis])[0]
+
+        distances, ids = self.tree.query(points.swapaxes(0, 1))
+
+        return ids.astype(numerix.INT_DTYPE)
+
+def _spatialIndex(data):
+    """Return the fastest index that can find the nearest of `(D, N)` `data`
+    """
+    if numerix._isPhysical(data) or numerix.asanyarray(data).shape[-1] == 0:
+        return _BruteForceIndex(data)
+
+    data = numerix.asarray(data, dtype=float)
+
+    index = _RectilinearIndex._build(data)
+    if index is None:
+        try:
+            index = _KDTreeIndex(data)
+        except ImportError:
+            index = _BruteForceIndex(data)
+
+    return index
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
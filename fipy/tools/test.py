@@ -9,6 +9,10 @@ def _suite():
             'numerix',
             'dump',
             'vector',
+            'fusion',
+            'buffers',
+            'profiler',
+            'spatialIndex',
         ), base = __name__)
 
     return theSuite
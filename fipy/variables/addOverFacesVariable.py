@@ -65,14 +65,11 @@ class _AddOverFacesVariable(CellVariable):
         return self._makeValue(value = val)
 
     def _calcValueNoInline(self):
-        ids = self.mesh.cellFaceIDs
-
-        contributions = numerix.take(self.faceVariable, ids, axis=-1)
-
-        # FIXME: numerix.MA.filled casts away dimensions
-        s = (numerix.newaxis,) * (len(contributions.shape) - 2) + (slice(0,None,None),) + (slice(0,None,None),)
-
-        faceContributions = contributions * self.mesh._cellToFaceOrientations[s]
-
-        return numerix.tensordot(numerix.ones(faceContributions.shape[-2], 'd'),
-                                 numerix.MA.filled(faceContributions, 0.), (0, -2)) / self.mesh.cellVolumes
+        faceToCellSum = self.mesh._faceToCellSum
+        if faceToCellSum is not None and self.faceVariable.unit.isDimensionless():
+            return self.mesh._applyIncidenceOperator(faceToCellSum,
+                                                     self.faceVariable.numericValue) / self.mesh.cellVolumes
+
+        return (self.mesh._cellFaceConnectivity.sum(self.faceVariable,
+                                                    weights=self.mesh._cellToFaceOrientationsFilled)
+                / self.mesh.cellVolumes)
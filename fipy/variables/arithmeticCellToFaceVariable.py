@@ -26,6 +26,13 @@ class _ArithmeticCellToFaceVariable(_CellToFaceVariable):
             return self._makeValue(value = val)
     else:
         def _calcValue_(self, alpha, id1, id2):
+            interpolation = self.mesh._cellToFaceInterpolation
+            # subclasses, like `_ModCellToFaceVariable`, do not interpolate linearly
+            if (interpolation is not None
+                and type(self) is _ArithmeticCellToFaceVariable
+                and self.var.unit.isDimensionless()):
+                return self.mesh._applyIncidenceOperator(interpolation, self.var.numericValue)
+
             cell1 = numerix.take(self.var, id1, axis=-1)
             cell2 = numerix.take(self.var, id2, axis=-1)
             return (cell2 - cell1) * alpha + cell1
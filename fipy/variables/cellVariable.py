@@ -28,11 +28,30 @@ class CellVariable(_MeshVariable):
     """
 
     def __init__(self, mesh, name='', value=0., rank=None, elementshape=None, unit=None, hasOld=0):
+        """
+        :Parameters:
+          - `mesh`: the mesh that defines the geometry of this `Variable`
+          - `name`: the user-readable name of the `Variable`
+          - `value`: the initial value
+          - `rank`: the rank (number of dimensions) of each element of this
+            `Variable`. Default: 0
+          - `elementshape`: the shape of each element of this variable
+             Default: `rank * (mesh.dim,)`
+          - `unit`: the physical units of the `Variable`
+          - `hasOld`: whether to keep the values of the previous solution
+            sweep. An integer greater than 1 keeps that many previous
+            time levels, as needed by multistep schemes (see `history`).
+        """
         _MeshVariable.__init__(self, mesh=mesh, name=name, value=value,
                                rank=rank, elementshape=elementshape, unit=unit)
 
+        self._older = []
         if hasOld:
             self._old = self.copy()
+            for level in range(2, int(hasOld) + 1):
+                older = self.copy()
+                older.name = self.name + "_old%d" % level
+                self._older.append(older)
         else:
             self._old = None
 
@@ -130,10 +149,12 @@ class CellVariable(_MeshVariable):
 
     def __call__(self, points=None, order=0, nearestCellIDs=None):
         r"""
-        Interpolates the CellVariable to a set of points using a
-        method that has a memory requirement on the order of Ncells by
-        Npoints in general, but uses only Ncells when the
-        CellVariable's mesh is a UniformGrid object.
+        Interpolates the CellVariable to a set of points. The nearest
+        cells are found with a spatial index of the cell centers, which
+        is built the first time the mesh is interpolated and then reused,
+        so that interpolating to Npoints costs on the order of
+        Npoints log Ncells (or Npoints when the CellVariable's mesh is a
+        UniformGrid object).
 
         :Parameters:
 
@@ -444,6 +465,36 @@ class CellVariable(_MeshVariable):
 ##             import weakref
 ##          return weakref.proxy(self._old)
 
+    @property
+    def history(self):
+        """
+        The `CellVariable` objects holding the values of the previous
+        time levels, most recent first, so that `history[0]` is `old`.
+
+        >>> from fipy.meshes import Grid1D
+        >>> var = CellVariable(mesh=Grid1D(nx=2), value=1., hasOld=3)
+        >>> for value in (2., 3., 4.):
+        ...     var.updateOld()
+        ...     var.value = value
+        >>> print var, var.history[0], var.history[1], var.history[2]
+        [ 4.  4.] [ 3.  3.] [ 2.  2.] [ 1.  1.]
+        >>> print var.history[0] is var.old
+        True
+
+        Expressions of the older time levels follow them as they advance
+
+        >>> older = var.history[1] * 2
+        >>> print older
+        [ 4.  4.]
+        >>> var.updateOld()
+        >>> print older
+        [ 6.  6.]
+        """
+        if self._old is None:
+            return ()
+        else:
+            return tuple([self._old] + self._older)
+
     def updateOld(self):
         """
         Set the values of the previous solution sweep to the current
@@ -456,11 +507,47 @@ class CellVariable(_MeshVariable):
            ...
         AssertionError: The updateOld method requires the CellVariable to have an old value. Set hasOld to True when instantiating the CellVariable.
 
+        The current values are copied once, into a new array, so that
+        arrays previously obtained from `old` are left unchanged, and older
+        time levels are shifted back by exchanging their arrays
+
+        >>> v = CellVariable(mesh=Grid1D(nx=3), value=1., hasOld=True)
+        >>> old = v.old.value
+        >>> v.value = 2.
+        >>> v.updateOld()
+        >>> print old, v.old
+        [ 1.  1.  1.] [ 2.  2.  2.]
+
+        Expressions of `old` follow it, whether or not they are evaluated
+        by fused kernels
+
+        >>> from fipy.tools import fusion
+        >>> doFusion = fusion.doFusion
+        >>> for fusion.doFusion in (False, True):
+        ...     v = CellVariable(mesh=Grid1D(nx=3), value=1., hasOld=True)
+        ...     change = v - v.old
+        ...     v.value = 3.
+        ...     print change,
+        ...     v.updateOld()
+        ...     print change, v.old
+        [ 2.  2.  2.] [ 0.  0.  0.] [ 3.  3.  3.]
+        [ 2.  2.  2.] [ 0.  0.  0.] [ 3.  3.  3.]
+        >>> fusion.doFusion = doFusion
+
         """
         if self._old is None:
             raise AssertionError, 'The updateOld method requires the CellVariable to have an old value. Set hasOld to True when instantiating the CellVariable.'
-        else:
-            self._old.value = self.value.copy()
+
+        levels = [self._old] + self._older
+        for level in range(len(levels) - 1, 0, -1):
+            levels[level]._value = levels[level - 1]._value
+            levels[level]._markFresh()
+
+        value = self.value
+        if hasattr(value, 'copy'):
+            value = value.copy()
+        self._old._setValueInternal(value=value)
+        self._old._markFresh()
 
     def _resetToOld(self):
         if self._old is not None:
@@ -6,6 +6,7 @@ from fipy.variables.cellVariable import CellVariable
 from fipy.tools import numerix
 from fipy.tools import inline
 from fipy.variables.faceGradContributionsVariable import _FaceGradContributions
+from fipy.variables.arithmeticCellToFaceVariable import _ArithmeticCellToFaceVariable
 
 class _GaussCellGradVariable(CellVariable):
     """
@@ -55,8 +56,8 @@ class _GaussCellGradVariable(CellVariable):
 
             ITEM(val, i, vec) /= ITEM(volumes, i, NULL);
         """,val = val,
-            ids = numerix.array(numerix.MA.filled(ids, 0)),
-            orientations = numerix.array(numerix.MA.filled(orientations, 0)),
+            ids = ids,
+            orientations = orientations,
             volumes = numerix.array(volumes),
             areaProj = numerix.array(self.mesh._areaProjections),
             faceValues = numerix.array(self.var.arithmeticFaceValue),
@@ -67,22 +68,38 @@ class _GaussCellGradVariable(CellVariable):
         return self._makeValue(value = val)
 
     def _calcValueNoInline(self, N, M, ids, orientations, volumes):
-        contributions = numerix.take(self.faceGradientContributions, ids, axis=-1)
-        grad = numerix.array(numerix.sum(orientations * contributions, -2))
+        faceToCellSum = self.mesh._faceToCellSum
+        if faceToCellSum is not None and self.var.unit.isDimensionless():
+            gradOperator = self.mesh._cellGaussGradOperator
+            faceValue = self.var.arithmeticFaceValue
+            if (gradOperator is not None
+                and type(faceValue) is _ArithmeticCellToFaceVariable
+                and len(faceValue.constraints) == 0):
+                grad = self.mesh._applyIncidenceOperator(gradOperator, self.var.numericValue)
+                grad = grad.reshape(grad.shape[:-1] + (self.mesh.dim, N))
+                return numerix.rollaxis(grad, -2, 0)
+            else:
+                # constrained face values are only known on the faces
+                contributions = self.mesh._applyIncidenceOperator(faceToCellSum,
+                                                                  self.faceGradientContributions.numericValue)
+                return contributions / volumes
+
+        grad = numerix.array(self.mesh._cellFaceConnectivity.sum(self.faceGradientContributions,
+                                                                 weights=orientations))
         return grad / volumes
 
     def _calcValue(self):
         if inline.doInline and self.var.rank == 0:
             return self._calcValueInline(N=self.mesh.numberOfCells,
                                          M=self.mesh._maxFacesPerCell,
-                                         ids=self.mesh.cellFaceIDs,
-                                         orientations=self.mesh._cellToFaceOrientations,
+                                         ids=self.mesh._cellFaceConnectivity.ids,
+                                         orientations=self.mesh._cellToFaceOrientationsFilled,
                                          volumes=self.mesh.cellVolumes)
         else:
             return self._calcValueNoInline(N=self.mesh.numberOfCells,
                                            M=self.mesh._maxFacesPerCell,
-                                           ids=self.mesh.cellFaceIDs,
-                                           orientations=self.mesh._cellToFaceOrientations,
+                                           ids=self.mesh._cellFaceConnectivity.ids,
+                                           orientations=self.mesh._cellToFaceOrientationsFilled,
                                            volumes=self.mesh.cellVolumes)
 
 
@@ -1,7 +1,6 @@
 __docformat__ = 'restructuredtext'
 
 from fipy.variables.cellVariable import CellVariable
-from fipy.tools.numerix import MA
 from fipy.tools import numerix
 
 class _InterfaceFlagVariable(CellVariable):
@@ -17,6 +16,5 @@ class _InterfaceFlagVariable(CellVariable):
         self.distanceVar = self._requires(distanceVar)
 
     def _calcValue(self):
-        flag = MA.filled(numerix.take(self.distanceVar._interfaceFlag, self.mesh.cellFaceIDs), 0)
-        flag = numerix.sum(flag, axis=0)
+        flag = self.mesh._cellFaceConnectivity.sum(self.distanceVar._interfaceFlag)
         return numerix.where(numerix.logical_and(self.distanceVar.value > 0, flag > 0), 1, 0)
@@ -84,6 +84,8 @@ class _MeshVariable(Variable):
                 dtype = numerix.obj2sctype(value.value)
             else:
                 dtype = numerix.obj2sctype(value)
+            if dtype is not None and numerix.issubdtype(dtype, numerix.floating):
+                dtype = numerix.FLOAT_DTYPE
             #print "meshvariable elshape: ",self.elementshape
             #print "meshvariable _getShapeFromMesh: ",self._getShapeFromMesh(mesh)
             array = numerix.zeros(self.elementshape
@@ -44,9 +44,13 @@ def _OperatorVariableClass(baseClass=object):
             if not self.canInline:
                 return self._calcValue_()
             else:
-                from fipy.tools import inline
+                from fipy.tools import inline, fusion, buffers
                 if inline.doInline:
                     return self._execInline(comment=self.comment)
+                elif fusion.doFusion:
+                    return self._execFused()
+                elif buffers.doReuse:
+                    return self._execInPlace()
                 else:
                     return self._calcValue_()
 
@@ -67,17 +71,137 @@ def _OperatorVariableClass(baseClass=object):
 
             return s
 
+        @property
+        def _fusedTemplate(self):
+            """The fused representation of this node, with `{i}` standing for `self.var[i]`
+
+            `None` if the operation cannot be expressed for fusion.
+            """
+            if not hasattr(self, "_fusedTemplateCache"):
+                try:
+                    self._fusedTemplateCache = self._getRepresentation(style="fused")
+                except (SyntaxError, TypeError):
+                    self._fusedTemplateCache = None
+
+            return self._fusedTemplateCache
+
+        def _getFusedArguments(self, leaves, names, sources=None):
+            args = []
+            for v in self.var:
+                if not isinstance(v, Variable):
+                    return None
+                args.append(v._getFusedString(leaves=leaves, names=names, sources=sources))
+            return args
+
+        def _getFusedString(self, leaves, names, sources=None):
+            if (self.canInline
+                and not self._isCached()
+                and self._fusedTemplate is not None):
+                args = self._getFusedArguments(leaves=leaves, names=names, sources=sources)
+                if args is not None:
+                    s = self._fusedTemplate.format(*args)
+                    # the kernel does not store the value of this node, so
+                    # forget any value it held while it was cached
+                    self._value = None
+                    self._markFresh()
+                    return s
+
+            return baseClass._getFusedString(self, leaves=leaves, names=names, sources=sources)
+
+        def _execFused(self):
+            """
+            Evaluate this node and the uncached nodes below it with a
+            single kernel from `fipy.tools.fusion`.
+            """
+            from fipy.tools import fusion
+
+            leaves = []
+            names = {}
+            sources = []
+            if self._fusedTemplate is not None:
+                args = self._getFusedArguments(leaves=leaves, names=names, sources=sources)
+                if args is not None:
+                    expression = self._fusedTemplate.format(*args)
+                    kernel = fusion._getKernel(expression, leaves)
+                    if kernel is not None:
+                        return self._runKernel(kernel, leaves, sources)
+
+            return self._calcValue_()
+
+        def _execInPlace(self):
+            """
+            Evaluate this node alone with a kernel from `fipy.tools.fusion`,
+            so that its result can be written into a reused buffer.
+            """
+            from fipy.tools import fusion
+
+            if (self._fusedTemplate is None
+                or not all([isinstance(v, Variable) for v in self.var])):
+                return self._calcValue_()
+
+            leaves = [v.value for v in self.var]
+            kernel = fusion._getKernel(self._fusedTemplate.format(*["a%d" % i for i in range(len(leaves))]),
+                                       leaves)
+            if kernel is None:
+                return self.op(*leaves)
+
+            return self._runKernel(kernel, leaves, self.var)
+
+        def _runKernel(self, kernel, leaves, sources):
+            """
+            Evaluate `kernel` of `leaves`, the values of the `Variable`
+            objects `sources`, reusing buffers if enabled.
+
+            The result of an uncached node is written to an array from the
+            buffer pool. The node remembers that array, and the node that
+            consumes the result returns it to the pool. Arrays that did not
+            come from the evaluation of one of `sources` are never returned,
+            as they may be held elsewhere.
+            """
+            from fipy.tools import buffers
+
+            if not buffers.doReuse:
+                return kernel(*leaves)
+
+            if self._isCached():
+                out = self._value
+                if not (isinstance(out, numerix.ndarray)
+                        and out.shape == kernel.shape
+                        and out.dtype == kernel.dtype
+                        and out.flags.writeable):
+                    out = None
+                self._pooledValue = None
+            else:
+                out = buffers._pool.acquire(kernel.shape, kernel.dtype)
+                self._pooledValue = out
+
+            result = kernel(*leaves, _out=out)
+
+            for source, leaf in zip(sources, leaves):
+                pooled = getattr(source, "_pooledValue", None)
+                if pooled is not None and pooled is leaf:
+                    source._pooledValue = None
+                    buffers._pool.release(leaf, keep=result)
+
+            return result
+
         def _getRepresentation(self, style="__repr__", argDict={}, id=id, freshen=False):
             """
 
             :Parameters:
 
-              - `style`: one of `'__repr__'`, `'name'`, `'TeX'`, `'C'`
+              - `style`: one of `'__repr__'`, `'name'`, `'TeX'`, `'C'`, `'fused'`
 
             """
             if isinstance(self.op, numerix.ufunc):
-                return "%s(%s)" % (self.op.__name__, ", ".join([self.__var(i, style, argDict, id, freshen)
-                                                               for i in range(len(self.var))]))
+                if style == "fused":
+                    if getattr(numerix, self.op.__name__, None) is not self.op:
+                        raise TypeError("%s is not a numerix ufunc" % self.op.__name__)
+                    name = "numerix." + self.op.__name__
+                else:
+                    name = self.op.__name__
+                return "%s(%s)" % (name, ", ".join([self.__var(i, style, argDict, id, freshen)
+                                                    for i in range(len(self.var))]))
 
             try:
                 instructions = dis.get_instructions(self.op.func_code)
@@ -110,6 +234,8 @@ def _OperatorVariableClass(baseClass=object):
 
             elif style == "TeX":
                 raise Exception, "TeX style not yet implemented"
+            elif style == "fused":
+                result = "{%d}" % i
             elif style == "C":
                 if not v._isCached():
                     result = v._getCstring(argDict, id=id + str(i), freshen=freshen)
@@ -272,6 +398,97 @@ def _OperatorVariableClass(baseClass=object):
 
     return _OperatorVariable
 
+def _testFusion():
+    """
+    Test of fused evaluation
+
+        >>> from fipy.tools import fusion
+        >>> v1 = Variable((1., 2., 3.))
+        >>> v2 = Variable((4., 5., 6.))
+        >>> leaves = []
+        >>> print (v1 * v2 + numerix.sin(v1) * v1)._getFusedString(leaves=leaves, names={})
+        ((a0 * a1) + (numerix.sin(a0) * a0))
+        >>> expr = (v1 * v2 + numerix.sin(v1) * v1) / 2.
+        >>> print numerix.allclose(expr._execFused(), expr._calcValue_())
+        True
+
+    Cached nodes are arguments to the kernel
+
+        >>> shared = v1 * v2
+        >>> shared.cacheMe()
+        >>> print (shared + v1)._getFusedString(leaves=[], names={})
+        (a0 + a1)
+
+    Changing a leaf is seen through the fused nodes
+
+        >>> fusion.doFusion, doFusion = True, fusion.doFusion
+        >>> expr = ((v1 * v2) + 1.) * 2.
+        >>> expr.cacheMe()
+        >>> print expr
+        [ 10.  22.  38.]
+        >>> v1.value = (0., 0., 1.)
+        >>> print expr
+        [  2.   2.  14.]
+
+    A node that loses a subscriber is no longer cached, and is fused into
+    its remaining subscriber; the value it held is not reused if it is
+    shared again
+
+        >>> shared = v1 * 2.
+        >>> first = shared + 1.
+        >>> second = shared + 3.
+        >>> print first, second
+        [ 1.  1.  3.] [ 3.  3.  5.]
+        >>> del second
+        >>> v1.value = (1., 2., 3.)
+        >>> print first
+        [ 3.  5.  7.]
+        >>> print shared + 5.
+        [  7.   9.  11.]
+        >>> fusion.doFusion = doFusion
+    """
+    pass
+
+def _testBufferReuse():
+    """
+    Test of evaluation into reused buffers, which fused kernels do not use
+
+        >>> from fipy.tools import buffers, fusion
+        >>> buffers.doReuse, doReuse = True, buffers.doReuse
+        >>> fusion.doFusion, doFusion = False, fusion.doFusion
+        >>> a = Variable(value=(1., 2., 3.))
+        >>> b = (a * 2) + 1
+        >>> b.cacheMe()
+        >>> value = b.value
+        >>> print value
+        [ 3.  5.  7.]
+        >>> a.value = (2., 3., 4.)
+        >>> print b.value
+        [ 5.  7.  9.]
+        >>> b.value is value
+        True
+
+    The intermediate result of the uncached node is returned to the pool
+
+        >>> buffers._pool.numberFree((3,), float) > 0
+        True
+
+    but a result that was handed out, rather than consumed by another
+    node, is not, whether or not the nodes are fused
+
+        >>> for fusion.doFusion in (False, True):
+        ...     v = Variable(value=((a * 2) + 1).value)
+        ...     w = (v * 3) + 0
+        ...     print w,
+        ...     x = (a * 10) + 0
+        ...     print x, v
+        [ 15.  21.  27.] [ 20.  30.  40.] [ 5.  7.  9.]
+        [ 15.  21.  27.] [ 20.  30.  40.] [ 5.  7.  9.]
+        >>> buffers.doReuse = doReuse
+        >>> fusion.doFusion = doFusion
+    """
+    pass
+
 def _testBinOp(self):
     """
     Test of _getRepresentation
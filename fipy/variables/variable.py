@@ -6,6 +6,7 @@ from fipy.tools.dimensions import physicalField
 from fipy.tools import numerix
 from fipy.tools import parser
 from fipy.tools import inline
+from fipy.tools import profiler
 
 __all__ = ["Variable"]
 
@@ -41,6 +42,13 @@ class Variable(object):
 
     _cacheNever = False
 
+    # incremented whenever the value is assigned or recalculated
+    _version = 0
+
+    # variables written during `updateMany()`, whose subscribers have yet
+    # to be marked stale; `None` outside of a batch
+    _pendingStale = None
+
     def __new__(cls, *args, **kwds):
         return object.__new__(cls)
 
@@ -83,6 +91,9 @@ class Variable(object):
         self.stale = 1
         self._markFresh()
 
+        if profiler._profilers:
+            self._source = profiler._creationSite()
+
 ##    __array_priority__ and __array_wrap__ are required to override
 ##    the default behavior of numpy. If a numpy array and a Variable
 ##    are in a binary operation and numpy is first, then numpy will,
@@ -226,6 +237,7 @@ class Variable(object):
             self._value.unit = unit
         else:
             self._value = physicalField.PhysicalField(value=self._value, unit=unit)
+        self._constrainedValueCache = None
 
     unit = property(_getUnit, _setUnit)
 
@@ -419,6 +431,36 @@ class Variable(object):
          else:
              return identifier + self._getCIndexString(shape)
 
+    def _getFusedString(self, leaves, names, sources=None):
+        """
+        Name the value of this `Variable` as an argument of a fused kernel.
+
+        :Parameters:
+          - `leaves`: list of the values of the kernel arguments, to be extended
+          - `names`: map from the `id` of a `Variable` to its argument name
+          - `sources`: list of the `Variable` objects whose values are
+            `leaves`, to be extended, if not `None`
+
+            >>> leaves = []
+            >>> names = {}
+            >>> v = Variable((1, 2, 3))
+            >>> print v._getFusedString(leaves=leaves, names=names)
+            a0
+            >>> print Variable(4)._getFusedString(leaves=leaves, names=names)
+            a1
+            >>> print v._getFusedString(leaves=leaves, names=names)
+            a0
+            >>> print leaves
+            [array([1, 2, 3]), array(4)]
+        """
+        if id(self) not in names:
+            names[id(self)] = "a%d" % len(leaves)
+            leaves.append(self.value)
+            if sources is not None:
+                sources.append(self)
+
+        return names[id(self)]
+
     def tostring(self, max_line_width=75, precision=8, suppress_small=False, separator=' '):
         return numerix.tostring(self.value,
                                 max_line_width=max_line_width,
@@ -474,8 +516,14 @@ class Variable(object):
 
         """
 
+        if Variable._pendingStale:
+            Variable._flushStale()
+
         if self.stale or not self._isCached() or self._value is None:
-            value = self._calcValue()
+            if profiler._profilers:
+                value = profiler._evaluate(self)
+            else:
+                value = self._calcValue()
             if self._isCached():
                 self._setValueInternal(value=value)
             else:
@@ -484,21 +532,105 @@ class Variable(object):
         else:
             value = self._value
 
-        if len(self.constraints) > 0:
-            value = value.copy()
-            for constraint in self.constraints:
-                if constraint.where is None:
-                    value[:] = constraint.value
-                else:
-                    mask = constraint.where
-                    if not hasattr(mask, 'dtype') or mask.dtype != bool:
-                        mask = numerix.array(mask, dtype=numerix.NUMERIX.bool)
+        constraints = self.constraints
+        if len(constraints) > 0:
+            value = self._getConstrainedValue(value=value, constraints=constraints)
 
-                    if 0 not in value.shape:
-                        try:
-                            value[..., mask] = constraint.value
-                        except:
-                            value[..., mask] = numerix.array(constraint.value)[..., mask]
+        return value
+
+    @staticmethod
+    def _constraintStamp(obj):
+        """Version of the value or mask of a constraint, or `None` if it
+        is not a `Variable` and so cannot change."""
+        if isinstance(obj, Variable):
+            if obj.stale:
+                obj._getValue()
+            return obj._version
+        else:
+            return None
+
+    def _getConstrainedValue(self, value, constraints):
+        """Apply `constraints` to a copy of `value`.
+
+        The constrained value is cached until the value of `self`, or the
+        value or mask of a constraint, changes. Masks are compiled to index
+        arrays once per change.
+
+            >>> a = Variable(value=(1., 2., 3.))
+            >>> where = Variable(value=(True, False, False))
+            >>> a.constrain(0., where=where)
+            >>> print a
+            [ 0.  2.  3.]
+            >>> a.value is a.value
+            True
+
+            >>> where.value = (False, False, True)
+            >>> print a
+            [ 1.  2.  0.]
+            >>> c = Variable(value=5.)
+            >>> a.constrain(c, where=(True, False, False))
+            >>> print a
+            [ 5.  2.  0.]
+            >>> c.value = 6.
+            >>> print a
+            [ 6.  2.  0.]
+            >>> a[1] = 7.
+            >>> print a
+            [ 6.  7.  0.]
+
+        The cached value cannot be changed behind the back of the
+        `Variable`
+
+            >>> from fipy import CellVariable, Grid1D
+            >>> v = CellVariable(mesh=Grid1D(nx=3), value=1.)
+            >>> v.constrain(5., where=(True, False, False))
+            >>> arr = v.value
+            >>> arr[1] = 99. #doctest: +IGNORE_EXCEPTION_DETAIL
+            Traceback (most recent call last):
+                ...
+            ValueError: assignment destination is read-only
+            >>> print v.value, v._value
+            [ 5.  1.  1.] [ 1.  1.  1.]
+        """
+        stamps = tuple((constraint,
+                        self._constraintStamp(constraint.value),
+                        self._constraintStamp(constraint.where))
+                       for constraint in constraints)
+        key = (self._version, stamps)
+
+        cache = getattr(self, '_constrainedValueCache', None)
+        if cache is not None and cache[0] == key:
+            return cache[1]
+
+        indices = getattr(self, '_constraintIndices', {})
+        self._constraintIndices = {}
+
+        value = value.copy()
+        for constraint, valueStamp, whereStamp in stamps:
+            if constraint.where is None:
+                value[:] = constraint.value
+            else:
+                compiled = indices.get(constraint)
+                if compiled is None or compiled[0] != whereStamp:
+                    mask = numerix.array(constraint.where, dtype=numerix.NUMERIX.bool)
+                    if mask.ndim == 1:
+                        mask = numerix.nonzero(mask)[0]
+                    compiled = (whereStamp, mask)
+                self._constraintIndices[constraint] = compiled
+                mask = compiled[1]
+
+                if 0 not in value.shape:
+                    try:
+                        value[..., mask] = constraint.value
+                    except:
+                        value[..., mask] = numerix.array(constraint.value)[..., mask]
+
+        if self._isCached():
+            if isinstance(value, numerix.ndarray):
+                # the cached array is handed to every caller, so changes
+                # must go through the `Variable`
+                value.flags.writeable = False
+            self._constrainedValueCache = (key, value)
 
         return value
 
@@ -790,18 +922,93 @@ class Variable(object):
                                    _setSubscribedVariables)
 
     def __markStale(self):
-        for subscriber in self.subscribedVariables:
-            if subscriber() is not None:
-                ## Even though getSubscribedVariables() strips out dead
-                ## references, subscriber() might still be dead due to the
-                ## vagaries of garbage collection and the possibility that
-                ## later subscribedVariables were removed, changing the
-                ## dependencies of this subscriber.
-                ## See <https://github.com/usnistgov/fipy/issues/103> for more explanation.
-                subscriber()._markStale()
+        if Variable._pendingStale is not None:
+            Variable._pendingStale.append(self)
+        else:
+            Variable._propagateStale([self])
+
+    @staticmethod
+    def _propagateStale(variables):
+        """Mark everything that depends on `variables` stale.
+
+        The dependency graph is walked with an explicit stack, so deep
+        expressions cannot exceed the recursion limit, and the walk stops
+        at variables that are already stale, so each is visited once.
+        Only the propagation is iterative; evaluating a deep expression
+        that is entirely stale still recurses through it.
+
+            >>> import sys
+            >>> a = Variable(value=1)
+            >>> b = a
+            >>> for i in range(sys.getrecursionlimit() + 100):
+            ...     c = Variable(value=1)
+            ...     required = c._requires(b)
+            ...     value = c.value
+            ...     b = c
+            >>> print b.stale
+            0
+            >>> a.value = 2
+            >>> print b.stale
+            1
+        """
+        stack = []
+        for var in variables:
+            stack.extend(var._subscribedVariables)
+        while stack:
+            ## A weak reference may be dead due to the vagaries of
+            ## garbage collection and the possibility that later
+            ## subscribedVariables were removed, changing the
+            ## dependencies of this subscriber.
+            ## See <https://github.com/usnistgov/fipy/issues/103> for more explanation.
+            subscriber = stack.pop()()
+            if subscriber is not None and not subscriber.stale:
+                subscriber.stale = 1
+                stack.extend(subscriber._subscribedVariables)
+
+    @staticmethod
+    def _flushStale():
+        pending = Variable._pendingStale
+        Variable._pendingStale = []
+        Variable._propagateStale(pending)
+
+    @staticmethod
+    def updateMany():
+        """Batch the changes to many `Variable` objects.
+
+        Within a ``with`` block, writes to variables only record which
+        variables changed. The variables that depend on them are marked
+        stale once, when the block ends or when some value is read.
+
+            >>> a = Variable(value=1)
+            >>> b = Variable(value=2)
+            >>> c = a * b
+            >>> print c
+            2
+            >>> with Variable.updateMany():
+            ...     a.value = 3
+            ...     b.value = 4
+            ...     print c.stale
+            0
+            >>> print c.stale
+            1
+            >>> print c
+            12
+
+        Reading a value within the block sees every earlier write
+
+            >>> with Variable.updateMany():
+            ...     a.value = 5
+            ...     print c
+            ...     b.value = 6
+            20
+            >>> print c
+            30
+        """
+        return _UpdateMany()
 
     def _markFresh(self):
         self.stale = 0
+        self._version += 1
         self.__markStale()
 
     def _markStale(self):
@@ -824,7 +1031,8 @@ class Variable(object):
 
         # we retain a weak reference to avoid a memory leak
         # due to circular references between the subscriber
-        # and the subscribee
+        # and the subscribee; dead references are pruned here,
+        # rather than every time the subscribers are marked stale
         import weakref
         self.subscribedVariables.append(weakref.ref(var))
 
@@ -1648,6 +1856,21 @@ class Variable(object):
         pass
 
 
+class _UpdateMany(object):
+    """Context of `Variable.updateMany()`"""
+
+    def __enter__(self):
+        self._outermost = Variable._pendingStale is None
+        if self._outermost:
+            Variable._pendingStale = []
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._outermost:
+            pending = Variable._pendingStale
+            Variable._pendingStale = None
+            Variable._propagateStale(pending)
+
 def _test():
     import fipy.tests.doctestPlus
     return fipy.tests.doctestPlus.testmod()